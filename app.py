@@ -5,9 +5,14 @@ import webbrowser
 from pathlib import Path
 import webview
 import time
+import json
+import urllib.request
+import urllib.error
 
 _loaded = False
 
+SERVER_URL = 'http://localhost:5000'
+
 def open_file_dialog():
     import tkinter as tk
     from tkinter import filedialog
@@ -69,13 +74,27 @@ def run_flask():
     from server import app
     app.run(host='localhost', port=5000, debug=False, use_reloader=False)
 
+def wait_for_server(timeout: float = 30.0, interval: float = 0.1) -> bool:
+    """/api/ready가 응답할 때까지 대기 (모델 사전 로딩 완료까지 기다리지는 않음)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(SERVER_URL + '/api/ready', timeout=1) as response:
+                status = json.loads(response.read().decode('utf-8'))
+                print(f"서버 준비 완료 (모델 사전 로딩: {status.get('engines') or '없음'})")
+                return True
+        except (urllib.error.URLError, OSError, ValueError):
+            time.sleep(interval)
+    print(f"서버 응답 대기 시간 초과 ({timeout:.0f}초)")
+    return False
+
 def create_window():
     # Flask 서버를 먼저 시작
     flask_thread = threading.Thread(target=run_flask, daemon=True)
     flask_thread.start()
     
-    # 서버가 시작될 때까지 잠깐 대기 (최소한)
-    time.sleep(2)  # 서버 시작 대기 시간 증가
+    # 서버가 응답할 때까지 대기
+    wait_for_server()
     
     # API 인스턴스 생성
     api = PyWebViewAPI()
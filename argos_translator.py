@@ -1,21 +1,21 @@
 """Argos Translate 기반 Markdown 문서 번역기"""
 
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, TextIO
 import re
 
-try:
-    import argostranslate.translate
-    ARGOS_AVAILABLE = True
-except ImportError:
-    ARGOS_AVAILABLE = False
+from lazy_import import module_available
+from markdown_segmenter import BLOCK_PATTERN, sentence_texts
+from output_builder import OutputBuilder
+from script_classifier import resolve_segment_language
+from translation_memory import job_memo, lookup_segment, store_segment
 
-try:
-    from langdetect import detect, DetectorFactory
-    DetectorFactory.seed = 0
-    LANGDETECT_AVAILABLE = True
-except ImportError:
-    LANGDETECT_AVAILABLE = False
+# argostranslate/langdetect는 설치 여부만 확인하고 처음 번역/감지할 때 임포트
+ARGOS_AVAILABLE = module_available("argostranslate")
+LANGDETECT_AVAILABLE = module_available("langdetect")
+
+# 문장 단위 번역 시 문장 경계 (마침표/느낌표/물음표 뒤에 공백과 대문자가 오는 곳에서 나눔)
+ARGOS_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
 
 
 @dataclass
@@ -27,114 +27,122 @@ class TranslationUnit:
 
 
 class MarkdownTranslator:
-    def __init__(self, source_lang: str = "auto", target_lang: str = "ko"):
+    def __init__(self, source_lang: str = "auto", target_lang: str = "ko", document_lang: Optional[str] = None):
         self.source_lang = source_lang
         self.target_lang = target_lang
-        self.detected_language: Optional[str] = None
+        # source_lang="auto"일 때 문서 전체에서 한 번 감지한 언어 (작업에서 이미 감지했으면 전달받음)
+        self.detected_language: Optional[str] = document_lang
 
     def detect_language(self, text: str) -> str:
         if not LANGDETECT_AVAILABLE:
             return "en"
         sample = text[:1000]
         try:
+            from langdetect import detect, DetectorFactory
+            DetectorFactory.seed = 0
             return detect(sample)
         except Exception:
             return "en"
 
-    def split_into_units(self, markdown_text: str, split_by_sentence: bool = False) -> List[TranslationUnit]:
-        units: List[TranslationUnit] = []
-        lines = markdown_text.split("\n")
-        paragraph: List[str] = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
-            if stripped.startswith("```"):
-                if paragraph:
-                    units.extend(self._process_paragraph(paragraph, split_by_sentence))
-                    paragraph = []
-                code_block = [line]
-                i += 1
-                while i < len(lines) and not lines[i].strip().startswith("```"):
-                    code_block.append(lines[i])
-                    i += 1
-                if i < len(lines):
-                    code_block.append(lines[i])
-                units.append(TranslationUnit("\n".join(code_block), "code", False, {"line_count": len(code_block)}))
-            elif stripped.startswith("#"):
-                if paragraph:
-                    units.extend(self._process_paragraph(paragraph, split_by_sentence))
-                    paragraph = []
-                level = len(stripped) - len(stripped.lstrip('#'))
-                header_text = stripped[level:].strip()
-                units.append(TranslationUnit(line, "header", bool(header_text), {"level": level, "text": header_text}))
-            elif not stripped:
-                if paragraph:
-                    units.extend(self._process_paragraph(paragraph, split_by_sentence))
-                    paragraph = []
-                units.append(TranslationUnit("", "empty", False, {}))
+    def resolve_document_language(self, markdown_text: str) -> Optional[str]:
+        """source_lang="auto"이면 문서 언어를 한 번만 감지 (이미 정해져 있으면 그대로 사용)"""
+        if self.source_lang == "auto" and not self.detected_language:
+            self.detected_language = self.detect_language(markdown_text)
+        return self.detected_language
+
+    def unit_language(self, text: str) -> str:
+        """단위의 원본 언어 (auto이면 문서 언어를 쓰되, 문자 체계 구성이 달라진 단위만 개별 판정)"""
+        if self.source_lang != "auto":
+            return self.source_lang
+        return resolve_segment_language(text, self.detected_language)
+
+    def iter_units(self, markdown_text: str, split_by_sentence: bool = False) -> Iterator[TranslationUnit]:
+        """세그먼터 블록을 번역 단위로 변환 (표는 문단처럼 번역, 빈 줄은 줄마다 빈 단위, 내용은 필요할 때 잘라냄)"""
+        # 블록마다 Segment를 만들지 않고 블록 패턴의 매치를 바로 씀 (split_sections와 같은 방식)
+        for match in BLOCK_PATTERN.finditer(markdown_text):
+            kind = match.lastgroup
+            if kind == 'blank':
+                yield TranslationUnit("", "empty", False, {})
+                continue
+            if kind == 'paragraph' and split_by_sentence:
+                for sentence in sentence_texts(markdown_text, match.start(), match.end(), ARGOS_SENTENCE_BOUNDARY):
+                    yield TranslationUnit(sentence, "sentence", True, {})
+                continue
+            content = match.group()
+            if kind == 'code':
+                yield TranslationUnit(content, "code", False, {"line_count": content.count("\n") + 1})
+            elif kind == 'header':
+                level = len(match.group('header'))
+                header_text = content.strip()[level:].strip()
+                yield TranslationUnit(content, "header", bool(header_text), {"level": level, "text": header_text})
             else:
-                paragraph.append(line)
-            i += 1
-        if paragraph:
-            units.extend(self._process_paragraph(paragraph, split_by_sentence))
-        return units
-
-    def _process_paragraph(self, lines: List[str], split_by_sentence: bool) -> List[TranslationUnit]:
-        text = "\n".join(lines)
-        if not text.strip():
-            return []
-        if split_by_sentence:
-            sentences = self._split_sentences(text)
-            return [TranslationUnit(s, "sentence", True, {}) for s in sentences if s.strip()]
-        else:
-            return [TranslationUnit(text, "paragraph", True, {"line_count": len(lines)})]
-
-    def _split_sentences(self, text: str) -> List[str]:
-        pattern = r"(?<=[.!?])\s+(?=[A-Z])"
-        sentences = re.split(pattern, text)
-        return [s.strip() for s in sentences if s.strip()]
+                yield TranslationUnit(content, "paragraph", True, {"line_count": content.count("\n") + 1})
+
+    def split_into_units(self, markdown_text: str, split_by_sentence: bool = False) -> List[TranslationUnit]:
+        """번역 단위 목록 (iter_units 참고)"""
+        return list(self.iter_units(markdown_text, split_by_sentence))
 
     def translate_unit(self, unit: TranslationUnit) -> str:
         if not unit.is_translatable:
             return unit.content
         if not ARGOS_AVAILABLE:
             return f"[Argos Translate 번역 실패: 번역 엔진이 설치되어 있지 않습니다]"
-        src = self.detected_language if self.source_lang == "auto" and self.detected_language else self.source_lang
+        src = self.unit_language(unit.content)
+        memory_key = dict(engine="argos", model="argostranslate", src_lang=src, tgt_lang=self.target_lang)
+        cached = lookup_segment(unit.content, **memory_key)
+        if cached is not None:
+            return cached
         try:
+            import argostranslate.translate
             result = argostranslate.translate.translate(unit.content, src, self.target_lang)
             # 번역이 원본과 같으면 번역 실패로 간주
             if result.strip() == unit.content.strip():
                 preview = unit.content[:30].replace('\n', ' ')
                 return f"[Argos Translate 번역 실패: '{preview}...']"
+            store_segment(unit.content, result, **memory_key)
             return result
         except Exception as e:
             preview = unit.content[:30].replace('\n', ' ')
             return f"[Argos Translate 번역 실패: '{preview}...']"
 
     def translate_document(self, markdown_text: str, split_by_sentence: bool = False) -> List[str]:
-        if self.source_lang == "auto":
-            self.detected_language = self.detect_language(markdown_text)
-        units = self.split_into_units(markdown_text, split_by_sentence)
-        translated: List[str] = []
-        for unit in units:
-            translated.append(self.translate_unit(unit))
-        return translated
+        self.resolve_document_language(markdown_text)
+        return [self.translate_unit(unit) for unit in self.iter_units(markdown_text, split_by_sentence)]
+
 
+def translate_markdown(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", target_lang: str = "ko", split_by_sentence: bool = False,
+                       document_lang: Optional[str] = None, output: Optional[TextIO] = None) -> Optional[str]:
+    """
+    Markdown 문서를 Argos Translate로 번역 (단위마다 번역이 끝나는 대로 출력)
 
-def translate_markdown(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", target_lang: str = "ko", split_by_sentence: bool = False) -> str:
-    translator = MarkdownTranslator(source_lang, target_lang)
-    translations = translator.translate_document(markdown_text, split_by_sentence)
+    output: 결과를 쓸 스트림. 주어지면 바로 쓰고 None 반환 (결과 전체를 메모리에 두지 않음)
+    """
+    translator = MarkdownTranslator(source_lang, target_lang, document_lang)
+    translator.resolve_document_language(markdown_text)
+    builder = OutputBuilder(markdown_text, output)
 
     if path:
         from progress_manager import progress_manager
         chunks_info = [
-            {"index": i, "header": "paragraph", "size": len(unit), "status": "completed"}
-            for i, unit in enumerate(translations)
+            {"index": i, "header": unit.unit_type, "size": len(unit.content), "status": "pending"}
+            for i, unit in enumerate(translator.iter_units(markdown_text, split_by_sentence))
         ]
-        progress_manager.set_total_chunks(path, len(translations), chunks_info)
-        for i, text in enumerate(translations):
-            progress_manager.add_chunk_result(path, i, text)
+        progress_manager.set_total_chunks(path, len(chunks_info), chunks_info)
+
+    with job_memo():
+        for i, unit in enumerate(translator.iter_units(markdown_text, split_by_sentence)):
+            # 재시작한 작업이면 체크포인트에 기록된 단위는 다시 번역하지 않음
+            translated = progress_manager.resumed_result(path, i) if path else None
+            if translated is None:
+                translated = translator.translate_unit(unit)
+            if i:
+                builder.text("\n")
+            builder.text(translated)
+            if path:
+                progress_manager.add_chunk_result(path, i, translated)
+
+    # 출력 스트림에 쓰는 작업은 호출한 쪽(tasks.run_translation)이 파일을 확정한 뒤 완료 처리
+    if path and output is None:
         progress_manager.finish(path)
 
-    return "\n".join(translations)
+    return builder.getvalue()
@@ -0,0 +1,93 @@
+"""서버 시작 임포트 시간 벤치마크 (python -X importtime)
+
+새 인터프리터에서 server/tasks 모듈을 임포트하며 -X importtime 출력을 수집하고
+- 전체 임포트 시간이 예산(--budget-ms)을 넘는지
+- 지연 임포트해야 하는 무거운 모듈(torch, transformers, docling 등)이 시작 시점에 임포트되는지
+를 검사한다. 둘 중 하나라도 어기면 종료 코드 1로 끝나므로 시작 시간 회귀 검사에 사용할 수 있다.
+
+사용법:
+    python benchmarks/bench_import_time.py [--modules server,tasks] [--budget-ms 1500] [--top 15] [--runs 3]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# 서버 시작 시 임포트되면 안 되는 무거운 모듈 (실제 사용 시점에 지연 임포트)
+LAZY_MODULES = (
+    'torch', 'transformers', 'docling', 'argostranslate', 'ctranslate2',
+    'pdf2image', 'PIL', 'fitz', 'pymupdf4llm', 'langdetect',
+)
+
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(module: str) -> list:
+    """
+    새 인터프리터에서 모듈을 임포트하고 -X importtime 결과를 파싱
+
+    Returns:
+        (모듈명, 자체 시간 us, 누적 시간 us, 중첩 깊이) 목록
+    """
+    env = {**os.environ, 'PRELOAD_ENGINES': ''}  # 사전 로딩 스레드가 측정에 섞이지 않도록
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=ROOT_DIR, env=env
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "임포트 실패")
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서버 시작 임포트 시간 벤치마크")
+    parser.add_argument('--modules', default='server,tasks', help="측정할 모듈 (쉼표 구분)")
+    parser.add_argument('--budget-ms', type=float, default=1500.0, help="모듈별 임포트 시간 예산 (ms)")
+    parser.add_argument('--top', type=int, default=15, help="누적 시간이 큰 순으로 표시할 모듈 수")
+    parser.add_argument('--runs', type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in [m.strip() for m in args.modules.split(',') if m.strip()]:
+        try:
+            runs = [measure(module) for _ in range(max(1, args.runs))]
+        except RuntimeError as e:
+            print(f"[{module}] 임포트 실패: {e}")
+            failed = True
+            continue
+
+        # 디스크 캐시 등의 잡음을 줄이기 위해 가장 빠른 실행을 사용
+        entries = min(runs, key=lambda run: run[-1][2] if run else 0)
+        total_ms = next((cumulative for name, _, cumulative, _ in reversed(entries) if name == module), 0) / 1000
+        imported = {name.split('.')[0] for name, _, _, _ in entries}
+        eager = [name for name in LAZY_MODULES if name in imported]
+
+        print(f"\n[{module}] 임포트 시간: {total_ms:.1f}ms (예산 {args.budget_ms:.0f}ms, {len(entries)}개 모듈)")
+        print(f"{'누적 (ms)':>10}{'자체 (ms)':>10}  모듈")
+        top_level = [entry for entry in entries if entry[3] <= 1 and entry[0] != module]
+        for name, self_us, cumulative_us, _ in sorted(top_level, key=lambda e: e[2], reverse=True)[:args.top]:
+            print(f"{cumulative_us / 1000:>10.1f}{self_us / 1000:>10.1f}  {name}")
+
+        if total_ms > args.budget_ms:
+            print(f"[실패] 임포트 시간이 예산을 초과했습니다: {total_ms:.1f}ms > {args.budget_ms:.0f}ms")
+            failed = True
+        if eager:
+            print(f"[실패] 시작 시점에 임포트된 무거운 모듈: {', '.join(eager)}")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
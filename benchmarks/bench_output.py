@@ -0,0 +1,105 @@
+"""번역 결과 조립 메모리 벤치마크 (결과 목록 + join vs 출력 조립기 스트리밍)
+
+합성 Markdown 문서(기본 50MB)를 Argos/Ollama 번역 단위로 나누고, 번역 대신 원문을 그대로 돌려주는
+가짜 번역으로 다음 두 흐름의 최대 추가 메모리(tracemalloc, 원문 제외)와 처리 시간을 비교한다.
+- 이전: 단위 목록 → 결과 목록 + progress_manager 부분 결과 복사 → '\\n'.join → 파일 저장
+- 현재: 단위를 순회하며 OutputBuilder로 파일에 바로 쓰기 (progress_manager는 출력 파일만 참조)
+모델은 로드하지 않는다.
+
+사용법:
+    python benchmarks/bench_output.py [--size-mb 50] [--seed 0] [--input 문서.md]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from argos_translator import MarkdownTranslator  # noqa: E402
+from bench_segmenter import synthetic_markdown  # noqa: E402
+from output_builder import OutputBuilder  # noqa: E402
+from progress_manager import ProgressManager  # noqa: E402
+
+
+def legacy_pipeline(text: str, output_path: Path) -> None:
+    """이전 흐름: 결과를 모두 모은 뒤 합쳐서 저장"""
+    progress = ProgressManager()
+    progress.start('bench')
+    units = MarkdownTranslator().split_into_units(text)
+    progress.set_total_chunks('bench', len(units), [{'index': i, 'status': 'pending'} for i in range(len(units))])
+    results = []
+    for i, unit in enumerate(units):
+        results.append(unit.content)
+        progress.add_chunk_result('bench', i, unit.content)
+    output_path.write_text("\n".join(results), encoding='utf-8')
+
+
+def streaming_pipeline(text: str, output_path: Path) -> None:
+    """현재 흐름: 단위가 끝날 때마다 출력 파일에 씀"""
+    progress = ProgressManager()
+    progress.start('bench')
+    translator = MarkdownTranslator()
+    with open(output_path, 'w', encoding='utf-8') as output:
+        progress.set_output_file('bench', output_path)
+        total = sum(1 for _ in translator.iter_units(text))
+        progress.set_total_chunks('bench', total, [{'index': i, 'status': 'pending'} for i in range(total)])
+        builder = OutputBuilder(text, output)
+        for i, unit in enumerate(translator.iter_units(text)):
+            if i:
+                builder.text("\n")
+            builder.text(unit.content)
+            progress.add_chunk_result('bench', i, unit.content)
+
+
+def measure(func, text: str, output_path: Path):
+    """(소요 시간 초, 최대 추가 메모리 MB)"""
+    start = time.perf_counter()
+    tracemalloc.start()
+    func(text, output_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return time.perf_counter() - start, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="번역 결과 조립 메모리 벤치마크")
+    parser.add_argument('--size-mb', type=float, default=50.0, help="합성 문서 크기 (MB)")
+    parser.add_argument('--seed', type=int, default=0, help="합성 문서 난수 시드")
+    parser.add_argument('--input', default=None, help="합성 문서 대신 사용할 Markdown 파일")
+    args = parser.parse_args()
+
+    if args.input:
+        text = Path(args.input).read_text(encoding='utf-8')
+    else:
+        text = synthetic_markdown(int(args.size_mb * 1024 * 1024), args.seed)
+    text_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    print(f"문서: {text_mb:.1f}MB, {len(text):,}자")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 진행 로그(print)가 측정을 방해하지 않도록 파일로 돌림
+        stdout = sys.stdout
+        sys.stdout = open(Path(tmp) / 'progress.log', 'w', encoding='utf-8')
+        try:
+            results = [
+                (label, *measure(func, text, Path(tmp) / f'{label}.md'))
+                for label, func in (("이전", legacy_pipeline), ("현재", streaming_pipeline))
+            ]
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        outputs = [(Path(tmp) / f'{label}.md').read_bytes() for label, _, _ in results]
+
+    print(f"{'흐름':<8}{'시간 (s)':>10}{'추가 메모리 (MB)':>18}{'원문 대비':>10}")
+    print("-" * 46)
+    for label, elapsed, peak_mb in results:
+        print(f"{label:<8}{elapsed:>10.2f}{peak_mb:>18.1f}{peak_mb / text_mb:>9.2f}x")
+    print("출력 일치" if outputs[0] == outputs[1] else "[실패] 두 흐름의 출력이 다름")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""NLLB CPU 병렬화 방식 벤치마크 (intra-op 스레드 vs 워커 프로세스)
+
+같은 문서를 하이브리드 규칙으로 번역하면서
+- 단일 모델 + torch 스레드 N개 (intra-op)
+- 워커 프로세스 W개 x torch 스레드 N/W개 (프로세스 병렬)
+구성별 처리량(토큰/초)을 측정한다. 구성마다 별도 프로세스에서 실행하며,
+모델 로딩/워커 준비 시간은 처리량에서 제외한다.
+
+--save를 주면 가장 빠른 구성을 models/nllb_parallelism.json에 저장하고,
+translator.py는 NLLB_WORKERS / NLLB_TORCH_THREADS 환경 변수가 없을 때 이 값을 기본값으로 사용한다.
+
+사용법:
+    python benchmarks/bench_parallelism.py [--input 문서.pdf|문서.md] [--workers 1,2,4,8] [--save]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# 측정 중에는 캐시/추론 서버가 결과를 왜곡하지 않도록 끔
+BENCH_ENV = {
+    'TRANSLATION_MEMORY': '0',
+    'NLLB_INFERENCE_SERVER': '0',
+    'NLLB_WORKERS': '0',
+}
+
+
+def load_markdown(input_path: Path) -> str:
+    if input_path.suffix.lower() == '.md':
+        return input_path.read_text(encoding='utf-8')
+    from file_utils import convert_pdf_to_markdown
+    return convert_pdf_to_markdown(input_path)
+
+
+def run_worker(workers: int, threads: int, markdown_file: str) -> dict:
+    """단일 구성으로 문서 번역 시간을 측정 (하위 프로세스에서 실행)"""
+    import torch
+    import translator
+
+    chunks_info = translator.split_markdown_by_headers(Path(markdown_file).read_text(encoding='utf-8'))
+    warmup = chunks_info[:1]
+
+    if workers <= 1:
+        torch.set_num_threads(threads)
+        translator.get_translator()
+        for chunk in warmup:
+            translator.translate_hybrid_chunk(chunk['text'], chunk['size'])
+        start = time.perf_counter()
+        for i, chunk in enumerate(chunks_info):
+            translator.translate_hybrid_chunk(chunk['text'], chunk['size'], index=i)
+        seconds = time.perf_counter() - start
+        from nllb_process_pool import count_tokens
+        tokens = sum(count_tokens([chunk['text'] for chunk in chunks_info]))
+    else:
+        from nllb_process_pool import translate_chunks_parallel, shutdown_process_pool
+        # 워커마다 모델을 로드하도록 워커 수만큼 준비 작업을 먼저 실행
+        translate_chunks_parallel(warmup * workers, num_workers=workers, threads=threads)
+        start = time.perf_counter()
+        _, stats = translate_chunks_parallel(chunks_info, num_workers=workers, threads=threads)
+        seconds = time.perf_counter() - start
+        tokens = stats['tokens']
+        shutdown_process_pool()
+
+    return {
+        'workers': workers,
+        'threads': threads,
+        'chunks': len(chunks_info),
+        'tokens': tokens,
+        'seconds': seconds,
+        'tokens_per_second': tokens / seconds if seconds > 0 else 0.0,
+    }
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="NLLB intra-op 스레드 vs 워커 프로세스 벤치마크")
+    parser.add_argument('--input', default=None, help="번역할 PDF/Markdown (기본: data/의 첫 PDF)")
+    parser.add_argument('--workers', default=None, help=f"비교할 워커 수 목록 (기본: 1,2,4,... ≤ {cores})")
+    parser.add_argument('--save', action='store_true', help="가장 빠른 구성을 models/nllb_parallelism.json에 저장")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--threads', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--markdown-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.threads, args.markdown_file)))
+        return
+
+    input_path = Path(args.input) if args.input else next(iter(sorted((ROOT_DIR / 'data').glob('*.pdf'))), None)
+    if input_path is None:
+        print("벤치마크할 문서가 없습니다. --input으로 지정하세요.")
+        sys.exit(1)
+    markdown_file = Path(tempfile.gettempdir()) / 'bench_parallelism.md'
+    markdown_file.write_text(load_markdown(input_path), encoding='utf-8')
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cores:
+            worker_counts.append(worker_counts[-1] * 2)
+
+    print(f"문서: {input_path.name}, CPU 코어 {cores}개")
+    print(f"{'워커':>6}{'스레드':>8}{'소요 시간 (s)':>16}{'토큰/초':>12}")
+    print("-" * 42)
+
+    results = []
+    for workers in worker_counts:
+        threads = max(1, cores // workers)
+        command = [sys.executable, __file__, '--worker', str(workers), '--threads', str(threads),
+                   '--markdown-file', str(markdown_file)]
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=ROOT_DIR,
+                                   env={**os.environ, **BENCH_ENV})
+        if completed.returncode != 0:
+            print(f"{workers:>6}{threads:>8}  실패: {completed.stderr.strip().splitlines()[-1:]}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"{workers:>6}{threads:>8}{result['seconds']:>16.1f}{result['tokens_per_second']:>12.1f}")
+
+    if not results:
+        sys.exit(1)
+
+    best = max(results, key=lambda r: r['tokens_per_second'])
+    mode = "intra-op 스레드" if best['workers'] <= 1 else "워커 프로세스"
+    print("-" * 42)
+    print(f"권장: {mode} (NLLB_WORKERS={best['workers'] if best['workers'] > 1 else 0} NLLB_TORCH_THREADS={best['threads']})")
+
+    if args.save:
+        from translator import PARALLELISM_CONFIG_FILE
+        PARALLELISM_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PARALLELISM_CONFIG_FILE.write_text(json.dumps({
+            'workers': best['workers'] if best['workers'] > 1 else 0,
+            'threads': best['threads'],
+            'tokens_per_second': round(best['tokens_per_second'], 1),
+            'measured_at': datetime.now().isoformat(timespec='seconds'),
+            'document': input_path.name,
+        }, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"저장: {PARALLELISM_CONFIG_FILE}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Ollama 프롬프트 캐시 벤치마크 (지침+원문 한 메시지 vs 고정 system 메시지 + 원문)
+
+실행 중인 Ollama 서버에 문서의 번역 단위를 하나씩 보내며 두 메시지 구성의
+프롬프트 평가 토큰 수(prompt_eval_count)와 시간(prompt_eval_duration), 모델 로드 시간을 비교한다.
+- 이전: 지침과 원문 템플릿을 합친 user 메시지 하나
+- 현재: 요청마다 같은 지침(system) + 원문(user), 같은 옵션과 keep_alive
+서버는 캐시된 앞부분을 prompt_eval_count에 넣지 않으므로, 요청당 평가 토큰 수가 원문 길이에
+가까울수록 캐시가 맞은 것이다. 번역 메모리는 쓰지 않는다.
+
+사용법:
+    python benchmarks/bench_prompt_cache.py --input 문서.md [--model gemma3:4b] [--units 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from argos_translator import MarkdownTranslator  # noqa: E402
+from ollama_client import shutdown_ollama_client  # noqa: E402
+from ollama_translator import MultilingualTranslator, TranslationConfig  # noqa: E402
+
+
+def legacy_messages(translator: MultilingualTranslator, text: str, source: str):
+    """이전 구성: 지침과 원문을 합친 user 메시지 하나"""
+    merged = f"{translator.system_prompt}\n{translator._prompt(text, source)}".strip()
+    return [{"role": "user", "content": merged}]
+
+
+def run(translator: MultilingualTranslator, units, build) -> dict:
+    """단위마다 요청을 보내고 응답 통계를 합산"""
+    totals = {'prompt_eval_count': 0, 'prompt_eval_duration': 0, 'load_duration': 0}
+    start = time.perf_counter()
+    for text, source in units:
+        response = translator.client.chat_sync(
+            model=translator.config.model_name, messages=build(text, source),
+            options=translator.options, keep_alive=translator.config.keep_alive,
+        )
+        for key in totals:
+            totals[key] += response.get(key, 0)
+    totals['seconds'] = time.perf_counter() - start
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama 프롬프트 캐시 벤치마크")
+    parser.add_argument('--input', required=True, help="번역 단위를 뽑을 Markdown 파일")
+    parser.add_argument('--model', default=TranslationConfig.model_name, help="Ollama 모델")
+    parser.add_argument('--units', type=int, default=20, help="보낼 번역 단위 수")
+    args = parser.parse_args()
+
+    translator = MultilingualTranslator(TranslationConfig(model_name=args.model))
+    markdown = Path(args.input).read_text(encoding='utf-8')
+    segmenter = MarkdownTranslator("auto", "ko")
+    segmenter.resolve_document_language(markdown)
+    units = []
+    for unit in segmenter.iter_units(markdown):
+        if unit.is_translatable:
+            units.append((unit.content, segmenter.unit_language(unit.content)))
+            if len(units) >= args.units:
+                break
+    if not units:
+        print("번역할 단위가 없습니다.")
+        sys.exit(1)
+    print(f"문서: {args.input}, 모델: {args.model}, 단위 {len(units)}개")
+
+    try:
+        # 모델을 미리 올려 두고 측정 (첫 요청의 로드 시간이 한쪽에만 들어가지 않도록)
+        run(translator, units[:1], translator._messages)
+        results = [
+            ("이전", run(translator, units, lambda text, source: legacy_messages(translator, text, source))),
+            ("현재", run(translator, units, translator._messages)),
+        ]
+    finally:
+        shutdown_ollama_client()
+
+    print(f"{'구성':<6}{'평가 토큰':>10}{'요청당':>8}{'평가 시간 (s)':>15}{'로드 (s)':>10}{'전체 (s)':>10}")
+    print("-" * 59)
+    for label, totals in results:
+        print(f"{label:<6}{totals['prompt_eval_count']:>10}{totals['prompt_eval_count'] / len(units):>8.1f}"
+              f"{totals['prompt_eval_duration'] / 1e9:>15.2f}{totals['load_duration'] / 1e9:>10.2f}"
+              f"{totals['seconds']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""NLLB fp32 vs int8 동적 양자화 벤치마크
+
+data/ 폴더의 샘플 PDF에서 문장을 뽑아 precision별로 번역하고
+모델 로딩 시간, 문장당 지연 시간, 상주 메모리(RSS), fp32 대비 출력 일치도를 비교한다.
+precision마다 별도 프로세스에서 실행하여 메모리 측정이 서로 섞이지 않게 한다.
+
+사용법:
+    python benchmarks/bench_quantization.py [--segments 20] [--batch-size 8] [--model 경로]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def rss_mb() -> float:
+    """현재 프로세스의 상주 메모리(MB)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        import resource
+        # Linux는 KB, macOS는 byte 단위 (최대 RSS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def collect_segments(per_document: int) -> list:
+    """샘플 PDF를 Markdown으로 변환한 뒤 번역 대상 문장을 문서별로 추출"""
+    from file_utils import convert_pdf_to_markdown
+    from translator import split_text_into_sentences
+
+    segments = []
+    for pdf_path in sorted((ROOT_DIR / 'data').glob('*.pdf')):
+        try:
+            markdown = convert_pdf_to_markdown(pdf_path)
+        except Exception as e:
+            print(f"[건너뜀] {pdf_path.name}: {e}", file=sys.stderr)
+            continue
+        picked = []
+        for line in markdown.split('\n'):
+            line = line.strip()
+            if not line or line.startswith(('#', '```', '|')):
+                continue
+            picked.extend(s for s in split_text_into_sentences(line) if len(s) >= 10)
+            if len(picked) >= per_document:
+                break
+        segments.extend({'document': pdf_path.name, 'text': s} for s in picked[:per_document])
+    return segments
+
+
+def run_worker(precision: str, model_path: str, segments_file: str, batch_size: int) -> dict:
+    """단일 precision으로 모델을 로드하고 번역 (하위 프로세스에서 실행)"""
+    import translator
+
+    segments = json.loads(Path(segments_file).read_text(encoding='utf-8'))
+    rss_before = rss_mb()
+
+    load_start = time.perf_counter()
+    nllb = translator.NLLBTranslator(model_path=model_path, device='cpu', precision=precision)
+    nllb._initialize_model()
+    load_seconds = time.perf_counter() - load_start
+    rss_loaded = rss_mb()
+
+    outputs = []
+    translate_start = time.perf_counter()
+    for segment in segments:
+        src_code = translator.NLLB_LANGUAGE_CODES.get(nllb.detect_language(segment['text']), 'eng_Latn')
+        outputs.append(nllb.translate_batch([segment['text']], src_code, 'kor_Hang', batch_size=1, num_beams=2)[0])
+    sequential_seconds = time.perf_counter() - translate_start
+
+    # 같은 문장을 배치로도 측정 (언어별 그룹)
+    groups = {}
+    for segment in segments:
+        src_code = translator.NLLB_LANGUAGE_CODES.get(nllb.detect_language(segment['text']), 'eng_Latn')
+        groups.setdefault(src_code, []).append(segment['text'])
+    batch_start = time.perf_counter()
+    for src_code, texts in groups.items():
+        nllb.translate_batch(texts, src_code, 'kor_Hang', batch_size=batch_size, num_beams=2)
+    batched_seconds = time.perf_counter() - batch_start
+
+    return {
+        'precision': nllb.precision,
+        'load_seconds': load_seconds,
+        'rss_model_mb': rss_loaded - rss_before,
+        'rss_peak_mb': rss_mb(),
+        'sequential_ms_per_segment': sequential_seconds * 1000 / max(1, len(segments)),
+        'batched_ms_per_segment': batched_seconds * 1000 / max(1, len(segments)),
+        'outputs': outputs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NLLB fp32 vs int8 벤치마크")
+    parser.add_argument('--segments', type=int, default=20, help="문서당 문장 수")
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--model', default=None, help="모델 경로 (기본: 자동 탐색)")
+    parser.add_argument('--worker', choices=['fp32', 'int8'], help=argparse.SUPPRESS)
+    parser.add_argument('--segments-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.model, args.segments_file, args.batch_size), ensure_ascii=False))
+        return
+
+    segments = collect_segments(args.segments)
+    if not segments:
+        print("data/ 폴더에서 번역할 문장을 찾지 못했습니다.")
+        sys.exit(1)
+    segments_file = Path(tempfile.gettempdir()) / 'bench_quantization_segments.json'
+    segments_file.write_text(json.dumps(segments, ensure_ascii=False), encoding='utf-8')
+    print(f"샘플 문장 {len(segments)}개 ({len({s['document'] for s in segments})}개 문서)")
+
+    results = {}
+    for precision in ('fp32', 'int8'):
+        # int8은 첫 실행에 체크포인트를 만들므로 두 번 실행해 재시작 로딩 시간을 측정
+        runs = 2 if precision == 'int8' else 1
+        for run in range(runs):
+            command = [sys.executable, __file__, '--worker', precision, '--segments-file', str(segments_file),
+                       '--batch-size', str(args.batch_size)]
+            if args.model:
+                command += ['--model', args.model]
+            completed = subprocess.run(command, capture_output=True, text=True, cwd=ROOT_DIR, env=dict(os.environ))
+            if completed.returncode != 0:
+                print(completed.stderr)
+                sys.exit(completed.returncode)
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            if run == 0 and runs > 1:
+                result_first_load = result['load_seconds']
+            else:
+                results[precision] = result
+        if runs > 1:
+            results[precision]['first_load_seconds'] = result_first_load
+
+    baseline = results['fp32']['outputs']
+    quantized = results['int8']['outputs']
+    exact = sum(a == b for a, b in zip(baseline, quantized)) / len(baseline)
+    similarity = sum(difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(baseline, quantized)) / len(baseline)
+
+    print()
+    print(f"{'항목':<28}{'fp32':>12}{'int8':>12}")
+    print("-" * 52)
+    for key, label in [('load_seconds', '로딩 시간 (s)'),
+                       ('rss_model_mb', '모델 메모리 (MB)'),
+                       ('rss_peak_mb', '최대 RSS (MB)'),
+                       ('sequential_ms_per_segment', '순차 지연 (ms/문장)'),
+                       ('batched_ms_per_segment', '배치 지연 (ms/문장)')]:
+        print(f"{label:<28}{results['fp32'][key]:>12.1f}{results['int8'][key]:>12.1f}")
+    print(f"{'int8 최초 양자화 포함 로딩 (s)':<28}{'':>12}{results['int8']['first_load_seconds']:>12.1f}")
+    print("-" * 52)
+    print(f"출력 완전 일치율: {exact * 100:.1f}%")
+    print(f"출력 평균 유사도: {similarity * 100:.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""Markdown 세그먼터 벤치마크 (이전 분할 함수 vs 단일 순회 세그먼터)
+
+합성 Markdown 문서(기본 10MB: 헤더/영문·일문 문단/긴 문단/표/코드 블록)에 대해
+- NLLB 헤더 섹션 분할 (split_markdown_by_headers + split_text_by_size)
+- NLLB 문장별 모드의 라인/문장 분할
+- Argos/Ollama 번역 단위 분할 (MarkdownTranslator.split_into_units)
+의 이전 구현과 현재 구현의 처리 시간과 최대 메모리(tracemalloc)를 비교한다. 모델은 로드하지 않는다.
+
+10MB 합성 문서 측정치 (--repeat 9, 이전 대비 현재 속도): 문장 모드 0.9~1.1x, Argos 단위 0.9~1.0x로 비슷하고,
+헤더 섹션 분할은 0.7~0.8x로 느리다 (코드 블록 안의 '#' 줄을 헤더로 보지 않도록 블록 패턴으로 헤더를 찾기 때문).
+최대 메모리는 헤더 섹션 35MB → 21MB, 문장 모드와 Argos 단위는 비슷하다.
+
+사용법:
+    python benchmarks/bench_segmenter.py [--size-mb 10] [--seed 0] [--input 문서.md] [--repeat 5]
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from argos_translator import MarkdownTranslator, TranslationUnit  # noqa: E402
+from translator import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, _plan_sentence_lines, split_markdown_by_headers  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+EN_SENTENCES = [
+    "The Consultant shall perform the services described in Schedule A.",
+    "Either party may terminate this Agreement upon thirty days written notice!",
+    "Is the Client liable for indirect damages?",
+    "All invoices are payable within forty-five days of receipt.",
+]
+JA_SENTENCES = [
+    "本契約は日本法に準拠するものとします。",
+    "甲は乙に対し、秘密情報を開示することができる。",
+    "本条の規定は契約終了後も有効に存続する！",
+]
+
+
+def synthetic_markdown(size_bytes: int, seed: int) -> str:
+    """헤더/문단/표/코드 블록이 섞인 합성 Markdown 문서"""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    section = 0
+    while total < size_bytes:
+        section += 1
+        block_kind = rng.random()
+        if block_kind < 0.15:
+            part = f"{'#' * rng.randint(1, 3)} 제{section}조 Section {section}"
+        elif block_kind < 0.22:
+            rows = "\n".join(f"| item {i} | {rng.randint(1, 999)} |" for i in range(rng.randint(2, 6)))
+            part = "| 항목 | 값 |\n|---|---|\n" + rows
+        elif block_kind < 0.26:
+            part = "```python\n# 설정 값 (헤더 아님)\nvalue = 1\n```"
+        else:
+            pool = JA_SENTENCES if rng.random() < 0.3 else EN_SENTENCES
+            count = rng.randint(1, 40) if rng.random() < 0.1 else rng.randint(1, 6)
+            part = " ".join(rng.choice(pool) for _ in range(count))
+        parts.append(part)
+        total += len(part.encode("utf-8")) + 2
+    return "\n\n".join(parts)
+
+
+# --- 이전 구현 (비교 기준) -------------------------------------------------------
+
+HEADER_PATTERN = re.compile(r'^(#{1,6}\s.+)', re.MULTILINE)
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+
+def legacy_split_text_by_size(text: str, max_size: int) -> list:
+    if len(text) <= max_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + max_size
+        if end >= len(text):
+            chunks.append(text[start:])
+            break
+        paragraph_end = text.rfind('\n\n', start, end)
+        if paragraph_end != -1 and paragraph_end > start:
+            end = paragraph_end + 2
+        else:
+            sentence_end = max([
+                text.rfind('. ', start, end), text.rfind('! ', start, end), text.rfind('? ', start, end),
+                text.rfind('。', start, end), text.rfind('！', start, end), text.rfind('？', start, end),
+            ])
+            if sentence_end != -1 and sentence_end > start:
+                end = sentence_end + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def legacy_split_markdown_by_headers(markdown_text: str) -> list:
+    header_matches = list(HEADER_PATTERN.finditer(markdown_text))
+    if not header_matches:
+        return [{'text': c, 'size': len(c)} for c in legacy_split_text_by_size(markdown_text, MAX_CHUNK_SIZE)]
+    sections = []
+    for i, match in enumerate(header_matches):
+        next_start = header_matches[i + 1].start() if i < len(header_matches) - 1 else len(markdown_text)
+        section_text = markdown_text[match.start():next_start].strip()
+        sections.append({'text': section_text, 'header': match.group(0).strip(), 'size': len(section_text)})
+    merged = []
+    current = None
+    for section in sections:
+        if current is None:
+            current = section.copy()
+        elif section['size'] < MIN_CHUNK_SIZE and current['size'] + section['size'] <= MAX_CHUNK_SIZE:
+            current['text'] += '\n\n' + section['text']
+            current['size'] += section['size']
+        else:
+            merged.append(current)
+            current = section.copy()
+    if current is not None:
+        merged.append(current)
+    final = []
+    for section in merged:
+        if section['size'] > MAX_CHUNK_SIZE:
+            final.extend({'text': c, 'size': len(c)} for c in legacy_split_text_by_size(section['text'], MAX_CHUNK_SIZE))
+        else:
+            final.append(section)
+    return final
+
+
+def legacy_sentence_lines(markdown_text: str) -> list:
+    lines = []
+    for line in markdown_text.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('#') or line.startswith('```') or line.startswith('|'):
+            lines.append(line)
+        else:
+            lines.append([s.strip() for s in SENTENCE_SPLIT_PATTERN.split(line.strip()) if s.strip()])
+    return lines
+
+
+def legacy_split_into_units(markdown_text: str) -> list:
+    """이전 MarkdownTranslator.split_into_units (문단 단위)"""
+    units = []
+    lines = markdown_text.split("\n")
+    paragraph = []
+
+    def flush():
+        text = "\n".join(paragraph)
+        if text.strip():
+            units.append(TranslationUnit(text, "paragraph", True, {"line_count": len(paragraph)}))
+        paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            if paragraph:
+                flush()
+            code_block = [line]
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                code_block.append(lines[i])
+                i += 1
+            if i < len(lines):
+                code_block.append(lines[i])
+            units.append(TranslationUnit("\n".join(code_block), "code", False, {"line_count": len(code_block)}))
+        elif stripped.startswith("#"):
+            if paragraph:
+                flush()
+            level = len(stripped) - len(stripped.lstrip('#'))
+            header_text = stripped[level:].strip()
+            units.append(TranslationUnit(line, "header", bool(header_text), {"level": level, "text": header_text}))
+        elif not stripped:
+            if paragraph:
+                flush()
+            units.append(TranslationUnit("", "empty", False, {}))
+        else:
+            paragraph.append(line)
+        i += 1
+    if paragraph:
+        flush()
+    return units
+
+
+# --- 측정 ------------------------------------------------------------------------
+
+def peak_memory(func, text: str):
+    """(최대 추가 메모리 MB, 결과 개수)"""
+    tracemalloc.start()
+    result = func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024), len(result)
+
+
+def measure(legacy, current, text: str, repeat: int):
+    """
+    이전/현재 구현을 번갈아 실행해 각각 가장 빠른 실행의 소요 시간(초)을 잼
+    (한쪽을 몰아서 재면 측정 중 기기 부하 변화가 한쪽에만 들어가 비율이 크게 흔들림)
+    """
+    timings = ([], [])
+    for _ in range(max(1, repeat)):
+        for func, samples in zip((legacy, current), timings):
+            start = time.perf_counter()
+            result = func(text)
+            samples.append(time.perf_counter() - start)
+            del result
+    return min(timings[0]), min(timings[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Markdown 세그먼터 벤치마크")
+    parser.add_argument('--size-mb', type=float, default=10.0, help="합성 문서 크기 (MB)")
+    parser.add_argument('--seed', type=int, default=0, help="합성 문서 난수 시드")
+    parser.add_argument('--input', default=None, help="합성 문서 대신 사용할 Markdown 파일")
+    parser.add_argument('--repeat', type=int, default=5, help="반복 측정 횟수 (이전/현재를 번갈아 실행, 가장 빠른 실행 사용)")
+    args = parser.parse_args()
+
+    if args.input:
+        text = Path(args.input).read_text(encoding='utf-8')
+    else:
+        text = synthetic_markdown(int(args.size_mb * 1024 * 1024), args.seed)
+    print(f"문서: {len(text.encode('utf-8')) / (1024 * 1024):.1f}MB, {len(text):,}자, {text.count(chr(10)) + 1:,}줄")
+
+    argos = MarkdownTranslator()
+    stages = [
+        ("헤더 섹션 분할", legacy_split_markdown_by_headers, split_markdown_by_headers),
+        ("문장 모드 분할", legacy_sentence_lines, _plan_sentence_lines),
+        ("Argos 단위 분할", legacy_split_into_units, argos.split_into_units),
+    ]
+    print(f"{'단계':<16}{'이전 (s)':>10}{'현재 (s)':>10}{'속도':>8}{'이전 (MB)':>11}{'현재 (MB)':>11}{'세그먼트 (이전/현재)':>22}")
+    print("-" * 88)
+    for label, legacy, current in stages:
+        before, after = measure(legacy, current, text, args.repeat)
+        before_mb, before_count = peak_memory(legacy, text)
+        after_mb, after_count = peak_memory(current, text)
+        print(f"{label:<16}{before:>10.2f}{after:>10.2f}{before / after:>7.1f}x"
+              f"{before_mb:>11.1f}{after_mb:>11.1f}{f'{before_count:,}/{after_count:,}':>22}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""NLLB 전처리/후처리 마이크로 벤치마크 (이전 구현 vs 단일 순회 구현)
+
+data/ 폴더 문서(또는 --input)의 문단/문장과 반복이 심한 합성 세그먼트에 대해
+이전 `_preprocess_text` / `_postprocess_text` 구현과 현재 clean_source_text / clean_translation의
+세그먼트당 처리 시간을 비교하고, 두 구현의 출력이 같은지 확인한다.
+모델은 로드하지 않는다.
+
+사용법:
+    python benchmarks/bench_text_cleaning.py [--input 문서.pdf|문서.md ...] [--repeat 20]
+"""
+
+import argparse
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from translator import clean_source_text, clean_translation  # noqa: E402
+
+# 반복 감지 경고 로그가 측정을 방해하지 않도록 끔
+logging.disable(logging.CRITICAL)
+
+SYNTHETIC_SEGMENTS = [
+    "the the the contract shall be be be binding upon the parties.",
+    "Confidential, Confidential, Confidential, Confidential information shall remain confidential.",
+    "계약 계약 계약 계약 계약 계약 계약 계약 계약 계약 계약 계약 계약. 두 번째 문장.",
+    " ".join(["party"] * 30) + ". Second sentence follows here.",
+    "This Agreement is made. This Agreement is made. This Agreement is made again today!",
+    "Short. " * 400,
+]
+
+
+def legacy_preprocess(text: str) -> str:
+    """이전 NLLBTranslator._preprocess_text (비교 기준)"""
+    processed_text = text.strip()
+    pattern = r'\b(\w+)(\s+\1){2,}\b'
+    processed_text = re.sub(pattern, r'\1', processed_text, flags=re.IGNORECASE)
+    pattern = r'([^,]+),\s*\1(?:,\s*\1)*'
+    processed_text = re.sub(pattern, r'\1', processed_text)
+    words = processed_text.split()
+    if len(words) > 10:
+        word_count = {}
+        for word in words:
+            if len(word) > 2:
+                word_count[word] = word_count.get(word, 0) + 1
+        total_words = len([w for w in words if len(w) > 2])
+        if total_words > 0:
+            for word, count in word_count.items():
+                if count > max(3, total_words * 0.3):
+                    sentences = re.split(r'[.!?]+', text.strip())
+                    first_sentence = sentences[0].strip() if sentences else text[:100]
+                    return first_sentence + '.' if first_sentence and not first_sentence.endswith('.') else first_sentence
+    return processed_text
+
+
+def legacy_postprocess(text: str) -> str:
+    """이전 NLLBTranslator._postprocess_text (비교 기준)"""
+    if not text or not text.strip():
+        return text
+    processed_text = text.strip()
+    pattern = r'\b(\w+)(\s+\1){2,}\b'
+    processed_text = re.sub(pattern, r'\1', processed_text, flags=re.IGNORECASE)
+    pattern = r'([^,]+),\s*\1(?:,\s*\1)+'
+    processed_text = re.sub(pattern, r'\1', processed_text)
+    words = processed_text.split()
+    if len(words) > 20:
+        word_count = {}
+        for word in words:
+            if len(word) > 2 and word.isalpha():
+                word_count[word] = word_count.get(word, 0) + 1
+        total_meaningful_words = len([w for w in words if len(w) > 2 and w.isalpha()])
+        if total_meaningful_words > 0:
+            for word, count in word_count.items():
+                if count >= 10 or (count / total_meaningful_words) >= 0.2:
+                    sentences = re.split(r'[.!?]+', processed_text)
+                    if sentences and len(sentences[0].strip()) > 10:
+                        return sentences[0].strip() + '.'
+                    else:
+                        return "[번역 오류: 반복 패턴 감지됨]"
+    sentences = re.split(r'(?<=[.!?])\s+', processed_text)
+    unique_sentences = []
+    seen = set()
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if sentence and len(sentence) > 5:
+            sentence_key = sentence[:50].lower()
+            if sentence_key not in seen:
+                unique_sentences.append(sentence)
+                seen.add(sentence_key)
+    result = ' '.join(unique_sentences)
+    if len(result) > 2000:
+        sentences = re.split(r'(?<=[.!?])\s+', result)
+        final_result = ""
+        for sentence in sentences:
+            if len(final_result + sentence) <= 2000:
+                final_result += sentence + " "
+            else:
+                break
+        result = final_result.strip()
+    return result if result else "[번역 실패]"
+
+
+def load_segments(paths) -> list:
+    """문서를 문단 단위 세그먼트로 분할 (PDF는 Markdown으로 변환)"""
+    segments = []
+    for path in paths:
+        try:
+            if path.suffix.lower() == '.pdf':
+                from file_utils import convert_pdf_to_markdown
+                markdown = convert_pdf_to_markdown(path)
+            else:
+                markdown = path.read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"[건너뜀] {path.name}: {e}", file=sys.stderr)
+            continue
+        segments.extend(p.strip() for p in re.split(r'\n\s*\n', markdown) if p.strip())
+    return segments
+
+
+def time_per_segment(func, segments, repeat: int) -> float:
+    """세그먼트당 평균 처리 시간 (마이크로초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for segment in segments:
+            func(segment)
+    return (time.perf_counter() - start) / (repeat * len(segments)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NLLB 전처리/후처리 마이크로 벤치마크")
+    parser.add_argument('--input', nargs='*', default=None, help="PDF/Markdown 문서 (기본: data/의 모든 PDF)")
+    parser.add_argument('--repeat', type=int, default=20, help="반복 횟수")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.input] if args.input else sorted((ROOT_DIR / 'data').glob('*.pdf'))
+    document_segments = load_segments(paths)
+    segments = document_segments + SYNTHETIC_SEGMENTS
+    print(f"세그먼트: 문서 {len(document_segments)}개 + 합성 {len(SYNTHETIC_SEGMENTS)}개")
+
+    mismatches = 0
+    for legacy, current in ((legacy_preprocess, clean_source_text), (legacy_postprocess, clean_translation)):
+        mismatches += sum(1 for segment in segments if legacy(segment) != current(segment))
+
+    print(f"{'단계':<12}{'이전 (us)':>12}{'현재 (us)':>12}{'속도 향상':>10}")
+    print("-" * 46)
+    for label, legacy, current in (("전처리", legacy_preprocess, clean_source_text),
+                                   ("후처리", legacy_postprocess, clean_translation)):
+        before = time_per_segment(legacy, segments, args.repeat)
+        after = time_per_segment(current, segments, args.repeat)
+        print(f"{label:<12}{before:>12.1f}{after:>12.1f}{before / after:>9.2f}x")
+
+    if mismatches:
+        print(f"[실패] 이전 구현과 출력이 다른 세그먼트: {mismatches}개")
+        sys.exit(1)
+    print("출력 일치: 모든 세그먼트")
+
+
+if __name__ == '__main__':
+    main()
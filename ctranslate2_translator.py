@@ -0,0 +1,143 @@
+"""CTranslate2 기반 NLLB 번역 엔진
+
+로컬 NLLB 체크포인트를 CTranslate2 모델로 한 번 변환해 두고,
+CPU int8 연산으로 배치 번역한다. NLLBTranslator와 같은 인터페이스
+(translate_text, translate_batch, translator 호출 규약)를 유지하므로
+translator.py의 모듈 수준 함수들을 그대로 사용할 수 있다.
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Union
+
+from translator import NLLBTranslator, is_quantized_checkpoint
+
+try:
+    import ctranslate2
+    CTRANSLATE2_AVAILABLE = True
+except ImportError:
+    CTRANSLATE2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# CTranslate2 설정
+CT2_MODEL_DIR = Path("./models")
+CT2_COMPUTE_TYPE = os.environ.get("NLLB_CT2_COMPUTE_TYPE", "int8")
+CT2_INTRA_THREADS = int(os.environ.get("NLLB_CT2_THREADS", "0"))  # 0이면 CTranslate2 기본값
+
+
+def ct2_model_dir(model_name: str, compute_type: str = CT2_COMPUTE_TYPE) -> Path:
+    """모델 경로/이름에 대응하는 CTranslate2 변환 모델 폴더 경로"""
+    base_name = Path(model_name).name if os.path.isdir(model_name) else model_name.replace('/', '--')
+    return CT2_MODEL_DIR / f"{base_name}-ct2-{compute_type}"
+
+
+def convert_to_ctranslate2(model_name: str, output_dir=None, quantization: str = CT2_COMPUTE_TYPE) -> Path:
+    """HuggingFace NLLB 체크포인트를 CTranslate2 모델로 변환 (이미 있으면 재사용)"""
+    if not CTRANSLATE2_AVAILABLE:
+        raise RuntimeError("ctranslate2 패키지가 필요합니다")
+    if is_quantized_checkpoint(model_name):
+        raise RuntimeError(f"torch int8 체크포인트는 변환할 수 없습니다. fp32 모델 경로를 사용하세요: {model_name}")
+
+    output_dir = Path(output_dir) if output_dir else ct2_model_dir(model_name, quantization)
+    if (output_dir / "model.bin").exists():
+        return output_dir
+
+    logger.info(f"CTranslate2 모델 변환 중 (최초 1회): {model_name} -> {output_dir}")
+    converter = ctranslate2.converters.TransformersConverter(model_name)
+    converter.convert(str(output_dir), quantization=quantization, force=True)
+    logger.info(f"CTranslate2 모델 변환 완료: {output_dir}")
+    return output_dir
+
+
+class CTranslate2Pipeline:
+    """HF translation 파이프라인과 같은 호출 규약으로 CTranslate2 translate_batch를 실행하는 어댑터"""
+
+    def __init__(self, model: "ctranslate2.Translator", tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+
+    def __call__(self, text: Union[str, List[str]], src_lang: str, tgt_lang: str,
+                 batch_size: int = 1, **kwargs) -> List[Dict[str, Any]]:
+        texts = [text] if isinstance(text, str) else list(text)
+        batch_ids = [self.tokenizer(t, add_special_tokens=False)['input_ids'] for t in texts]
+        outputs = self.translate_ids(batch_ids, src_lang, tgt_lang, **kwargs)
+        return [{'translation_text': output} for output in outputs]
+
+    def translate_ids(self, batch_ids: List[List[int]], src_lang: str, tgt_lang: str,
+                      max_length: int = 256, min_length: int = 0, num_beams: int = 1,
+                      repetition_penalty: float = 1.0, no_repeat_ngram_size: int = 0,
+                      length_penalty: float = 1.0, **_ignored) -> List[str]:
+        """언어 토큰/EOS를 제외한 토큰 id 목록을 번역 (NLLB 입력 형식: 언어 토큰 + 본문 + EOS)"""
+        eos_token = self.tokenizer.eos_token
+        source_tokens = [[src_lang] + self.tokenizer.convert_ids_to_tokens(ids) + [eos_token] for ids in batch_ids]
+
+        results = self.model.translate_batch(
+            source_tokens,
+            target_prefix=[[tgt_lang]] * len(source_tokens),
+            max_batch_size=max(1, len(source_tokens)),
+            beam_size=max(1, num_beams),
+            max_decoding_length=max_length,
+            min_decoding_length=min_length,
+            repetition_penalty=repetition_penalty,
+            no_repeat_ngram_size=no_repeat_ngram_size,
+            length_penalty=length_penalty,
+        )
+
+        outputs = []
+        for result in results:
+            target_tokens = result.hypotheses[0][1:]  # 대상 언어 토큰 제외
+            token_ids = self.tokenizer.convert_tokens_to_ids(target_tokens)
+            outputs.append(self.tokenizer.decode(token_ids, skip_special_tokens=True))
+        return outputs
+
+
+class CTranslate2NLLBTranslator(NLLBTranslator):
+    """CTranslate2 런타임을 사용하는 NLLB 번역기 (CPU int8)"""
+
+    def __init__(self, model_path: str = None, device: str = "cpu", compute_type: str = CT2_COMPUTE_TYPE):
+        super().__init__(model_path=model_path, device=device, precision="fp32")
+        self.compute_type = compute_type
+        self.engine = "ctranslate2"
+
+    @property
+    def model_id(self) -> str:
+        """번역 메모리 키에 쓰는 모델 식별자 (연산 타입별로 구분)"""
+        return f"{Path(self.model_name).name}:{self.engine}:{self.compute_type}"
+
+    def _initialize_model(self):
+        """CTranslate2 모델 변환/로딩 (지연 로딩)"""
+        if self._initialized:
+            return
+
+        try:
+            logger.info("CTranslate2 NLLB 모델 로딩 중...")
+            start_time = time.perf_counter()
+            self._load_tokenizer()
+
+            model_dir = convert_to_ctranslate2(self.model_name, quantization=self.compute_type)
+            self.model = ctranslate2.Translator(
+                str(model_dir),
+                device=self.device if self.device in ("cpu", "cuda") else "cpu",
+                compute_type=self.compute_type,
+                intra_threads=CT2_INTRA_THREADS,
+            )
+            self.translator = CTranslate2Pipeline(self.model, self.tokenizer)
+
+            self._initialized = True
+            self.weights_format = "ctranslate2"
+            self.load_seconds = time.perf_counter() - start_time
+            logger.info(
+                f"CTranslate2 NLLB 모델 로딩 완료 (연산: {self.compute_type}, 모델: {model_dir}, "
+                f"{self.load_seconds:.1f}초)"
+            )
+
+        except Exception as e:
+            logger.error(f"CTranslate2 NLLB 모델 로딩 실패: {e}")
+            raise RuntimeError(f"CTranslate2 NLLB 모델 로딩 실패: {e}")
+
+    def _generate_from_ids(self, batch_ids: List[List[int]], src_code: str, tgt_code: str, **generate_kwargs) -> List[str]:
+        """캐시된 토큰 id를 CTranslate2로 바로 번역"""
+        return self.translator.translate_ids(batch_ids, src_code, tgt_code, **generate_kwargs)
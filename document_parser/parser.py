@@ -29,8 +29,8 @@ def convert_to_markdown(input_path, output_md_path=None):
 # print(f"마크다운 파일로 변환 완료: {md_path}")
 
 import yaml
-import requests
-import json
+
+from ollama_client import OllamaError, get_ollama_client
 
 def load_restore_markdown_prompt(markdown_text):
     """
@@ -44,25 +44,11 @@ def load_restore_markdown_prompt(markdown_text):
     return desc + "\n\n" + template
 
 def call_ollama_llm(prompt, model='qwen3:4b', top_k=5):
-    try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": model, "prompt": prompt, "options": {"top_k": top_k}},
-            stream=False
-        )
-        lines = response.iter_lines(decode_unicode=True)
-        result = ""
-        for line in lines:
-            try:
-                data = json.loads(line)
-                if "response" in data:
-                    result += data["response"]
-            except Exception as e:
-                print("[Ollama 응답 파싱 오류]", e)
-        return result.strip()
-    except Exception as e:
-        print(f"Ollama 응답 오류: {e}")
-        return ""
+    """
+    공유 Ollama 클라이언트로 프롬프트 실행 (실패하면 빈 문자열 대신 OllamaError)
+    """
+    data = get_ollama_client().generate_sync(model, prompt, options={"top_k": top_k})
+    return data["response"].strip()
 
 def generate_clean_markdown(input_path, revised_md_path=None):
     """
@@ -77,7 +63,12 @@ def generate_clean_markdown(input_path, revised_md_path=None):
         markdown = f.read()
     # 2. LLM 프롬프트 생성 및 호출
     prompt = load_restore_markdown_prompt(markdown)
-    revised_markdown = call_ollama_llm(prompt, model="qwen3:4b")
+    try:
+        revised_markdown = call_ollama_llm(prompt, model="qwen3:4b")
+    except OllamaError as e:
+        # 구조 복원에 실패하면 변환된 마크다운을 그대로 저장 (문서 처리는 계속)
+        print(f"Ollama 응답 오류, 복원하지 않은 마크다운을 저장합니다: {e}")
+        revised_markdown = markdown
     # 3. 결과 저장
     if revised_md_path is None:
         base, _ = os.path.splitext(md_path)
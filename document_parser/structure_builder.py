@@ -6,8 +6,31 @@ def split_paragraph_to_sentences(paragraph):
     # 빈 문장/공백 제거
     return [s for s in sentences if s.strip()]
 
+import logging
+
+from ollama_client import OllamaError
+
 from .ollama_translate import translate_with_ollama
 
+logger = logging.getLogger(__name__)
+
+
+def build_paragraph(index, para):
+    """
+    문단 하나를 번역한 구조 항목
+
+    Ollama 요청이 실패하면 번역을 None으로 두고 오류 메시지를 'error'에 남긴 뒤 다음 문단을 계속 번역
+    (빈 번역이나 원문으로 채워 성공한 것처럼 보이지 않도록)
+    """
+    entry = {"paragraph_index": index, "original": para}
+    try:
+        entry["translated"] = translate_with_ollama(para, model='qwen3:4b')
+    except OllamaError as e:
+        logger.error(f"문단 {index} 번역 실패: {e}")
+        entry["translated"] = None
+        entry["error"] = str(e)
+    return entry
+
 def build_structure(text):
     # PDF(페이지별 구조) 처리
     if isinstance(text, list) and len(text) > 0 and isinstance(text[0], dict) and 'page_number' in text[0]:
@@ -16,12 +39,7 @@ def build_structure(text):
             page_number = page["page_number"]
             page_paragraphs = []
             for i, para in enumerate(page["paragraphs"]):
-                translated_para = translate_with_ollama(para, model='qwen3:4b')
-                page_paragraphs.append({
-                    "paragraph_index": i,
-                    "original": para,
-                    "translated": translated_para
-                })
+                page_paragraphs.append(build_paragraph(i, para))
             result.append({
                 "page_number": page_number,
                 "paragraphs": page_paragraphs
@@ -34,10 +52,5 @@ def build_structure(text):
         paragraphs = [p for p in text.split('\n') if p.strip()]
     structure = []
     for i, para in enumerate(paragraphs):
-        translated_para = translate_with_ollama(para, model='qwen3:4b')
-        structure.append({
-            "paragraph_index": i,
-            "original": para,
-            "translated": translated_para
-        })
+        structure.append(build_paragraph(i, para))
     return structure
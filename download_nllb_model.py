@@ -133,7 +133,8 @@ def download_nllb_model(model_key):
         # 3. 로컬에 저장
         print("3️⃣ 로컬에 저장 중...")
         tokenizer.save_pretrained(local_dir)
-        model.save_pretrained(local_dir)
+        # 단일 safetensors 파일로 저장 (translator.py가 메모리 매핑으로 로드)
+        model.save_pretrained(local_dir, safe_serialization=True, max_shard_size="20GB")
         print("✅ 로컬 저장 완료!")
         
         # 4. 다운로드 확인
@@ -250,6 +251,23 @@ def test_model(model_path):
         print("💡 하지만 모델 파일은 정상적으로 다운로드되었을 수 있습니다.")
         return False
 
+def create_int8_checkpoint(model_path, model_key):
+    """CPU용 int8 동적 양자화 체크포인트 생성"""
+    output_dir = f"./models/nllb_{model_key.lower()}_int8"
+    print("\n⚙️  int8 양자화 체크포인트 생성 중...")
+    print(f"   📁 저장 위치: {output_dir}")
+    
+    try:
+        from translator import export_quantized_model
+        export_quantized_model(model_path, output_dir)
+        print("✅ int8 체크포인트 생성 완료!")
+        print("   💡 translator.py가 이 폴더를 자동으로 찾아 int8로 로드합니다.")
+        print("   💡 또는 NLLB_PRECISION=int8 로 실행하면 최초 1회 자동 생성됩니다.")
+        return output_dir
+    except Exception as e:
+        print(f"❌ int8 체크포인트 생성 실패: {e}")
+        return None
+
 def update_translator_config(model_path, model_key):
     """translator.py 설정 업데이트 안내"""
     print("\n📝 설정 가이드:")
@@ -268,6 +286,9 @@ def update_translator_config(model_path, model_key):
     print(f'       "{os.path.abspath(model_path)}",')
     print("       # 다른 경로들...")
     print("   ]")
+    print()
+    print("🔧 CPU 전용 환경: int8 동적 양자화")
+    print("   export NLLB_PRECISION=int8")
     print("=" * 60)
     
     # 성능 최적화 팁
@@ -318,6 +339,11 @@ def main():
         # 테스트 실행
         test_success = test_model(model_path)
         
+        # int8 양자화 체크포인트 생성 (CPU 배포용)
+        quantize = input("\nCPU용 int8 양자화 체크포인트도 생성하시겠습니까? (y/N): ").strip().lower()
+        if quantize in ['y', 'yes']:
+            create_int8_checkpoint(model_path, model_choice)
+        
         # 설정 가이드 표시
         update_translator_config(model_path, model_choice)
         
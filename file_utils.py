@@ -6,6 +6,9 @@ import tempfile
 import logging
 from enum import Enum, auto
 
+from lazy_import import module_available
+from script_classifier import count_scripts
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,34 +19,18 @@ class FileType(Enum):
     MARKDOWN = auto()
     UNSUPPORTED = auto()
 
-# 언어 감지 모듈은 필요할 때만 임포트
-langdetect_imported = False
-try:
-    from langdetect import detect, detect_langs
-    from langdetect.lang_detect_exception import LangDetectException
-    langdetect_imported = True
-except ImportError:
-    langdetect_imported = False
+# 선택 모듈은 설치 여부만 확인하고, 실제 임포트는 사용하는 함수 안에서 수행 (서버 시작 시간 단축)
+langdetect_imported = module_available("langdetect")
+if not langdetect_imported:
     logger.warning("langdetect 모듈을 찾을 수 없습니다. 언어 감지 기능이 제한됩니다.")
 
-# PyMuPDF를 선택적으로 임포트
-fitz_imported = False
-try:
-    import fitz  # PyMuPDF
-    fitz_imported = True
-except ImportError:
-    fitz_imported = False
+fitz_imported = module_available("fitz")  # PyMuPDF
+if not fitz_imported:
     logger.warning("PyMuPDF 모듈을 찾을 수 없습니다. PDF 텍스트 추출 기능이 제한됩니다.")
 
-# docling 모듈은 필요할 때만 임포트
-docling_imported = False
+docling_imported = module_available("docling")
 if not docling_imported:
-    try:
-        from docling.document_converter import DocumentConverter, InputFormat, PdfFormatOption
-        from docling.datamodel.pipeline_options import PdfPipelineOptions
-        docling_imported = True
-    except ImportError:
-        logger.warning("docling 모듈이 설치되지 않았습니다. 일부 PDF 처리 기능이 제한됩니다.")
+    logger.warning("docling 모듈이 설치되지 않았습니다. 일부 PDF 처리 기능이 제한됩니다.")
 
 
 def get_file_type(file_path: Path) -> FileType:
@@ -82,6 +69,7 @@ def extract_text_from_pdf(file_path: Path, max_pages: int = 20) -> str:
     # 1. PyMuPDF로 시도 (더 안정적)
     if fitz_imported:
         try:
+            import fitz  # PyMuPDF
             doc = fitz.open(file_path)
             for i, page in enumerate(doc):
                 if i >= max_pages:
@@ -131,32 +119,29 @@ def analyze_character_distribution(text: str) -> Dict[str, float]:
     if not text or len(text) < 10:
         return {}
     
-    total_chars = len(text)
+    counts = count_scripts(text)
+    total_chars = counts['total']
+    hiragana = counts['hiragana']  # 히라가나
+    katakana = counts['katakana']  # 가타카나
+    kanji = counts['han']          # 한자
+    hangul = counts['hangul']      # 한글
     scores = {}
     
-    # 일본어 패턴
-    hiragana = len(re.findall(r'[\u3040-\u309F]', text))  # 히라가나
-    katakana = len(re.findall(r'[\u30A0-\u30FF]', text))  # 가타카나
-    kanji = len(re.findall(r'[\u4E00-\u9FAF]', text))     # 한자
-    
     # 일본어 점수 (히라가나에 가중치 부여)
     japanese_score = (hiragana * 3 + katakana * 2 + kanji) / total_chars
     if hiragana > 0:
         japanese_score *= 2
     scores['ja'] = japanese_score
     
-    # 한국어 패턴
-    hangul = len(re.findall(r'[\uAC00-\uD7AF]', text))  # 한글
-    korean_score = hangul / total_chars
-    scores['ko'] = korean_score
+    # 한국어 점수
+    scores['ko'] = hangul / total_chars
     
     # 중국어 점수 (한자만 있고 히라가나/한글이 없을 때)
     chinese_score = kanji / total_chars if hiragana == 0 and hangul == 0 else 0
     scores['zh'] = chinese_score
     
     # 영어 점수
-    english = len(re.findall(r'[a-zA-Z]', text))
-    scores['en'] = english / total_chars
+    scores['en'] = counts['latin'] / total_chars
     
     return scores
 
@@ -180,6 +165,7 @@ def detect_language_enhanced(text: str) -> Tuple[str, float]:
     langdetect_result = None
     if langdetect_imported:
         try:
+            from langdetect import detect, detect_langs
             clean_text = re.sub(r'[^\w\s\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF\uAC00-\uD7AF]', ' ', text)
             clean_text = re.sub(r'\s+', ' ', clean_text).strip()
             
@@ -381,7 +367,7 @@ def detect_document_language(file_path: Path, sample_size: int = 5000) -> Tuple[
             return 'en', 0.1
             
         # 4. 언어 감지 (여러 알고리즘 조합)
-        from langdetect import detect_langs, DetectorFactory
+        from langdetect import detect, detect_langs, DetectorFactory
         
         # 재현성을 위한 시드 설정
         DetectorFactory.seed = 0
@@ -619,6 +605,7 @@ def extract_json_from_pdf(file_path: Path) -> Optional[Dict[str, Any]]:
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Initialize Docling converter
+            from docling.document_converter import DocumentConverter
             converter = DocumentConverter()
             
             # Convert PDF to JSON
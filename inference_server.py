@@ -0,0 +1,170 @@
+"""NLLB 추론 전용 워커 (동적 마이크로 배치)
+
+여러 번역 작업 스레드가 같은 NLLB 모델을 동시에 호출하지 않도록,
+모델을 소유한 단일 워커 스레드가 큐로 세그먼트 요청을 받아
+짧은 시간 창 안에 들어온 요청들을 하나의 배치로 묶어 실행한다.
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future, as_completed
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 마이크로 배치 설정
+MAX_BATCH_SIZE = int(os.environ.get("NLLB_SERVER_MAX_BATCH", "16"))
+MAX_WAIT_MS = float(os.environ.get("NLLB_SERVER_MAX_WAIT_MS", "20"))
+
+
+@dataclass
+class SegmentRequest:
+    text: str
+    src_code: str
+    tgt_code: str
+    params: Tuple[Tuple[str, Any], ...]  # 정렬된 생성 파라미터 (배치 병합 키)
+    future: Future
+
+    @property
+    def batch_key(self) -> tuple:
+        return (self.src_code, self.tgt_code, self.params)
+
+
+class InferenceServer:
+    """NLLBTranslator를 소유하고 큐로 들어온 요청을 마이크로 배치로 처리하는 워커"""
+
+    def __init__(self, translator=None, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        """
+        Args:
+            translator: 사용할 NLLBTranslator (None이면 translator.get_translator() 사용)
+            max_batch_size: 한 번의 forward에 묶을 최대 세그먼트 수
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (밀리초)
+        """
+        self._translator = translator
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[Optional[SegmentRequest]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'segments': 0, 'max_batch': 0}
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            from translator import get_translator
+            self._translator = get_translator()
+        return self._translator
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="nllb-inference", daemon=True)
+            self._thread.start()
+            logger.info(f"NLLB 추론 서버 시작 (최대 배치 {self.max_batch_size}, 최대 대기 {self.max_wait * 1000:.0f}ms)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+            logger.info(f"NLLB 추론 서버 종료 (통계: {self.stats})")
+
+    def submit(self, text: str, src_code: str, tgt_code: str, **params) -> Future:
+        """세그먼트 하나를 큐에 넣고 번역 결과(후처리 전)를 담을 Future 반환"""
+        self.start()
+        future: Future = Future()
+        self._queue.put(SegmentRequest(text, src_code, tgt_code, tuple(sorted(params.items())), future))
+        return future
+
+    def translate_many(self, texts: List[str], src_code: str, tgt_code: str,
+                       on_batch_done: Optional[Callable[[List[int], List[str]], None]] = None,
+                       **params) -> List[str]:
+        """
+        여러 세그먼트를 제출하고 모두 끝날 때까지 대기
+
+        on_batch_done은 호출한 스레드에서 세그먼트가 끝나는 순서대로 ([인덱스], [결과])로 호출된다.
+        """
+        futures = {self.submit(text, src_code, tgt_code, **params): i for i, text in enumerate(texts)}
+        results = [''] * len(texts)
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_batch_done is not None:
+                on_batch_done([index], [results[index]])
+        return results
+
+    def _collect(self, first: SegmentRequest) -> Tuple[List[SegmentRequest], bool]:
+        """첫 요청 이후 max_wait 동안 최대 max_batch_size까지 요청을 모음"""
+        pending = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                return pending, True
+            pending.append(request)
+        return pending, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            pending, stopping = self._collect(first)
+
+            # 원본/대상 언어와 생성 파라미터가 같은 요청끼리 한 배치로 실행
+            groups: Dict[tuple, List[SegmentRequest]] = {}
+            for request in pending:
+                if request.future.set_running_or_notify_cancel():
+                    groups.setdefault(request.batch_key, []).append(request)
+
+            for (src_code, tgt_code, params), requests in groups.items():
+                try:
+                    outputs = self.translator.translate_batch(
+                        [r.text for r in requests], src_code, tgt_code,
+                        batch_size=len(requests), **dict(params)
+                    )
+                except Exception as e:
+                    logger.error(f"마이크로 배치 추론 실패 ({len(requests)}개 세그먼트): {e}")
+                    for request in requests:
+                        request.future.set_exception(e)
+                    continue
+                for request, output in zip(requests, outputs):
+                    request.future.set_result(output)
+                self.stats['batches'] += 1
+                self.stats['segments'] += len(requests)
+                self.stats['max_batch'] = max(self.stats['max_batch'], len(requests))
+
+
+# 전역 추론 서버 인스턴스
+_server_instance: Optional[InferenceServer] = None
+_server_lock = threading.Lock()
+
+
+def get_inference_server() -> InferenceServer:
+    """전역 추론 서버 인스턴스 반환 (최초 호출 시 워커 시작)"""
+    global _server_instance
+    with _server_lock:
+        if _server_instance is None:
+            _server_instance = InferenceServer()
+        _server_instance.start()
+        return _server_instance
+
+
+def shutdown_inference_server() -> None:
+    global _server_instance
+    with _server_lock:
+        if _server_instance is not None:
+            _server_instance.stop()
+            _server_instance = None
@@ -0,0 +1,158 @@
+"""번역 작업 체크포인트 (중단된 작업 재개)
+
+작업마다 data_translated/<stem>/<stem>.checkpoint.jsonl에 끝난 청크의 번역 결과를 한 줄씩 덧붙여 쓴다.
+첫 줄은 헤더로, 원문 해시와 엔진 설정, 청크 분할 결과(청크별 헤더/크기)로 만든 지문을 담는다.
+프로세스가 죽거나 앱을 다시 시작한 뒤 같은 문서를 같은 설정으로 번역하면 지문이 같으므로
+끝난 청크는 파일에서 읽어 쓰고 나머지만 번역한다. 지문이 다르면 체크포인트를 새로 시작한다.
+
+결과 본문은 메모리에 올려 두지 않고 청크 인덱스 → 파일 위치만 기억했다가 필요할 때 읽는다.
+progress_manager가 청크 수 설정(set_total_chunks)과 청크 완료(add_chunk_result) 때 호출한다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = '.checkpoint.jsonl'
+
+# 지문에서 제외하는 청크 정보 (진행 상태는 분할 결과가 아님)
+_VOLATILE_CHUNK_FIELDS = ('index', 'status')
+
+
+def segmentation_fingerprint(config: Dict[str, Any], chunks_info: List[Dict[str, Any]]) -> str:
+    """엔진 설정과 청크 분할 결과의 지문 (SHA-256 hex)"""
+    chunks = [
+        {key: value for key, value in chunk.items() if key not in _VOLATILE_CHUNK_FIELDS}
+        for chunk in chunks_info
+    ]
+    payload = json.dumps([CHECKPOINT_VERSION, config, chunks], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class JobCheckpoint:
+    """청크 번역 결과를 덧붙여 쓰는 작업 체크포인트 파일 (스레드 안전)"""
+
+    def __init__(self, path, config: Dict[str, Any]):
+        """
+        Args:
+            path: 체크포인트 파일 경로
+            config: 엔진 설정 (원문 해시, 엔진, 모델, 디코딩 프로필 등). bind() 전까지 갱신 가능
+        """
+        self.path = Path(path)
+        self.config = config
+        self.fingerprint: Optional[str] = None
+        self._offsets: Dict[int, int] = {}  # 청크 인덱스 -> 결과 줄의 파일 위치
+        self._file = None
+        self._lock = threading.Lock()
+        self.resumed = 0  # 이전 실행에서 끝난 청크 수
+
+    def bind(self, chunks_info: List[Dict[str, Any]]) -> int:
+        """
+        청크 분할 결과를 확정하고 기존 체크포인트를 불러옴
+
+        기존 파일의 지문이 같으면 끝난 청크 목록을 불러오고, 다르거나 없으면 새 체크포인트를 시작한다.
+
+        Returns:
+            이어서 쓸 수 있는 (이미 끝난) 청크 수
+        """
+        fingerprint = segmentation_fingerprint(self.config, chunks_info)
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return len(self._offsets)
+            self._close()
+            self.fingerprint = fingerprint
+            self._offsets = {}
+            good_end = self._load() if self.path.exists() else None
+            if good_end is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'w+b')
+                header = {'version': CHECKPOINT_VERSION, 'fingerprint': fingerprint, 'config': self.config,
+                          'total_chunks': len(chunks_info)}
+                self._write_line(header)
+            else:
+                # 마지막 줄이 쓰다 만 상태면 잘라내고 이어서 씀
+                self._file = open(self.path, 'r+b')
+                self._file.truncate(good_end)
+                self._file.seek(good_end)
+            self.resumed = len(self._offsets)
+            if self.resumed:
+                logger.info(f"체크포인트에서 재개: {self.resumed}/{len(chunks_info)}개 청크 완료 ({self.path})")
+            return self.resumed
+
+    def _load(self) -> Optional[int]:
+        """지문이 같은 기존 파일의 결과 위치를 읽음 (잠금을 가진 상태에서 호출). 쓸 수 없는 파일이면 None"""
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('fingerprint') != self.fingerprint:
+                    logger.info(f"체크포인트의 문서/설정/청크 분할이 달라 새로 시작합니다: {self.path}")
+                    return None
+                good_end = f.tell()
+                for line in iter(f.readline, b''):
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self._offsets[record['index']] = good_end
+                    good_end = f.tell()
+                return good_end
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"체크포인트를 읽지 못해 새로 시작합니다 ({self.path}): {e}")
+            self._offsets = {}
+            return None
+
+    def _write_line(self, record: Dict[str, Any]) -> int:
+        offset = self._file.tell()
+        self._file.write(json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        return offset
+
+    def get(self, index: int) -> Optional[str]:
+        """이미 끝난 청크의 번역 결과 (이전 실행 또는 이번 실행에서 기록, 없으면 None)"""
+        with self._lock:
+            offset = self._offsets.get(index)
+            if offset is None or self._file is None:
+                return None
+            position = self._file.tell()
+            try:
+                self._file.seek(offset)
+                return json.loads(self._file.readline())['text']
+            finally:
+                self._file.seek(position)
+
+    def record(self, index: int, text: str) -> None:
+        """끝난 청크의 번역 결과를 덧붙여 씀 (이미 있는 청크는 무시)"""
+        with self._lock:
+            if self._file is None or index in self._offsets:
+                return
+            self._offsets[index] = self._write_line({'index': index, 'text': text})
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """파일을 닫음 (다음 실행에서 이어서 쓸 수 있도록 파일은 남김)"""
+        with self._lock:
+            self._close()
+
+    def remove(self) -> None:
+        """작업이 끝나면 체크포인트 파일 삭제"""
+        with self._lock:
+            self._close()
+            self.fingerprint = None
+            self._offsets = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
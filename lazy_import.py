@@ -0,0 +1,43 @@
+"""무거운 의존성의 지연 임포트 도우미
+
+torch/transformers, docling, PyMuPDF, langdetect처럼 임포트에 수백 ms~수 초가 걸리는 모듈을
+서버 시작 시점이 아니라 실제로 사용할 때 임포트하기 위한 도구.
+"""
+
+import importlib
+import importlib.util
+from types import ModuleType
+
+
+def module_available(name: str) -> bool:
+    """모듈을 임포트하지 않고 설치 여부만 확인"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(ModuleType):
+    """처음 속성에 접근할 때 실제 모듈을 임포트하는 대리 모듈"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> LazyModule:
+    """`import name` 대신 사용하는 지연 임포트 모듈 객체"""
+    return LazyModule(name)
@@ -0,0 +1,216 @@
+"""Markdown 단일 순회 세그먼터
+
+Markdown 원문을 한 번 훑으면서 헤더/문단/표/코드/빈 줄 세그먼트를 원문 안의 (start, end) 오프셋으로 만든다.
+세그먼트는 문자열을 복사하지 않으며, 필요할 때 Segment.text(source)로 잘라 쓴다.
+문장, 크기 기준 분할, 헤더 섹션도 같은 원문 위의 오프셋으로 계산한다.
+
+translator(NLLB), argos_translator, ollama_translator가 공유한다.
+"""
+
+import re
+from functools import partial
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+# 블록 패턴: 줄 시작에서 블록 하나(여러 줄 가능)와 일치. 그룹 이름이 블록 종류 (앞 공백 허용)
+#   blank: 빈 줄(공백만 있는 줄 포함) 하나 (대용량 문서에서 가장 흔하고 다른 종류와 겹치지 않아 먼저 검사)
+#   code: ``` 부터 닫는 ``` 까지 (닫히지 않으면 끝까지), header: ATX 헤더(# 1~6개 + 공백/줄 끝),
+#   table: | 로 시작하는 연속된 행, paragraph: 그 밖의 연속된 텍스트 줄
+_INDENT = r'[ \t\r\f\v]*'
+_HEADER = r'#{1,6}(?![^ \t\r\n])'
+_TEXT_LINE = rf'(?!```|{_HEADER}|\|)\S[^\n]*'
+BLOCK_PATTERN = re.compile(
+    rf'^{_INDENT}(?:'
+    rf'(?P<blank>)$'
+    rf'|(?P<code>```[^\n]*(?:\n(?!{_INDENT}```)[^\n]*)*(?:\n{_INDENT}```[^\n]*)?)'
+    rf'|(?P<header>{_HEADER})[^\n]*'
+    rf'|(?P<table>\|[^\n]*(?:\n{_INDENT}\|[^\n]*)*)'
+    rf'|(?P<paragraph>{_TEXT_LINE}(?:\n{_INDENT}{_TEXT_LINE})*))',
+    re.MULTILINE
+)
+
+# 줄 단위로 분류할 때의 헤더 줄 (앞 공백을 뺀 줄에 적용, BLOCK_PATTERN의 header와 같은 규칙)
+HEADER_LINE_PATTERN = re.compile(rf'{_HEADER}')
+
+# 기본 문장 패턴: re.split(r'(?<=[.!?])\s+')로 나눈 뒤 앞뒤 공백을 뺀 조각과 같은 구간에 일치
+#   (마침표/느낌표/물음표 뒤에 공백이 오거나 구간이 끝나는 곳까지)
+SENTENCE_PATTERN = re.compile(r'(?=\S)[^.!?]*(?:[.!?]+(?!\s)[^.!?]*)*(?:[.!?]+|(?<=\S))')
+
+# 기본 문장 경계: 문장 문자열만 필요할 때는 경계로 나누는 쪽이 SENTENCE_PATTERN으로 찾는 것보다 빠름
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# 문단 경계 (빈 줄, 공백만 있는 줄 포함)
+PARAGRAPH_BOUNDARY = re.compile(r'\n\s*\n')
+
+# 크기 기준 분할에서 윈도우 안의 마지막 문장 끝 (일본어 구두점 포함, '. '는 공백 앞에서 자름)
+LAST_SENTENCE_END = re.compile(r'[\s\S]*(?:[.!?](?= )|[。！？])')
+
+PREAMBLE_HEADER = "머리말"  # 첫 헤더 앞 본문의 섹션 이름
+
+
+class Segment(NamedTuple):
+    """원문 안의 세그먼트 (kind: 'header', 'paragraph', 'table', 'code', 'blank', 'sentence')"""
+    kind: str
+    start: int
+    end: int
+    level: int = 0  # 헤더 수준 (헤더가 아니면 0)
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end]
+
+
+# 세그먼트가 많은 대용량 문서에서 NamedTuple 생성자(파이썬 함수)를 거치지 않고 튜플을 바로 만듦
+_new_segment = partial(tuple.__new__, Segment)
+
+
+class Section(NamedTuple):
+    """번역 청크로 쓰는 헤더 섹션 (앞뒤 공백을 뺀 원문 구간)"""
+    start: int
+    end: int
+    header: str
+    level: int
+
+
+def strip_span(source: str, start: int, end: int) -> Tuple[int, int]:
+    """구간의 앞뒤 공백을 뺀 구간 (문자열을 복사하지 않음)"""
+    while start < end and source[start].isspace():
+        start += 1
+    while end > start and source[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def iter_blocks(source: str) -> Iterator[Segment]:
+    """
+    원문을 한 번 순회하며 블록 세그먼트 생성 (BLOCK_PATTERN 참고)
+
+    줄 단위로 나누는 방식은 str.split('\\n')과 같다 (끝이 줄바꿈이면 마지막에 빈 줄 하나).
+    코드 블록 안의 줄은 분류하지 않는다.
+    """
+    for match in BLOCK_PATTERN.finditer(source):
+        start, end = match.span()
+        kind = match.lastgroup
+        yield _new_segment((kind, start, end, len(match.group('header')) if kind == 'header' else 0))
+
+
+def iter_lines(source: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """구간 안의 줄 (start, end) 목록 (줄바꿈 제외)"""
+    end = len(source) if end is None else end
+    pos = start
+    while True:
+        newline = source.find('\n', pos, end)
+        if newline < 0:
+            yield pos, end
+            return
+        yield pos, newline
+        pos = newline + 1
+
+
+def iter_sentences(source: str, start: int = 0, end: Optional[int] = None,
+                   pattern: "re.Pattern" = SENTENCE_PATTERN) -> Iterator[Segment]:
+    """구간 안의 문장 세그먼트 (앞뒤 공백 제외, 빈 문장 생략)"""
+    end = len(source) if end is None else end
+    for match in pattern.finditer(source, start, end):
+        yield Segment('sentence', match.start(), match.end())
+
+
+def sentence_texts(source: str, start: int = 0, end: Optional[int] = None,
+                   boundary: "re.Pattern" = SENTENCE_BOUNDARY) -> List[str]:
+    """
+    구간 안의 문장 문자열 목록 (번역 입력으로 쓸 문장만 잘라냄)
+
+    구간을 문장 경계로 나눈 뒤 앞뒤 공백을 빼고 빈 문장은 생략한다 (iter_sentences와 같은 문장).
+    """
+    text = source[start:end] if start or end is not None else source
+    return [sentence for sentence in map(str.strip, boundary.split(text)) if sentence]
+
+
+def iter_paragraphs(source: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """구간을 빈 줄로 나눈 문단 (start, end) 목록 (re.split(r'\\n\\s*\\n')과 같은 조각, 빈 조각 포함)"""
+    end = len(source) if end is None else end
+    pos = start
+    for match in PARAGRAPH_BOUNDARY.finditer(source, start, end):
+        yield pos, match.start()
+        pos = match.end()
+    yield pos, end
+
+
+def split_spans_by_size(source: str, start: int, end: int, max_size: int) -> List[Tuple[int, int]]:
+    """
+    구간을 최대 크기 이하 조각으로 분할
+
+    각 조각은 가능하면 윈도우 안의 마지막 빈 줄 뒤에서, 없으면 마지막 문장 끝에서 자른다.
+    윈도우마다 빈 줄 검색 한 번과 문장 끝 검색(정규식 한 번)만 한다.
+    """
+    if end - start <= max_size:
+        return [(start, end)]
+    spans = []
+    cut_start = start
+    while cut_start < end:
+        cut_end = cut_start + max_size
+        if cut_end >= end:
+            spans.append((cut_start, end))
+            break
+        paragraph_end = source.rfind('\n\n', cut_start + 1, cut_end)
+        if paragraph_end != -1:
+            cut_end = paragraph_end + 2
+        else:
+            match = LAST_SENTENCE_END.match(source, cut_start + 1, cut_end)
+            if match:
+                cut_end = match.end()
+        spans.append((cut_start, cut_end))
+        cut_start = cut_end
+    return spans
+
+
+def split_sections(source: str, min_size: int, max_size: int) -> List[Section]:
+    """
+    헤더 단위 섹션 분할
+
+    - 헤더가 없으면 크기 기준으로만 분할 ("섹션 N")
+    - 첫 헤더 앞의 본문은 머리말 섹션
+    - min_size보다 작은 섹션은 합쳐도 max_size를 넘지 않으면 앞 섹션에 붙임 (헤더는 앞 섹션 것 유지)
+    - max_size보다 큰 섹션은 크기 기준으로 다시 분할 ("헤더 (part N)")
+    코드 블록 안의 '#' 줄은 헤더로 보지 않는다.
+    """
+    headers = [
+        _new_segment(('header', match.start(), match.end(), match.end('header') - match.start('header')))
+        for match in BLOCK_PATTERN.finditer(source) if match.lastgroup == 'header'
+    ]
+    if not headers:
+        return [
+            Section(start, end, f"섹션 {i+1}", 0)
+            for i, (start, end) in enumerate(split_spans_by_size(source, 0, len(source), max_size))
+        ]
+
+    sections = []
+    preamble = strip_span(source, 0, headers[0].start)
+    if preamble[0] < preamble[1]:
+        sections.append(Section(preamble[0], preamble[1], PREAMBLE_HEADER, 0))
+    for i, header in enumerate(headers):
+        next_start = headers[i + 1].start if i + 1 < len(headers) else len(source)
+        start, end = strip_span(source, header.start, next_start)
+        sections.append(Section(start, end, source[header.start:header.end].strip(), header.level))
+
+    # 너무 작은 섹션은 앞 섹션 구간을 늘려 합침 (문자열 복사 없음)
+    merged: List[Section] = []
+    for section in sections:
+        if merged:
+            current = merged[-1]
+            size = section.end - section.start
+            if size < min_size and (section.end - current.start) <= max_size:
+                merged[-1] = current._replace(end=section.end)
+                continue
+        merged.append(section)
+
+    # 너무 큰 섹션은 다시 분할
+    final: List[Section] = []
+    for section in merged:
+        if section.end - section.start > max_size:
+            parts = split_spans_by_size(source, section.start, section.end, max_size)
+            final.extend(
+                Section(start, end, f"{section.header} (part {j+1})", section.level)
+                for j, (start, end) in enumerate(parts)
+            )
+        else:
+            final.append(section)
+    return final
@@ -0,0 +1,132 @@
+"""번역 엔진 모델 사전 로딩 (서버 시작 시 백그라운드)
+
+첫 번역 요청이 NLLB/Argos 모델 로딩 시간을 모두 떠안지 않도록,
+PRELOAD_ENGINES에 지정한 엔진을 서버 시작 직후 백그라운드 스레드에서 로드한다.
+엔진별 상태/로딩 시간/메모리 사용량은 /api/ready로 조회한다.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Callable
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 사전 로딩할 엔진 목록 (쉼표 구분, 예: "nllb,argos". 비어 있으면 사전 로딩하지 않음)
+PRELOAD_ENGINES = [name.strip() for name in os.environ.get("PRELOAD_ENGINES", "").split(",") if name.strip()]
+
+# Argos 워밍업 대상 언어
+ARGOS_TARGET_LANG = "ko"
+
+
+def _process_memory_mb() -> Optional[float]:
+    """현재 프로세스의 RSS (psutil이 없으면 None)"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def _load_nllb() -> Dict[str, Any]:
+    from translator import get_translator
+    instance = get_translator()
+    details = instance.load_report()
+    model = instance.model
+    if hasattr(model, "parameters"):
+        weight_bytes = sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers()))
+        details['weights_mb'] = round(weight_bytes / (1024 * 1024), 1)
+    return details
+
+
+def _load_argos() -> Dict[str, Any]:
+    """설치된 Argos 언어 쌍을 한 번씩 번역해 모델을 메모리에 올림"""
+    import argostranslate.translate
+    languages = argostranslate.translate.get_installed_languages()
+    target = next((lang for lang in languages if lang.code == ARGOS_TARGET_LANG), None)
+    if target is None:
+        raise RuntimeError(f"Argos 대상 언어({ARGOS_TARGET_LANG}) 패키지가 설치되어 있지 않습니다")
+    pairs = []
+    for source in languages:
+        if source.code == ARGOS_TARGET_LANG:
+            continue
+        translation = source.get_translation(target)
+        if translation is not None:
+            translation.translate("Hello")
+            pairs.append(f"{source.code}-{ARGOS_TARGET_LANG}")
+    return {'pairs': pairs}
+
+
+ENGINE_LOADERS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    'nllb': _load_nllb,
+    'argos': _load_argos,
+}
+
+
+class ModelPreloader:
+    """엔진 모델을 백그라운드 스레드에서 순서대로 로드하고 상태를 기록"""
+
+    def __init__(self):
+        self._engines: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, engines: List[str]) -> None:
+        """지정한 엔진들의 사전 로딩 시작 (이미 시작했으면 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            for name in engines:
+                if name not in ENGINE_LOADERS:
+                    logger.warning(f"사전 로딩을 지원하지 않는 엔진입니다: {name} (지원: {', '.join(ENGINE_LOADERS)})")
+                    continue
+                self._engines[name] = {'status': 'pending'}
+            if not self._engines:
+                return
+            self._thread = threading.Thread(target=self._run, name="model-preloader", daemon=True)
+            self._thread.start()
+        logger.info(f"모델 사전 로딩 시작: {', '.join(self._engines)}")
+
+    def _run(self) -> None:
+        for name in list(self._engines):
+            self._update(name, status='loading')
+            memory_before = _process_memory_mb()
+            start_time = time.perf_counter()
+            try:
+                details = ENGINE_LOADERS[name]()
+            except Exception as e:
+                logger.error(f"{name} 모델 사전 로딩 실패: {e}")
+                self._update(name, status='error', error=str(e))
+                continue
+            load_seconds = time.perf_counter() - start_time
+            memory_after = _process_memory_mb()
+            # psutil이 없으면 모델 가중치 크기로 대신 표시
+            memory_mb = round(memory_after - memory_before, 1) if memory_before is not None else details.get('weights_mb')
+            self._update(name, **{**details, 'status': 'loaded', 'load_seconds': round(load_seconds, 2), 'memory_mb': memory_mb})
+            logger.info(f"{name} 모델 사전 로딩 완료 ({load_seconds:.1f}초, 메모리 {memory_mb}MB)")
+
+    def _update(self, name: str, **fields) -> None:
+        with self._lock:
+            self._engines[name].update(fields)
+
+    def status(self) -> Dict[str, Any]:
+        """엔진별 로딩 상태 (모든 사전 로딩이 끝났으면 ready=True)"""
+        with self._lock:
+            engines = {name: dict(info) for name, info in self._engines.items()}
+        return {
+            'ready': all(info['status'] in ('loaded', 'error') for info in engines.values()),
+            'engines': engines,
+        }
+
+
+model_preloader = ModelPreloader()
+
+
+def start_preload(engines: Optional[List[str]] = None) -> None:
+    """설정된 엔진(기본: PRELOAD_ENGINES)의 백그라운드 사전 로딩 시작"""
+    model_preloader.start(PRELOAD_ENGINES if engines is None else engines)
@@ -0,0 +1,190 @@
+"""NLLB 다중 프로세스 번역 (대용량 문서용)
+
+CPU에서 단일 모델의 batch-1 호출은 코어가 많은 서버를 다 쓰지 못하므로,
+각자 모델 사본을 가진 워커 프로세스들이 torch 스레드 수를 나누어 갖고
+토큰 수 기준으로 고르게 나눈 청크 샤드를 번역한다.
+워커는 청크를 끝낼 때마다 결과 큐에 넣고, 호출한 프로세스가 이를 받아 진행 상황을 보고한다.
+"""
+
+import os
+import heapq
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from queue import Empty
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 워커당 샤드 수 (작을수록 샤드가 커지고, 클수록 진행 보고/부하 분산이 촘촘해짐)
+SHARDS_PER_WORKER = 4
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_config: Optional[Tuple[int, int]] = None
+_manager = None
+_pool_lock = threading.Lock()
+_token_counter = None
+
+
+def worker_threads(num_workers: int, threads: int = 0) -> int:
+    """워커 하나당 torch 스레드 수 (0이면 코어 수를 워커 수로 나눔)"""
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+
+def plan_shards(token_counts: List[int], num_shards: int) -> List[List[int]]:
+    """
+    토큰 수 합이 비슷하도록 청크 인덱스를 샤드로 나눔 (큰 청크부터 가장 가벼운 샤드에 배정)
+
+    Returns:
+        샤드 목록 (각 샤드의 인덱스는 문서 순서, 토큰 수가 많은 샤드부터)
+    """
+    num_shards = max(1, min(num_shards, len(token_counts)))
+    heap = [(0, shard) for shard in range(num_shards)]
+    shards: List[List[int]] = [[] for _ in range(num_shards)]
+    loads = [0] * num_shards
+    for index in sorted(range(len(token_counts)), key=lambda i: token_counts[i], reverse=True):
+        load, shard = heapq.heappop(heap)
+        shards[shard].append(index)
+        loads[shard] = load + token_counts[index]
+        heapq.heappush(heap, (loads[shard], shard))
+    order = sorted(range(num_shards), key=lambda shard: loads[shard], reverse=True)
+    return [sorted(shards[shard]) for shard in order if shards[shard]]
+
+
+def _init_worker(threads: int) -> None:
+    """워커 프로세스 초기화: torch 스레드 수 제한 후 모델 로드"""
+    import torch
+    import translator
+
+    torch.set_num_threads(threads)
+    # 워커 안에서는 추론 서버/중첩 프로세스 풀을 쓰지 않고 자기 모델을 직접 호출
+    translator.USE_INFERENCE_SERVER = False
+    translator.NUM_WORKERS = 0
+    translator.get_translator()
+    logger.info(f"NLLB 워커 준비 완료 (pid {os.getpid()}, torch 스레드 {threads})")
+
+
+def _translate_shard(chunks: List[Tuple[int, str, int]], source_lang: str, profile: str, document_lang: Optional[str],
+                     results_queue) -> List[Tuple[int, str]]:
+    """샤드의 청크들을 하이브리드 규칙으로 번역 (워커 프로세스에서 실행)"""
+    from translator import translate_hybrid_chunk, use_decoding_profile, use_document_language
+    from translation_memory import job_memo
+
+    results = []
+    with use_decoding_profile(profile), use_document_language(document_lang), job_memo():
+        for index, text, size in chunks:
+            translated = translate_hybrid_chunk(text, size, source_lang, index)
+            results.append((index, translated))
+            results_queue.put((index, translated))
+    return results
+
+
+def get_process_pool(num_workers: int, threads: int = 0) -> ProcessPoolExecutor:
+    """전역 워커 프로세스 풀 반환 (설정이 바뀌면 새로 생성)"""
+    global _pool, _pool_config, _manager
+    config = (num_workers, worker_threads(num_workers, threads))
+    with _pool_lock:
+        if _pool is not None and _pool_config != config:
+            _pool.shutdown(wait=True)
+            _pool = None
+        if _pool is None:
+            # 포크된 프로세스에서는 torch/OpenMP 스레드 상태가 꼬일 수 있으므로 spawn 사용
+            context = multiprocessing.get_context("spawn")
+            if _manager is None:
+                _manager = context.Manager()
+            _pool = ProcessPoolExecutor(
+                max_workers=config[0],
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(config[1],),
+            )
+            _pool_config = config
+            logger.info(f"NLLB 워커 프로세스 풀 시작 (워커 {config[0]}개 x torch 스레드 {config[1]}개)")
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool, _pool_config, _manager
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+            _pool_config = None
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
+
+
+def count_tokens(texts: List[str]) -> List[int]:
+    """샤드 계획용 토큰 수 (모델 없이 토크나이저만 로드)"""
+    global _token_counter
+    if _token_counter is None:
+        from translator import NLLBTranslator
+        _token_counter = NLLBTranslator(model_path=None, device="cpu")
+    return [_token_counter.count_tokens(text) for text in texts]
+
+
+def translate_chunks_parallel(chunks_info: List[Dict[str, Any]], source_lang: str = "auto", profile: str = "balanced",
+                              document_lang: Optional[str] = None, num_workers: int = 2, threads: int = 0,
+                              on_chunk_done: Optional[Callable[[int, str], None]] = None) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    청크 목록을 워커 프로세스들에 토큰 수 기준 샤드로 나누어 번역
+
+    document_lang은 source_lang="auto"일 때 워커들이 기준으로 삼을 문서 언어다.
+    on_chunk_done은 호출한 스레드에서 청크가 끝나는 순서대로 (청크 인덱스, 번역 결과)로 호출된다.
+    on_chunk_done이 주어지면 결과는 콜백에만 넘기고 보관하지 않는다 (반환 목록은 완료 여부만 담은 None/'' 목록).
+
+    Returns:
+        (문서 순서의 번역 결과 목록, 실행 통계)
+    """
+    from translator import TORCH_THREADS
+
+    pool = get_process_pool(num_workers, threads or TORCH_THREADS)
+    token_counts = count_tokens([chunk['text'] for chunk in chunks_info])
+    shards = plan_shards(token_counts, num_workers * SHARDS_PER_WORKER)
+    results_queue = _manager.Queue()
+    logger.info(f"다중 프로세스 번역: {len(chunks_info)}개 청크, {sum(token_counts)} 토큰, 샤드 {len(shards)}개")
+
+    outputs: List[Optional[str]] = [None] * len(chunks_info)
+
+    def report(index: int, translated: str) -> None:
+        if outputs[index] is None:
+            if on_chunk_done is not None:
+                outputs[index] = ''
+                on_chunk_done(index, translated)
+            else:
+                outputs[index] = translated
+
+    def drain() -> None:
+        while True:
+            try:
+                report(*results_queue.get_nowait())
+            except Empty:
+                return
+
+    pending = {
+        pool.submit(
+            _translate_shard,
+            [(i, chunks_info[i]['text'], chunks_info[i]['size']) for i in shard],
+            source_lang, profile, document_lang, results_queue
+        )
+        for shard in shards
+    }
+    while pending:
+        done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+        drain()
+        for future in done:
+            for index, translated in future.result():
+                report(index, translated)
+    drain()
+
+    stats = {
+        'workers': _pool_config[0],
+        'threads': _pool_config[1],
+        'shards': len(shards),
+        'tokens': sum(token_counts),
+    }
+    return outputs, stats
@@ -0,0 +1,330 @@
+"""공유 Ollama HTTP 클라이언트
+
+번역기(ollama_translator)와 문서 파서(document_parser)가 같은 연결 풀을 쓰도록
+httpx.AsyncClient 하나를 전용 이벤트 루프 스레드에서 돌린다. 동기 코드(번역 작업 스레드 등)는
+chat_sync()/generate_sync()로 호출하고, 비동기 코드는 chat()/generate()를 직접 기다린다.
+
+- keep-alive 연결 풀: 요청마다 TCP 연결을 새로 맺지 않음
+- 요청별 마감 시간: 재시도와 대기 시간을 포함한 요청 하나의 전체 시간
+- 재시도: 연결 오류, 타임아웃, 5xx/429 응답은 지터를 준 지수 백오프로 다시 시도
+- 서킷 브레이커: 연속 실패가 쌓이면 잠시 요청을 보내지 않고 바로 실패
+
+요청이 끝내 실패하면 OllamaError를 던진다. 원문이나 빈 문자열을 번역 결과처럼 돌려주지 않는다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from lazy_import import module_available
+
+logger = logging.getLogger(__name__)
+
+HTTPX_AVAILABLE = module_available("httpx")
+
+# Ollama 서버 주소 (ollama CLI와 같은 OLLAMA_HOST 사용, 스킴이 없으면 http)
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+if "://" not in OLLAMA_HOST:
+    OLLAMA_HOST = f"http://{OLLAMA_HOST}"
+# 동시에 보낼 번역 요청 수. Ollama 서버의 OLLAMA_NUM_PARALLEL(모델당 동시 처리 수)과 같게 맞춘다
+OLLAMA_NUM_PARALLEL = max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+# 연결 풀 크기 (번역 외에 문서 파서 요청도 같은 풀을 씀)
+OLLAMA_MAX_CONNECTIONS = int(os.environ.get("OLLAMA_MAX_CONNECTIONS", str(max(4, OLLAMA_NUM_PARALLEL * 2))))
+# 마지막 요청 뒤 모델을 메모리에 남겨 둘 시간 (작업 사이에 모델을 다시 올리지 않도록, 서버 설정과 같은 형식)
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+# 요청 하나의 마감 시간 (초, 재시도 포함)과 연결 시간 제한
+OLLAMA_TIMEOUT = float(os.environ.get("OLLAMA_TIMEOUT", "300"))
+OLLAMA_CONNECT_TIMEOUT = float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "5"))
+# 재시도 횟수와 백오프 (첫 재시도는 최대 OLLAMA_RETRY_BACKOFF초, 재시도마다 상한이 두 배)
+OLLAMA_MAX_RETRIES = int(os.environ.get("OLLAMA_MAX_RETRIES", "3"))
+OLLAMA_RETRY_BACKOFF = float(os.environ.get("OLLAMA_RETRY_BACKOFF", "0.5"))
+OLLAMA_RETRY_BACKOFF_MAX = float(os.environ.get("OLLAMA_RETRY_BACKOFF_MAX", "10"))
+# 연속 실패가 이 횟수에 이르면 OLLAMA_BREAKER_COOLDOWN초 동안 요청을 막음
+OLLAMA_BREAKER_THRESHOLD = int(os.environ.get("OLLAMA_BREAKER_THRESHOLD", "5"))
+OLLAMA_BREAKER_COOLDOWN = float(os.environ.get("OLLAMA_BREAKER_COOLDOWN", "30"))
+
+
+class OllamaError(RuntimeError):
+    """Ollama 요청 실패 (재시도 후에도 실패했거나 재시도해도 소용없는 오류)"""
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class OllamaTimeoutError(OllamaError):
+    """요청별 마감 시간 초과"""
+
+
+class OllamaUnavailableError(OllamaError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold번 쌓이면 cooldown초 동안 요청을 막고, 그 뒤 요청 하나로 서버 상태를 시험 (스레드 안전)"""
+
+    def __init__(self, threshold: int = OLLAMA_BREAKER_THRESHOLD, cooldown: float = OLLAMA_BREAKER_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return "open"
+            return "half-open"
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 (반열림 상태에서는 시험 요청 하나만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Ollama 서버 응답 확인, 요청 차단 해제")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning(f"Ollama 요청이 {self._failures}번 연속 실패해 {self.cooldown:.0f}초 동안 요청을 막습니다")
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """결과를 기록하지 못하고 끝난 시험 요청(취소 등)의 자리 반환"""
+        with self._lock:
+            self._probing = False
+
+
+class OllamaClient:
+    """전용 이벤트 루프 스레드에서 httpx.AsyncClient를 돌리는 공유 Ollama 클라이언트"""
+
+    def __init__(self, host: str = OLLAMA_HOST, timeout: float = OLLAMA_TIMEOUT,
+                 max_retries: int = OLLAMA_MAX_RETRIES, max_connections: int = OLLAMA_MAX_CONNECTIONS,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            host: Ollama 서버 주소 (예: http://localhost:11434)
+            timeout: 요청 하나의 기본 마감 시간 (초, 재시도 포함)
+            max_retries: 재시도 가능한 오류에서 다시 보내는 최대 횟수
+            max_connections: keep-alive 연결 풀 크기
+            breaker: 서킷 브레이커 (None이면 기본 설정으로 생성)
+        """
+        self.host = host.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.max_connections = max(1, max_connections)
+        self.breaker = breaker or CircuitBreaker()
+        self._http = None  # httpx.AsyncClient (이벤트 루프 스레드에서 생성)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if not HTTPX_AVAILABLE:
+                raise RuntimeError("httpx 패키지가 필요합니다")
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="ollama-client", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        if self._http is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Ollama 연결 풀 정리 실패: {e}")
+            self._http = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        loop.close()
+        logger.info(f"Ollama 클라이언트 종료 (통계: {self.stats})")
+
+    def _client(self):
+        """연결 풀 (이벤트 루프 스레드에서만 호출)"""
+        if self._http is None:
+            import httpx
+            self._http = httpx.AsyncClient(
+                base_url=self.host,
+                # 전체 시간은 요청별 마감 시간으로 제한하므로 읽기/풀 대기 시간은 따로 두지 않음
+                timeout=httpx.Timeout(None, connect=OLLAMA_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self._http
+
+    async def chat(self, model: str, messages: List[Dict[str, str]], options: Optional[Dict[str, Any]] = None,
+                   stream: bool = False, timeout: Optional[float] = None,
+                   on_text: Optional[Callable[[str], None]] = None, **extra) -> Dict[str, Any]:
+        """
+        /api/chat 호출
+
+        stream=True이면 토큰 단위 응답을 받아 합친다. 어느 쪽이든 마지막 응답(통계 포함)에
+        합친 전체 답변을 message.content로 넣어 반환한다.
+        on_text를 주면 스트리밍으로 받으면서 지금까지 받은 답변을 토큰마다 넘긴다
+        (이벤트 루프 스레드에서 호출되므로 빨리 끝나야 함. 재시도하면 처음부터 다시 넘김).
+        """
+        payload = {"model": model, "messages": messages, "stream": stream or on_text is not None,
+                   "keep_alive": OLLAMA_KEEP_ALIVE, **extra}
+        if options:
+            payload["options"] = options
+        return await self._request("/api/chat", payload, timeout, on_text)
+
+    async def generate(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                       stream: bool = False, timeout: Optional[float] = None,
+                       on_text: Optional[Callable[[str], None]] = None, **extra) -> Dict[str, Any]:
+        """/api/generate 호출 (합친 전체 답변은 response)"""
+        payload = {"model": model, "prompt": prompt, "stream": stream or on_text is not None,
+                   "keep_alive": OLLAMA_KEEP_ALIVE, **extra}
+        if options:
+            payload["options"] = options
+        return await self._request("/api/generate", payload, timeout, on_text)
+
+    def chat_sync(self, *args, **kwargs) -> Dict[str, Any]:
+        """chat()을 이벤트 루프 스레드에서 실행하고 결과를 기다림 (동기 코드용)"""
+        return self._run(self.chat(*args, **kwargs))
+
+    def generate_sync(self, *args, **kwargs) -> Dict[str, Any]:
+        """generate()를 이벤트 루프 스레드에서 실행하고 결과를 기다림 (동기 코드용)"""
+        return self._run(self.generate(*args, **kwargs))
+
+    def _run(self, coro):
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _request(self, path: str, payload: Dict[str, Any], timeout: Optional[float],
+                       on_text: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """마감 시간 안에서 재시도하며 요청을 보냄"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        self.stats['requests'] += 1
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.stats['failures'] += 1
+                raise OllamaUnavailableError(
+                    f"Ollama 서버({self.host}) 요청이 연속으로 실패해 잠시 요청을 보내지 않습니다", retryable=True
+                )
+            try:
+                result = await asyncio.wait_for(self._attempt(path, payload, on_text), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                error = OllamaTimeoutError(f"Ollama 응답 시간 초과 ({timeout:.0f}초, {payload['model']})")
+            except OllamaError as e:
+                error = e
+            except BaseException as e:
+                import httpx
+                if not isinstance(e, httpx.TransportError):
+                    # 취소 등 서버 상태와 무관한 종료
+                    self.breaker.release()
+                    raise
+                error = OllamaError(f"Ollama 서버({self.host}) 연결 오류: {e!r}", retryable=True)
+            else:
+                self.breaker.record_success()
+                return result
+
+            # 서버에 닿았지만 요청이 잘못된 경우(모델 없음 등)는 서버 장애로 보지 않음
+            if error.retryable or isinstance(error, OllamaTimeoutError):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            delay = random.uniform(0, min(OLLAMA_RETRY_BACKOFF_MAX, OLLAMA_RETRY_BACKOFF * (2 ** attempt)))
+            if not error.retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                self.stats['failures'] += 1
+                raise error
+            attempt += 1
+            self.stats['retries'] += 1
+            logger.warning(f"Ollama 요청 재시도 {attempt}/{self.max_retries} ({delay:.2f}초 후): {error}")
+            await asyncio.sleep(delay)
+
+    async def _attempt(self, path: str, payload: Dict[str, Any],
+                       on_text: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """요청 한 번. 줄 단위 JSON 응답(스트리밍이면 여러 줄)을 읽어 합침"""
+        async with self._client().stream("POST", path, json=payload) as response:
+            if response.status_code >= 400:
+                body = (await response.aread()).decode("utf-8", "replace")
+                try:
+                    message = json.loads(body).get("error", body)
+                except (ValueError, AttributeError):
+                    message = body
+                raise OllamaError(
+                    f"Ollama HTTP {response.status_code} ({payload['model']}): {message.strip()[:200]}",
+                    retryable=response.status_code >= 500 or response.status_code == 429,
+                )
+            text = ""
+            final = None
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                except ValueError as e:
+                    raise OllamaError(f"Ollama 응답을 해석할 수 없습니다: {line[:200]!r}", retryable=True) from e
+                if "error" in data:
+                    raise OllamaError(f"Ollama 오류 ({payload['model']}): {data['error']}", retryable=True)
+                piece = data.get("message", {}).get("content") if path == "/api/chat" else data.get("response")
+                if piece:
+                    text += piece
+                    if on_text is not None:
+                        on_text(text)
+                if data.get("done"):
+                    final = data
+            if final is None:
+                raise OllamaError("Ollama 응답이 끝나기 전에 연결이 끊겼습니다", retryable=True)
+        if path == "/api/chat":
+            final["message"] = {**final.get("message", {}), "role": "assistant", "content": text}
+        else:
+            final["response"] = text
+        return final
+
+
+# 전역 Ollama 클라이언트 인스턴스
+_client_instance: Optional[OllamaClient] = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client() -> OllamaClient:
+    """전역 Ollama 클라이언트 반환 (최초 호출 시 이벤트 루프 스레드 시작)"""
+    global _client_instance
+    with _client_lock:
+        if _client_instance is None:
+            _client_instance = OllamaClient()
+        _client_instance.start()
+        return _client_instance
+
+
+def shutdown_ollama_client() -> None:
+    global _client_instance
+    with _client_lock:
+        if _client_instance is not None:
+            _client_instance.close()
+            _client_instance = None
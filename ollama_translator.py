@@ -8,16 +8,40 @@
 
 from __future__ import annotations
 
+import os
 import re
 import time
+import hashlib
+import logging
+import threading
+import contextvars
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
 from progress_manager import progress_manager
 from argos_translator import MarkdownTranslator, TranslationUnit
+from ollama_client import OLLAMA_KEEP_ALIVE, OLLAMA_NUM_PARALLEL, OllamaError, get_ollama_client
+from output_builder import OutputBuilder
+from script_classifier import count_scripts
+from translation_memory import is_failed_translation, job_memo, lookup_segment, store_segment
 import yaml
 
+logger = logging.getLogger(__name__)
+
+# 짧은 단위 여러 개를 [[번호]] 구분자로 한 프롬프트에 묶을 때의 원문 토큰 예산 (0이면 묶지 않음).
+# 예산의 절반 이하인 단위만 묶는다 (번역 결과도 num_predict 안에 들어가야 함)
+OLLAMA_PACK_TOKENS = int(os.environ.get("OLLAMA_PACK_TOKENS", "512"))
+# 한 프롬프트에 묶는 최대 단위 수 (많을수록 응답을 나누기 어려워짐)
+OLLAMA_PACK_MAX_UNITS = int(os.environ.get("OLLAMA_PACK_MAX_UNITS", "8"))
+
+# 모델 컨텍스트 길이 (0이면 서버 기본값). 요청마다 같은 값을 보내야 러너를 다시 만들지 않음
+OLLAMA_NUM_CTX = int(os.environ.get("OLLAMA_NUM_CTX", "0"))
+
+# 묶은 응답에서 단위 번역의 시작 표시 (줄 맨 앞의 [[번호]])
+_PACK_MARKER = re.compile(r"^[ \t]*\[\[(\d+)\]\][ \t]*\n?", re.MULTILINE)
+
 
 class SupportedLanguage(Enum):
     ENGLISH = "en"
@@ -39,6 +63,46 @@ class TranslationConfig:
     target_lang: SupportedLanguage = SupportedLanguage.KOREAN
     temperature: float = 0.1
     max_tokens: int = 1024
+    num_parallel: int = OLLAMA_NUM_PARALLEL
+    pack_tokens: int = OLLAMA_PACK_TOKENS
+    keep_alive: str = OLLAMA_KEEP_ALIVE
+    num_ctx: int = OLLAMA_NUM_CTX
+
+
+def estimate_tokens(text: str) -> int:
+    """LLM 토큰 수 어림값 (한중일 문자는 글자당 1토큰, 나머지는 4글자당 1토큰)"""
+    counts = count_scripts(text)
+    cjk = counts['hangul'] + counts['hiragana'] + counts['katakana'] + counts['han']
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def iter_packed_pieces(response: str) -> Iterator[Tuple[int, str]]:
+    """생성 중인 묶음 응답에서 지금까지 나온 (번호, 번역) (마지막 번역은 아직 생성 중일 수 있음)"""
+    markers = list(_PACK_MARKER.finditer(response))
+    ends = [m.start() for m in markers[1:]] + [len(response)]
+    for marker, end in zip(markers, ends):
+        piece = response[marker.end():end].strip()
+        if piece:
+            yield int(marker.group(1)), piece
+
+
+def split_packed_response(response: str, count: int) -> Optional[List[str]]:
+    """
+    [[1]]..[[count]] 구분자로 묶은 응답을 단위별 번역으로 나눔
+
+    구분자가 순서대로 정확히 한 번씩 나오지 않거나, 첫 구분자 앞에 다른 내용이 있거나,
+    비어 있는 번역이 있으면 나누기 애매한 응답으로 보고 None을 반환한다.
+    """
+    markers = list(_PACK_MARKER.finditer(response))
+    if [int(m.group(1)) for m in markers] != list(range(1, count + 1)):
+        return None
+    if response[:markers[0].start()].strip():
+        return None
+    ends = [m.start() for m in markers[1:]] + [len(response)]
+    pieces = [response[m.end():end].strip() for m, end in zip(markers, ends)]
+    if not all(pieces):
+        return None
+    return pieces
 
 
 def pdf_to_markdown(pdf_path: str) -> str:
@@ -81,41 +145,58 @@ class MultilingualTranslator:
         self.config = config
         self.preserver = MarkdownPreserver()
         self.client = None
-        self.prompt_template = self._load_prompt_template()
+        # 지침은 모든 요청에 같은 system 메시지로 보내 서버의 프롬프트(KV) 캐시를 재사용하고,
+        # 문단마다 달라지는 부분만 user 메시지로 보냄
+        self.system_prompt, self.prompt_template = self._load_prompt_template()
+        self.pack_system_prompt, self.pack_template = self._load_prompt_template('packed_translation')
+        self.prompt_sha256 = hashlib.sha256(
+            f"{self.system_prompt}\n{self.prompt_template}".encode("utf-8")
+        ).hexdigest()
+        # 요청마다 같은 옵션을 그대로 보냄 (러너 설정이 바뀌면 서버가 모델을 다시 올리고 캐시도 버림)
+        self.options = {"temperature": config.temperature, "num_predict": config.max_tokens}
+        if config.num_ctx:
+            self.options["num_ctx"] = config.num_ctx
+        self.stats = {'requests': 0, 'packed_requests': 0, 'packed_units': 0, 'pack_fallbacks': 0,
+                      'prompt_eval_count': 0, 'prompt_eval_ns': 0, 'eval_count': 0, 'eval_ns': 0}
+        self._stats_lock = threading.Lock()
         if config.provider == LLMProvider.OLLAMA:
             self._init_ollama()
 
-    def _load_prompt_template(self) -> str:
-        """YAML 프롬프트 파일을 읽어 설명과 템플릿을 합친다."""
+    def _load_prompt_template(self, key: str = 'paragraph_translation') -> Tuple[str, str]:
+        """YAML 프롬프트 파일에서 (지침, 원문 템플릿)을 읽는다. 지침은 system 메시지로 보낸다."""
         base_dir = Path(__file__).resolve().parent
         prompt_path = base_dir / 'prompts' / 'tax_translation_prompt.yaml'
         if prompt_path.exists():
             try:
                 with open(prompt_path, 'r', encoding='utf-8') as f:
                     data = yaml.safe_load(f)
-                para = data.get('paragraph_translation', {})
+                para = data.get(key, {})
                 desc = para.get('description', '').strip()
                 template = para.get('template', '').strip()
-                merged = f"{desc}\n{template}".strip()
-                if merged:
-                    return merged
+                if template:
+                    return desc, template
             except Exception:
                 pass
         # fallback basic template
+        if key == 'packed_translation':
+            return (
+                "다음 문단들을 각각 한국어로 번역하세요. "
+                "각 번역 앞에 원문과 같은 [[번호]] 표시를 한 줄로 붙이고 같은 순서로 출력하세요.",
+                "원문 ({source}):\n{text}\n\n번역:",
+            )
         return (
-            "다음 {source} 텍스트를 한국어로 번역하세요.\n\n"
-            "원문: {text}\n\n번역:"
+            "다음 텍스트를 한국어로 번역하세요. 번역 결과만 출력하세요.",
+            "원문 ({source}): {text}\n\n번역:",
         )
 
     def _init_ollama(self) -> None:
-        try:
-            import ollama
-            self.client = ollama
-        except ImportError as e:
-            raise RuntimeError("ollama 패키지가 필요합니다") from e
-
-    def _prompt(self, text: str, source: str) -> str:
-        template = self.prompt_template
+        # 문서 파서와 같은 공유 클라이언트 (연결 풀, 재시도, 서킷 브레이커)
+        self.client = get_ollama_client()
+
+    def _prompt(self, text: str, source: str, template: Optional[str] = None) -> str:
+        template = template or self.prompt_template
+        if "{{source_paragraphs}}" in template:
+            template = template.replace("{{source_paragraphs}}", text)
         if "{{source_paragraph}}" in template:
             template = template.replace("{{source_paragraph}}", text)
         if "{{source_sentence}}" in template:
@@ -126,57 +207,266 @@ class MultilingualTranslator:
             .replace("{text}", text)
         )
 
-    def translate_unit(self, text: str, source_lang: str) -> str:
+    def _messages(self, text: str, source: str, packed: bool = False) -> List[Dict[str, str]]:
+        """고정된 지침(system) 뒤에 원문(user)을 붙인 대화. 앞부분이 요청마다 같아야 캐시가 맞음"""
+        system, template = (self.pack_system_prompt, self.pack_template) if packed else (
+            self.system_prompt, self.prompt_template)
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": self._prompt(text, source, template)})
+        return messages
+
+    def _memory_key(self, source_lang: str) -> dict:
+        """번역 메모리 키 (프롬프트가 바뀌면 다른 번역으로 취급)"""
+        prompt_hash = self.prompt_sha256[:16]
+        return dict(
+            engine=self.config.provider.value,
+            model=self.config.model_name,
+            src_lang=source_lang,
+            tgt_lang=self.config.target_lang.value,
+            params={"temperature": self.config.temperature, "max_tokens": self.config.max_tokens, "prompt": prompt_hash},
+        )
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+    def _chat(self, messages: List[Dict[str, str]], on_text: Optional[Callable[[str], None]] = None) -> Dict:
+        """
+        대화 하나를 보내고 응답 전체를 반환 (응답의 프롬프트 평가 통계를 누적)
+
+        on_text를 주면 스트리밍으로 받으며 지금까지 생성된 답변을 토큰마다 넘긴다.
+        """
+        response = self.client.chat_sync(
+            model=self.config.model_name,
+            messages=messages,
+            options=self.options,
+            keep_alive=self.config.keep_alive,
+            on_text=on_text,
+        )
+        # 캐시된 앞부분은 prompt_eval_count/prompt_eval_duration에 들어가지 않음
+        self._count(
+            requests=1,
+            prompt_eval_count=response.get("prompt_eval_count", 0),
+            prompt_eval_ns=response.get("prompt_eval_duration", 0),
+            eval_count=response.get("eval_count", 0),
+            eval_ns=response.get("eval_duration", 0),
+        )
+        return response
+
+    def summary(self) -> Dict:
+        """작업 요약용 요청/프롬프트 평가 통계"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        requests = stats['requests']
+        return {
+            'ollama_requests': requests,
+            'packed_requests': stats['packed_requests'],
+            'packed_units': stats['packed_units'],
+            'pack_fallbacks': stats['pack_fallbacks'],
+            'prompt_eval_count': stats['prompt_eval_count'],
+            'prompt_eval_seconds': round(stats['prompt_eval_ns'] / 1e9, 2),
+            'prompt_tokens_per_request': round(stats['prompt_eval_count'] / requests, 1) if requests else 0.0,
+            'eval_count': stats['eval_count'],
+            'eval_seconds': round(stats['eval_ns'] / 1e9, 2),
+        }
+
+    def _translate_uncached(self, text: str, source_lang: str, on_text: Optional[Callable[[str], None]] = None) -> str:
         elements, clean = self.preserver.extract(text)
-        prompt = self._prompt(clean, source_lang)
-        try:
-            response = self.client.chat(
-                model=self.config.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": self.config.temperature, "num_predict": self.config.max_tokens},
-                stream=False,
-            )
-            result = response["message"]["content"].strip()
-        except Exception:
-            result = text
-        translated = self.preserver.restore(result, elements)
+        stream = None
+        if on_text is not None:
+            def forward(partial: str) -> None:
+                on_text(self.preserver.restore(partial.lstrip(), elements))
+            stream = forward
+        response = self._chat(self._messages(clean, source_lang), stream)
+        result = response["message"]["content"].strip()
+        if not result:
+            # 빈 응답을 번역으로 쓰면 메모/번역 메모리에 남아 같은 원문이 계속 빈 번역이 됨
+            raise OllamaError(f"Ollama가 빈 번역을 돌려주었습니다 (모델: {self.config.model_name})")
+        return self.preserver.restore(result, elements)
+
+    def translate_unit(self, text: str, source_lang: str, on_text: Optional[Callable[[str], None]] = None) -> str:
+        """
+        단위 하나 번역. 요청이 실패하거나 응답이 비어 있으면 원문을 돌려주지 않고 OllamaError를 던진다.
+
+        on_text: 생성 중인 번역을 토큰마다 받을 함수 (메모/번역 메모리에서 찾은 경우는 호출하지 않음)
+        """
+        memory_key = self._memory_key(source_lang)
+        cached = lookup_segment(text, **memory_key)
+        if cached is not None:
+            return cached
+        translated = self._translate_uncached(text, source_lang, on_text)
+        if not is_failed_translation(translated):
+            store_segment(text, translated, **memory_key)
         return translated
 
-    def translate_markdown(self, markdown: str, source_lang: str, path: str = None, split_by_sentence: bool = False) -> str:
-        """Translate Markdown text using the same preprocessing as Argos."""
-        translator = MarkdownTranslator(source_lang, "ko")
-        units = translator.split_into_units(markdown, split_by_sentence)
-        results: List[str] = []
-        total_chunks = len(units)
+    def is_packable(self, text: str, tokens: int) -> bool:
+        """다른 짧은 단위와 한 프롬프트로 묶어 보낼 단위인지"""
+        return 0 < tokens * 2 <= self.config.pack_tokens and "[[" not in text
+
+    def translate_units(self, items: List[Tuple[str, str]],
+                        on_text: Optional[Callable[[int, str], None]] = None) -> List[str]:
+        """
+        단위 여러 개 번역 (items: (원문, 원본 언어) 목록)
+
+        메모/번역 메모리에 없는 단위들을 [[번호]] 구분자로 한 프롬프트에 묶어 보내고 응답을 단위별로 나눈다.
+        응답을 나누기 애매하면 묶었던 단위를 하나씩 다시 번역한다.
+        on_text: 생성 중인 번역을 (items 안의 위치, 지금까지의 번역)으로 받을 함수
+        """
+        if len(items) == 1:
+            stream = (lambda partial: on_text(0, partial)) if on_text is not None else None
+            return [self.translate_unit(*items[0], on_text=stream)]
+        results: List[Optional[str]] = [None] * len(items)
+        pending: Dict[Tuple[str, str], List[int]] = {}  # 번역할 (원문, 언어) -> 결과 위치 (같은 원문은 한 번만)
+        for position, (text, source_lang) in enumerate(items):
+            cached = lookup_segment(text, **self._memory_key(source_lang))
+            if cached is not None:
+                results[position] = cached
+            else:
+                pending.setdefault((text, source_lang), []).append(position)
+
+        keys = list(pending)
+        # 같은 원문이 여러 위치에 있으면 생성 중인 번역은 첫 위치에만 표시
+        streams = [None] * len(keys)
+        if on_text is not None:
+            streams = [lambda partial, position=pending[key][0]: on_text(position, partial) for key in keys]
+        translations = self._translate_packed(keys, streams) if len(keys) > 1 else None
+        if translations is None:
+            translations = [self._translate_uncached(text, source_lang, stream)
+                            for (text, source_lang), stream in zip(keys, streams)]
+        for (text, source_lang), translated in zip(keys, translations):
+            if not is_failed_translation(translated):
+                store_segment(text, translated, **self._memory_key(source_lang))
+            for position in pending[(text, source_lang)]:
+                results[position] = translated
+        return results
+
+    def _translate_packed(self, keys: List[Tuple[str, str]],
+                          streams: List[Optional[Callable[[str], None]]]) -> Optional[List[str]]:
+        """단위들을 한 프롬프트로 번역. 응답을 단위별로 나눌 수 없으면 None"""
+        extracted = [self.preserver.extract(text) for text, _ in keys]
+        source = "\n\n".join(f"[[{number}]]\n{clean}" for number, (_, clean) in enumerate(extracted, 1))
+        stream = None
+        if any(streams):
+            def forward(partial: str) -> None:
+                # 생성 중인 응답을 [[번호]] 구분자로 나눠 단위별로 표시
+                for number, piece in iter_packed_pieces(partial):
+                    if number <= len(keys) and streams[number - 1] is not None:
+                        streams[number - 1](self.preserver.restore(piece, extracted[number - 1][0]))
+            stream = forward
+        response = self._chat(self._messages(source, keys[0][1], packed=True), stream)
+        pieces = None
+        # 응답이 num_predict에서 잘렸으면 마지막 단위가 덜 번역되었을 수 있음
+        if response.get("done_reason") != "length":
+            pieces = split_packed_response(response["message"]["content"], len(keys))
+        if pieces is None:
+            logger.info(f"묶음 번역 응답을 {len(keys)}개 단위로 나눌 수 없어 하나씩 다시 번역합니다")
+            self._count(pack_fallbacks=1)
+            return None
+        self._count(packed_requests=1, packed_units=len(keys))
+        return [self.preserver.restore(piece, elements) for piece, (elements, _) in zip(pieces, extracted)]
+
+    def translate_markdown(self, markdown: str, source_lang: str, path: str = None, split_by_sentence: bool = False,
+                           document_lang: str = None, output: Optional[TextIO] = None) -> Optional[str]:
+        """
+        Translate Markdown text using the same preprocessing as Argos.
+
+        output: 결과를 쓸 스트림. 주어지면 단위가 끝날 때마다 쓰고 None 반환
+        번역 요청은 config.num_parallel개까지 동시에 보내고, 결과는 원래 순서대로 조립한다.
+        짧은 단위들은 config.pack_tokens 예산 안에서 한 프롬프트로 묶어 보낸다.
+        path가 있으면 응답을 스트리밍으로 받아 생성 중인 번역을 progress_manager에 바로 반영한다.
+        """
+        translator = MarkdownTranslator(source_lang, "ko", document_lang)
+        # auto이면 문서 언어를 한 번만 감지하고, 문자 체계가 달라진 단위만 개별 판정
+        translator.resolve_document_language(markdown)
+        # 번역 결과는 원래 구조대로 바로 출력 (결과 목록을 모으지 않음)
+        builder = OutputBuilder(markdown, output)
         # 각 청크 정보 구성 (chunk index, type, size, status)
         chunks_info = [
             {"index": i, "type": unit.unit_type, "size": len(unit.content), "status": "pending"}
-            for i, unit in enumerate(units)
+            for i, unit in enumerate(translator.iter_units(markdown, split_by_sentence))
         ]
         if path:
-            progress_manager.set_total_chunks(path, total_chunks, chunks_info)
-        try:
-            for idx, unit in enumerate(units):
-                if path:
-                    progress_manager.update_chunk_progress(path, idx, "processing")
-                if not unit.is_translatable:
-                    results.append(unit.content)
+            progress_manager.set_total_chunks(path, len(chunks_info), chunks_info)
+        # 서버가 응답을 만드는 동안 다음 단위를 보내도록 최대 num_parallel개 요청을 동시에 유지
+        limit = max(1, self.config.num_parallel)
+        in_flight = {}  # future -> [(단위 인덱스, 출력 자리)]
+        group: List[Tuple[int, int, str, str]] = []  # 한 프롬프트로 묶을 짧은 단위 (인덱스, 자리, 원문, 언어)
+        group_tokens = 0
+
+        def collect(return_when) -> None:
+            done, _ = wait(in_flight, return_when=return_when)
+            for future in done:
+                for (idx, slot), translated in zip(in_flight.pop(future), future.result()):
+                    builder.fill(slot, translated)
                     if path:
-                        progress_manager.add_chunk_result(path, idx, unit.content)
-                    continue
-                # LLM 번역
-                translated = self.translate_unit(unit.content, source_lang)
-                results.append(translated)
-                if path:
-                    progress_manager.add_chunk_result(path, idx, translated)
-            if path:
-                progress_manager.finish(path)
-        except Exception as e:
+                        progress_manager.add_chunk_result(path, idx, translated)
+
+        def submit(items: List[Tuple[int, int, str, str]]) -> None:
+            if len(in_flight) >= limit:
+                collect(FIRST_COMPLETED)
+            # LLM 번역 (작업 메모를 쓰도록 현재 컨텍스트에서 실행). 결과는 끝나는 대로 자리에 채움
+            context = contextvars.copy_context()
+            # 생성 중인 번역을 진행 상황에 바로 반영 (상태 API의 in_progress)
+            stream = None
             if path:
-                progress_manager.error(path, str(e))
-            raise
-        # 번역 결과를 원래 구조대로 조립
-        return "\n".join(results)
+                indices = [idx for idx, _, _, _ in items]
+
+                def forward(position: int, partial: str) -> None:
+                    progress_manager.update_chunk_text(path, indices[position], partial)
+                stream = forward
+            future = pool.submit(context.run, self.translate_units, [(text, lang) for _, _, text, lang in items], stream)
+            in_flight[future] = [(idx, slot) for idx, slot, _, _ in items]
+
+        # 문서 안의 반복 세그먼트는 작업 메모에서 재사용
+        with job_memo(), ThreadPoolExecutor(max_workers=limit, thread_name_prefix="ollama") as pool:
+            try:
+                for idx, unit in enumerate(translator.iter_units(markdown, split_by_sentence)):
+                    if path:
+                        progress_manager.update_chunk_progress(path, idx, "processing")
+                    if idx:
+                        builder.text("\n")
+                    # 재시작한 작업이면 체크포인트에 기록된 단위는 다시 번역하지 않음
+                    translated = progress_manager.resumed_result(path, idx) if path else None
+                    if translated is None and unit.is_translatable:
+                        item = (idx, builder.slot(), unit.content, translator.unit_language(unit.content))
+                        tokens = estimate_tokens(unit.content)
+                        if not self.is_packable(unit.content, tokens):
+                            submit([item])
+                            continue
+                        # 짧은 단위는 토큰 예산이 찰 때까지 모았다가 한 프롬프트로 보냄
+                        if group and (group_tokens + tokens > self.config.pack_tokens
+                                      or len(group) >= OLLAMA_PACK_MAX_UNITS):
+                            submit(group)
+                            group, group_tokens = [], 0
+                        group.append(item)
+                        group_tokens += tokens
+                        continue
+                    if translated is None:
+                        translated = unit.content
+                    builder.text(translated)
+                    if path:
+                        progress_manager.add_chunk_result(path, idx, translated)
+                if group:
+                    submit(group)
+                collect(ALL_COMPLETED)
+                # 출력 스트림에 쓰는 작업은 호출한 쪽(tasks.run_translation)이 파일을 확정한 뒤 완료 처리
+                if path and output is None:
+                    progress_manager.finish(path)
+            except Exception as e:
+                for future in in_flight:
+                    future.cancel()
+                if path:
+                    progress_manager.error(path, str(e))
+                raise
+        summary = self.summary()
+        logger.info(
+            f"Ollama 요청 {summary['ollama_requests']}회 (묶음 {summary['packed_requests']}회로 "
+            f"{summary['packed_units']}개 단위 번역, 묶음 응답 분리 실패 {summary['pack_fallbacks']}회), "
+            f"프롬프트 평가 {summary['prompt_eval_count']}토큰 / {summary['prompt_eval_seconds']}초 "
+            f"(요청당 {summary['prompt_tokens_per_request']}토큰)"
+        )
+        return builder.getvalue()
 
 
 def translate_pdf_to_korean(pdf_path: str, model_name: str = "gemma3:4b") -> str:
@@ -0,0 +1,149 @@
+"""번역 결과 출력 조립기
+
+번역된 텍스트와 원문을 그대로 쓰는 구간(원문 안의 (start, end) 오프셋)을 문서 순서대로 받아
+출력 스트림(파일 등)에 바로 쓴다. 번역 결과 목록을 모았다가 '\\n\\n'.join으로 합치지 않으므로
+대용량 문서에서도 메모리에는 원문 한 벌과 아직 앞 순서를 기다리는 결과만 남는다.
+
+배치/다중 프로세스 모드처럼 결과가 순서와 다르게 끝나는 경우에는 slot()으로 자리를 먼저 잡고
+fill()로 채운다. 앞의 자리가 모두 채워지는 즉시 스트림에 쓰고 버린다.
+"""
+
+import io
+import threading
+import time
+from collections import deque
+from typing import Optional, TextIO, Tuple, Union
+
+_EMPTY = object()  # 아직 채워지지 않은 자리
+
+# 파일 스트림을 내보내는(flush) 최소 간격 (초). 진행 중 부분 결과를 읽을 때 이 정도 늦을 수 있음
+FLUSH_INTERVAL = 0.5
+
+
+class OutputBuilder:
+    """원문 구간/번역 결과를 순서대로 스트림에 쓰는 출력 조립기 (스레드 안전)"""
+
+    def __init__(self, source: str, stream: Optional[TextIO] = None):
+        """
+        Args:
+            source: 원문 (span()의 오프셋 기준)
+            stream: 출력 스트림. None이면 메모리(StringIO)에 모으고 getvalue()로 반환
+        """
+        self.source = source
+        self._owns_stream = stream is None
+        self.stream = io.StringIO() if stream is None else stream
+        self._pending: deque = deque()  # 아직 쓰지 못한 항목 ([값] 목록, 값은 문자열/구간/_EMPTY)
+        self._slots = {}  # 자리 번호 -> 항목
+        self._next_slot = 0
+        self._appended = 0  # 지금까지 추가한 항목 수 (mark/rollback 기준)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._unflushed = False  # 스트림에 썼지만 아직 내보내지 않은 내용이 있는지
+        self._flush_timer: Optional[threading.Timer] = None
+        self.chars_written = 0
+
+    def text(self, text: str) -> None:
+        """번역 결과(또는 구분자 등 새 텍스트) 추가"""
+        if text:
+            self._append([text])
+
+    def span(self, start: int, end: int) -> None:
+        """원문 구간을 복사하지 않고 그대로 추가 (쓸 때 잘라냄)"""
+        if start < end:
+            self._append([(start, end)])
+
+    def slot(self) -> int:
+        """나중에 fill()로 채울 자리 추가 (자리 번호 반환)"""
+        with self._lock:
+            slot_id = self._next_slot
+            self._next_slot += 1
+            entry = [_EMPTY]
+            self._slots[slot_id] = entry
+            self._pending.append(entry)
+            self._appended += 1
+            return slot_id
+
+    def fill(self, slot_id: int, text: str) -> None:
+        """자리를 채우고, 앞의 자리가 모두 채워졌으면 스트림에 씀"""
+        with self._lock:
+            self._slots.pop(slot_id)[0] = text
+            self._flush()
+
+    def mark(self) -> int:
+        """rollback()의 기준점"""
+        with self._lock:
+            return self._appended
+
+    def rollback(self, mark: int) -> bool:
+        """
+        기준점 이후 추가한 항목을 모두 버림 (다른 방식으로 다시 번역하기 전에 사용)
+
+        그 사이에 이미 스트림에 쓴 항목이 있으면 되돌릴 수 없으므로 아무것도 버리지 않고 False를 반환한다.
+        """
+        with self._lock:
+            count = self._appended - mark
+            if count > len(self._pending):
+                return False
+            dropped = {id(self._pending.pop()) for _ in range(count)}
+            self._slots = {slot_id: entry for slot_id, entry in self._slots.items() if id(entry) not in dropped}
+            self._appended = mark
+            return True
+
+    def _append(self, entry: list) -> None:
+        with self._lock:
+            self._pending.append(entry)
+            self._appended += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        """앞에서부터 채워진 항목을 스트림에 쓰고 버림 (잠금을 가진 상태에서 호출)"""
+        pending = self._pending
+        if not pending or pending[0][0] is _EMPTY:
+            return
+        write = self.stream.write
+        while pending and pending[0][0] is not _EMPTY:
+            value: Union[str, Tuple[int, int]] = pending.popleft()[0]
+            if isinstance(value, tuple):
+                value = self.source[value[0]:value[1]]
+            write(value)
+            self.chars_written += len(value)
+        # 파일 스트림은 진행 중에도 부분 결과를 읽을 수 있도록 최대 FLUSH_INTERVAL마다 내보냄.
+        # 간격 안이라 건너뛴 내용은 타이머로 한 번 더 내보냄 (다음 쓰기가 한참 뒤라도 마지막 결과가 늦지 않도록)
+        if not self._owns_stream:
+            self._unflushed = True
+            elapsed = time.monotonic() - self._last_flush
+            if elapsed >= FLUSH_INTERVAL:
+                self._flush_stream()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_INTERVAL - elapsed, self._trailing_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _flush_stream(self) -> None:
+        """스트림 내보내기 (잠금을 가진 상태에서 호출)"""
+        self.stream.flush()
+        self._last_flush = time.monotonic()
+        self._unflushed = False
+
+    def _trailing_flush(self) -> None:
+        """간격 때문에 건너뛴 내용을 내보냄 (타이머 스레드)"""
+        with self._lock:
+            self._flush_timer = None
+            if not self._unflushed:
+                return
+            try:
+                self._flush_stream()
+            except ValueError:
+                # 작업이 끝나 스트림이 이미 닫힘 (닫을 때 모두 내보냄)
+                self._unflushed = False
+
+    @property
+    def pending_slots(self) -> int:
+        """아직 채워지지 않은 자리 수"""
+        return len(self._slots)
+
+    def getvalue(self) -> Optional[str]:
+        """메모리 출력이면 조립된 전체 문자열, 외부 스트림이면 None"""
+        if self._slots:
+            raise RuntimeError(f"채워지지 않은 출력 자리가 {len(self._slots)}개 있습니다")
+        return self.stream.getvalue() if self._owns_stream else None
@@ -1,10 +1,14 @@
+from pathlib import Path
 from threading import Lock
 from typing import Dict, Any, List, Optional
 
+from translation_memory import is_failed_translation
+
 
 class ProgressManager:
     def __init__(self):
         self._progress = {}
+        self._checkpoints = {}  # 경로 -> JobCheckpoint (중단된 작업 재개용)
         self._lock = Lock()
 
     def start(self, path: str):
@@ -27,12 +31,50 @@ class ProgressManager:
             if path in self._progress:
                 self._progress[path]['total_chunks'] = total
                 self._progress[path]['chunks_info'] = chunks_info
-                # 부분 결과를 저장할 공간 초기화
-                self._progress[path]['partial_results'] = [''] * total
+                checkpoint = self._checkpoints.get(path)
+                if checkpoint is not None:
+                    self._progress[path]['chunks_resumed'] = checkpoint.bind(chunks_info)
+                # 부분 결과를 저장할 공간 초기화 (출력 파일에 바로 쓰는 작업은 결과를 따로 보관하지 않음)
+                if 'output_file' not in self._progress[path]:
+                    self._progress[path]['partial_results'] = [''] * total
                 print(f"[PROGRESS] 총 청크 설정 - {path}: {total}개")
             else:
                 print(f"[PROGRESS] 경고: {path}가 progress에 없음 (set_total_chunks)")
 
+    def set_output_file(self, path: str, output_file):
+        """
+        번역 결과를 순서대로 쓰고 있는 출력 파일을 등록합니다.
+        등록하면 청크 결과를 메모리에 복사해 두지 않고, 부분 결과는 이 파일에서 읽습니다.
+        """
+        with self._lock:
+            if path in self._progress:
+                self._progress[path]['output_file'] = str(output_file)
+                self._progress[path]['partial_results'] = []
+            else:
+                print(f"[PROGRESS] 경고: {path}가 progress에 없음 (set_output_file)")
+
+    def attach_checkpoint(self, path: str, checkpoint):
+        """
+        작업 체크포인트(job_checkpoint.JobCheckpoint)를 연결합니다.
+        청크 수를 설정할 때 기존 체크포인트를 불러오고, 끝난 청크 결과를 체크포인트에 기록합니다.
+        """
+        with self._lock:
+            self._checkpoints[path] = checkpoint
+
+    def detach_checkpoint(self, path: str):
+        """작업이 끝나면 체크포인트 연결을 해제하고 반환합니다."""
+        with self._lock:
+            return self._checkpoints.pop(path, None)
+
+    def resumed_result(self, path: str, chunk_index: int) -> Optional[str]:
+        """
+        체크포인트에 기록된 청크 결과를 반환합니다 (없으면 None).
+        번역기는 이 결과가 있는 청크를 다시 번역하지 않습니다.
+        """
+        with self._lock:
+            checkpoint = self._checkpoints.get(path)
+        return checkpoint.get(chunk_index) if checkpoint is not None else None
+
     def update_chunk_progress(self, path: str, chunk_index: int, status: str = 'processing'):
         """
         현재 처리 중인 청크 정보를 업데이트합니다.
@@ -46,6 +88,25 @@ class ProgressManager:
             else:
                 print(f"[PROGRESS] 경고: {path}가 progress에 없음 (update_chunk_progress)")
 
+    def update_chunk_text(self, path: str, chunk_index: int, text: str):
+        """
+        번역 중인 청크의 지금까지 생성된 텍스트를 갱신합니다 (스트리밍 응답).
+        청크 결과를 추가하면 지워집니다.
+        """
+        with self._lock:
+            progress = self._progress.get(path)
+            if isinstance(progress, dict) and progress.get('status') == 'running':
+                progress.setdefault('streaming', {})[chunk_index] = text
+
+    def get_streaming_chunks(self, path: str) -> List[Dict[str, Any]]:
+        """
+        번역 중인 청크의 생성 중 텍스트 목록을 반환합니다 ([{'index', 'text'}], 청크 순서).
+        """
+        with self._lock:
+            progress = self._progress.get(path)
+            streaming = progress.get('streaming', {}) if isinstance(progress, dict) else {}
+            return [{'index': index, 'text': text} for index, text in sorted(streaming.items())]
+
     def add_chunk_result(self, path: str, chunk_index: int, result: str):
         """
         청크 번역 결과를 추가합니다.
@@ -57,6 +118,11 @@ class ProgressManager:
                     self._progress[path]['chunks_info'][chunk_index]['status'] = 'completed'
                 if chunk_index < len(self._progress[path]['partial_results']):
                     self._progress[path]['partial_results'][chunk_index] = result
+                self._progress[path].get('streaming', {}).pop(chunk_index, None)
+                # 오류 표시가 들어간 결과는 체크포인트에 남기지 않음 (이어서 실행할 때 다시 번역)
+                checkpoint = self._checkpoints.get(path)
+                if checkpoint is not None and not is_failed_translation(result):
+                    checkpoint.record(chunk_index, result)
                 
                 completed = self._progress[path]['chunks_completed']
                 total = self._progress[path]['total_chunks']
@@ -64,10 +130,21 @@ class ProgressManager:
             else:
                 print(f"[PROGRESS] 경고: {path}가 progress에 없음 (add_chunk_result)")
 
+    def set_summary(self, path: str, summary: Dict[str, Any]):
+        """
+        작업 요약 정보(중복 제거 비율 등)를 저장합니다.
+        """
+        with self._lock:
+            if path in self._progress:
+                self._progress[path]['summary'] = summary
+            else:
+                print(f"[PROGRESS] 경고: {path}가 progress에 없음 (set_summary)")
+
     def finish(self, path: str):
         with self._lock:
             if path in self._progress:
                 self._progress[path]['status'] = 'done'
+                self._progress[path].pop('streaming', None)
                 print(f"[PROGRESS] 완료 - {path}")
             else:
                 print(f"[PROGRESS] 경고: {path}가 progress에 없음 (finish)")
@@ -77,6 +154,7 @@ class ProgressManager:
             if path in self._progress:
                 self._progress[path]['status'] = 'error'
                 self._progress[path]['error'] = error_msg
+                self._progress[path].pop('streaming', None)
                 print(f"[PROGRESS] 오류 - {path}: {error_msg}")
             else:
                 self._progress[path] = {'status': 'error', 'error': error_msg}
@@ -103,6 +181,15 @@ class ProgressManager:
         """
         현재까지 번역된 부분 결과를 반환합니다.
         """
+        with self._lock:
+            progress = self._progress.get(path)
+            output_file = progress.get('output_file') if isinstance(progress, dict) else None
+        if output_file:
+            # 출력 파일에는 앞에서부터 끝난 결과만 순서대로 쓰여 있음
+            try:
+                return Path(output_file).read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                return ''
         with self._lock:
             if path in self._progress and 'partial_results' in self._progress[path]:
                 # 빈 문자열이 아닌 결과만 합치기
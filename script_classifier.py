@@ -0,0 +1,131 @@
+"""문자 체계(스크립트) 분포 분석
+
+한글, 히라가나, 가타카나, 한자, 라틴 문자의 수를 텍스트를 한 번 인코딩해 함께 센다.
+텍스트를 UTF-16(BE)으로 인코딩한 뒤 상위/하위 바이트 열을 256칸 변환 표(bytes.translate)로
+0/1 마스크로 바꾸고, 마스크를 정수로 보아 AND와 비트 수 세기로 두 바이트 조건을 함께 판정한다.
+모든 연산이 C 수준의 바이트/정수 연산이므로 스크립트마다 정규식으로 텍스트를 다시 검색하거나
+일치 목록을 만들지 않는다. 외부 의존성(numpy 등)은 없다.
+
+translator.NLLBTranslator.detect_language와 file_utils.analyze_character_distribution이 공유한다.
+
+resolve_segment_language는 작업마다 한 번 감지한 문서 언어를 세그먼트에 적용하되,
+세그먼트의 문자 체계 구성이 문서 언어와 달라진 경우(예: 일본어 계약서 안의 영문 조항)에만
+세그먼트 언어를 다시 판정한다. NLLB/Argos/Ollama 번역 경로가 공유한다.
+"""
+
+from typing import Dict, Callable, Optional, Tuple
+
+# 스크립트별 유니코드 범위 (양 끝 포함, 기존 정규식 범위와 동일)
+#   latin: [A-Za-z], hiragana: U+3040-309F, katakana: U+30A0-30FF,
+#   han: U+4E00-9FAF (CJK 통합 한자), hangul: U+AC00-D7AF (한글 음절)
+SCRIPTS = ('hangul', 'hiragana', 'katakana', 'han', 'latin')
+
+
+def _byte_table(predicate: Callable[[int], bool]) -> bytes:
+    """바이트 값 → 1/0 변환 표"""
+    return bytes(1 if predicate(value) else 0 for value in range(256))
+
+
+_HIGH_ZERO = _byte_table(lambda b: b == 0x00)
+_HIGH_KANA = _byte_table(lambda b: b == 0x30)
+_HIGH_HAN = _byte_table(lambda b: 0x4E <= b <= 0x9E)
+_HIGH_HAN_LAST = _byte_table(lambda b: b == 0x9F)        # U+9F00-9FAF
+_HIGH_HANGUL = _byte_table(lambda b: 0xAC <= b <= 0xD6)
+_HIGH_HANGUL_LAST = _byte_table(lambda b: b == 0xD7)     # U+D700-D7AF
+_LOW_LATIN = _byte_table(lambda b: 0x41 <= b <= 0x5A or 0x61 <= b <= 0x7A)
+_LOW_HIRAGANA = _byte_table(lambda b: 0x40 <= b <= 0x9F)
+_LOW_KATAKANA = _byte_table(lambda b: b >= 0xA0)
+_LOW_RANGE_END = _byte_table(lambda b: b <= 0xAF)       # 한자/한글 범위의 마지막 블록 (xxAF까지)
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+else:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+
+def _mask(data: bytes, table: bytes) -> int:
+    """바이트 열을 변환 표로 0/1 마스크로 바꾼 뒤 정수로 변환 (위치별 AND 용)"""
+    return int.from_bytes(data.translate(table), 'big')
+
+
+def count_scripts(text: str) -> Dict[str, int]:
+    """
+    스크립트별 문자 수를 한 번에 집계
+
+    Returns:
+        {'hangul', 'hiragana', 'katakana', 'han', 'latin': 문자 수, 'total': 전체 문자 수}
+    """
+    # BMP 밖의 문자는 서로게이트 쌍(D8-DF)이 되어 어떤 범위에도 속하지 않음
+    encoded = text.encode('utf-16-be', 'surrogatepass')
+    high, low = encoded[0::2], encoded[1::2]
+
+    kana = _mask(high, _HIGH_KANA)
+    range_end = _mask(low, _LOW_RANGE_END)
+    return {
+        'hangul': high.translate(_HIGH_HANGUL).count(1) + _popcount(_mask(high, _HIGH_HANGUL_LAST) & range_end),
+        'hiragana': _popcount(kana & _mask(low, _LOW_HIRAGANA)),
+        'katakana': _popcount(kana & _mask(low, _LOW_KATAKANA)),
+        'han': high.translate(_HIGH_HAN).count(1) + _popcount(_mask(high, _HIGH_HAN_LAST) & range_end),
+        'latin': _popcount(_mask(high, _HIGH_ZERO) & _mask(low, _LOW_LATIN)),
+        'total': len(text),
+    }
+
+
+def script_ratios(text: str) -> Dict[str, float]:
+    """스크립트별 문자 비율 (전체 문자 수 대비, 빈 텍스트는 모두 0)"""
+    counts = count_scripts(text)
+    total = counts.pop('total')
+    return {name: (count / total if total else 0.0) for name, count in counts.items()}
+
+
+# 언어별로 사용하는 스크립트 (여기 없는 언어는 라틴 문자 언어로 간주)
+LANGUAGE_SCRIPTS: Dict[str, Tuple[str, ...]] = {
+    'ko': ('hangul', 'han'),
+    'ja': ('hiragana', 'katakana', 'han'),
+    'zh': ('han',),
+}
+# 집계하지 않는 문자 체계(키릴, 아랍, 태국 문자 등)를 쓰는 언어
+OTHER_SCRIPT_LANGUAGES = ('ru', 'uk', 'ar', 'he', 'el', 'th', 'hi')
+
+
+def language_from_counts(counts: Dict[str, int]) -> str:
+    """스크립트 분포로 언어 추정 (한글 → 일본어 가나 → 한자 순, 해당 없으면 영어)"""
+    if counts['hangul'] > counts['total'] * 0.1:
+        return 'ko'
+    if counts['hiragana'] > 5 or counts['katakana'] > 5:
+        return 'ja'
+    if counts['han'] > counts['total'] * 0.1:
+        return 'zh'
+    return 'en'
+
+
+def language_scripts(lang: str) -> Tuple[str, ...]:
+    """언어 코드('zh-cn' 등 지역 코드 포함)가 사용하는 스크립트"""
+    base = lang.split('-')[0].split('_')[0].lower()
+    if base in LANGUAGE_SCRIPTS:
+        return LANGUAGE_SCRIPTS[base]
+    return () if base in OTHER_SCRIPT_LANGUAGES else ('latin',)
+
+
+def resolve_segment_language(text: str, document_lang: Optional[str], sample_chars: int = 1000) -> str:
+    """
+    세그먼트의 원본 언어 결정
+
+    문서 언어의 스크립트가 세그먼트에서 우세하면(숫자/기호뿐인 세그먼트 포함) 문서 언어를 그대로 쓰고,
+    다른 스크립트가 더 많을 때만 세그먼트 자체의 분포로 언어를 다시 판정한다.
+    문서 언어가 없으면(None/"auto") 세그먼트마다 판정한다.
+    """
+    counts = count_scripts(text[:sample_chars])
+    if not document_lang or document_lang == 'auto':
+        return language_from_counts(counts)
+    native_scripts = language_scripts(document_lang)
+    native = sum(counts[name] for name in native_scripts)
+    foreign = sum(counts[name] for name in SCRIPTS if name not in native_scripts)
+    if foreign <= native:
+        return document_lang
+    detected = language_from_counts(counts)
+    # 가나 없이 한자만 있는 세그먼트는 일본어 문서에서는 일본어로 본다
+    if detected == 'zh' and 'hiragana' in native_scripts:
+        return document_lang
+    return detected
@@ -8,7 +8,6 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 import subprocess
 import time
-import requests
 import atexit
 
 # 로깅 설정
@@ -23,7 +22,8 @@ langdetect_available = False
 # 로컬 모듈 임포트
 import file_utils
 import tasks
-from tasks import get_translated_file_path, get_original_markdown_path # Import the new helper function
+from tasks import get_translated_file_path, get_partial_translated_file_path, get_original_markdown_path # Import the new helper function
+from model_preloader import model_preloader, start_preload
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 
@@ -55,14 +55,17 @@ def get_language_name(code: str) -> str:
 
 # 서비스 초기화 플래그
 _services_initialized = False
+_services_lock = threading.Lock()
 
 def initialize_services():
-    """무거운 서비스 초기화를 지연로딩"""
+    """무거운 서비스 초기화를 지연로딩 (PDF 미리보기/언어 감지가 처음 필요할 때 호출)"""
+    with _services_lock:
+        if not _services_initialized:
+            _initialize_services()
+
+def _initialize_services():
     global Pdf2ImageAvailable, PillowAvailable, langdetect_available, _services_initialized
     
-    if _services_initialized:
-        return
-        
     try:
         # pdf2image 초기화
         global convert_from_path, pdfinfo_from_path
@@ -94,10 +97,8 @@ def initialize_services():
     
     _services_initialized = True
 
-# 서버 시작 시 서비스 초기화
-if not _services_initialized:
-    initialize_services()
-    _services_initialized = True
+# 번역 모델 사전 로딩 (PRELOAD_ENGINES 설정 시 백그라운드 스레드)
+start_preload()
 
 @app.route('/')
 def index():
@@ -117,6 +118,7 @@ def is_foreign_language(text: str, threshold: float = 0.5) -> bool:
     if not text.strip():
         return False
         
+    initialize_services()
     try:
         if not langdetect_available:
             return False
@@ -606,6 +608,7 @@ def select_file():
         
         # PDF 파일인 경우 추가 정보 수집
         if file_ext == '.pdf':
+            initialize_services()
             try:
                 if Pdf2ImageAvailable:
                     info = pdfinfo_from_path(file_path, userpw=None, poppler_path=None)
@@ -701,6 +704,7 @@ def view_pdf():
         path = data.get('path')
         page = int(data.get('page', 1))
         dpi = int(data.get('dpi', 200))  # 기본 DPI를 200으로 설정
+        initialize_services()
         
         # 필수 파라미터 검증
         if not path:
@@ -792,12 +796,34 @@ def view_pdf():
 def translate():
     path = request.json['path']
     advanced = request.json.get('advanced', False)
+    engine = request.json.get('engine')  # 'argos', 'nllb', 'ollama' (없으면 advanced로 결정)
+    profile = request.json.get('profile')  # NLLB 디코딩 프로필: 'draft', 'balanced', 'quality'
+    if engine is not None and engine not in tasks.SUPPORTED_ENGINES:
+        return jsonify({'error': f"지원하지 않는 번역 엔진입니다: {engine}"}), 400
+    if profile is not None and profile not in tasks.DECODING_PROFILE_NAMES:
+        return jsonify({'error': f"지원하지 않는 디코딩 프로필입니다: {profile}"}), 400
     # run translation in background thread
-    thread = threading.Thread(target=tasks.run_translation, args=(path, advanced), daemon=True)
+    thread = threading.Thread(target=tasks.run_translation, args=(path, advanced, engine, profile), daemon=True)
     thread.start()
     return jsonify({'status': 'started', 'path': path})
 
 
+@app.route('/api/ready')
+def ready():
+    """
+    서버 준비 상태와 사전 로딩한 번역 엔진별 상태를 반환합니다.
+    
+    Returns:
+        {
+            "ready": bool,  # 사전 로딩이 모두 끝났으면 true (사전 로딩 엔진이 없으면 항상 true)
+            "engines": {
+                "nllb": {"status": "pending|loading|loaded|error", "load_seconds": float, "memory_mb": float, ...}
+            }
+        }
+    """
+    return jsonify(model_preloader.status())
+
+
 @app.route('/api/translation-status')
 def translation_status():
     path = request.args.get('path')
@@ -843,6 +869,11 @@ def translation_status():
             })
             
             print(f"[DEBUG] 진행률 정보 - 완료: {chunks_completed}/{total_chunks} ({progress_percent:.1f}%)")
+
+            # 생성 중인 청크의 지금까지 번역 (스트리밍 엔진)
+            in_progress = tasks.progress_manager.get_streaming_chunks(path)
+            if in_progress:
+                response['in_progress'] = in_progress
             
             # 부분 결과 추가 (선택적)
             if include_partial:
@@ -851,6 +882,10 @@ def translation_status():
                     response['partial_results'] = partial_results
                     print(f"[DEBUG] 부분 결과 포함 - 길이: {len(partial_results)}자")
         
+        # 작업 요약 (중복 제거 비율 등)
+        if 'summary' in status_data:
+            response['summary'] = status_data['summary']
+        
         # 오류 정보 추가
         if status_data.get('status') == 'error' and 'error' in status_data:
             response['error'] = status_data['error']
@@ -879,16 +914,32 @@ def translation_result():
     
     # Use the helper function from tasks.py to get the new path
     translated_path = get_translated_file_path(path)
+    partial_path = get_partial_translated_file_path(path)
     
-    if not translated_path.exists():
+    # 번역 중이거나 중간에 중단된 작업은 끝난 부분까지 쓰인 임시 파일을 반환
+    status_data = tasks.progress_manager.get(path)
+    running = isinstance(status_data, dict) and status_data.get('status') == 'running'
+    partial = partial_path.exists() and (running or not translated_path.exists())
+    # 확인한 뒤 작업이 끝나 임시 파일이 최종 파일로 바뀔 수 있으므로 (os.replace) 열 수 없으면 최종 파일을 읽음
+    candidates = [partial_path, translated_path] if partial else [translated_path]
+    for result_path in candidates:
+        try:
+            with open(result_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            break
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            return jsonify({'error': f'번역 파일을 읽는 중 오류가 발생했습니다: {str(e)}'}), 500
+    else:
         return jsonify({'error': f'번역 파일을 찾을 수 없습니다: {translated_path}'}), 404
     
-    try:
-        with open(translated_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return jsonify({'content': content, 'translated_path': str(translated_path)})
-    except Exception as e:
-        return jsonify({'error': f'번역 파일을 읽는 중 오류가 발생했습니다: {str(e)}'}), 500
+    partial = result_path == partial_path
+    response = {'content': content, 'translated_path': str(result_path), 'partial': partial}
+    if partial and running:
+        response['chunks_completed'] = status_data.get('chunks_completed', 0)
+        response['total_chunks'] = status_data.get('total_chunks', 0)
+    return jsonify(response)
 
 
 @app.route('/api/read-file')
@@ -970,6 +1021,7 @@ ollama_process = None
 
 def is_ollama_running():
     """Checks if the Ollama server is running and responsive."""
+    import requests
     try:
         response = requests.get("http://localhost:11434/api/tags", timeout=2)
         response.raise_for_status() # Raise an exception for HTTP errors
@@ -1038,6 +1090,9 @@ def start_ollama_server():
 def stop_ollama_server():
     """Stops the Ollama server if it was started by this application."""
     global ollama_process
+    # 공유 Ollama 클라이언트의 연결 풀 정리
+    from ollama_client import shutdown_ollama_client
+    shutdown_ollama_client()
     if ollama_process and ollama_process.poll() is None: # Check if process exists and is running
         logger.info(f"Stopping Ollama server (PID: {ollama_process.pid})...")
         try:
@@ -694,10 +694,10 @@ function startTranslationStatusCheck(filePath) {
   // 즉시 한 번 실행
   checkTranslationStatus(filePath);
 
-  // 2초마다 상태 확인
+  // 1초마다 상태 확인 (생성 중인 번역을 바로 보여주기 위해)
   translationStatusInterval = setInterval(() => {
     checkTranslationStatus(filePath);
-  }, 2000);
+  }, 1000);
 }
 
 // 번역 상태 polling에서 완료/실패 시 버튼 다시 활성화
@@ -808,9 +808,32 @@ function updateTranslationProgress(data) {
       `;
       })
       .join("");
+
+    // 생성 중인 청크의 지금까지 번역 (Ollama 스트리밍)
+    if (Array.isArray(data.in_progress) && data.in_progress.length) {
+      chunksInfo.innerHTML += data.in_progress
+        .map(
+          (chunk) => `
+        <div style="margin-top: 6px; padding: 6px; background: #f9fafb; border-left: 3px solid #60a5fa; font-size: 12px; white-space: pre-wrap;">
+          <div style="color: #6b7280;">✍️ 청크 ${chunk.index + 1} 번역 중</div>
+          <div>${escapeHtml(chunk.text)}</div>
+        </div>
+      `,
+        )
+        .join("");
+    }
   }
 }
 
+// HTML 특수 문자 이스케이프 (생성 중인 번역 표시용)
+function escapeHtml(text) {
+  return String(text)
+    .replace(/&/g, "&amp;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;")
+    .replace(/"/g, "&quot;");
+}
+
 // 번역 오류 표시
 function showTranslationError(filePath, error) {
   const rightPanel = document.getElementById("translation-container");
@@ -885,6 +908,10 @@ function displayTranslatedContentOrPlaceholder(filePath) {
         const downloadPath = data.translated_path || filePath;
         const fileName = downloadPath.split(/[\\/]/).pop();
         const htmlContent = renderMarkdown(data.content);
+        // 번역 중(또는 중단된) 작업은 끝난 부분까지만 표시
+        const footerText = data.partial
+          ? `번역 중입니다. 끝난 부분까지 표시합니다${data.total_chunks ? ` (${data.chunks_completed}/${data.total_chunks} 청크)` : ""}.`
+          : "번역이 완료되었습니다. 위의 다운로드 버튼을 클릭하여 파일을 저장하세요.";
         rightPanel.innerHTML = `
           <div class="p-4 flex flex-col h-full">
             <div class="flex items-center justify-between mb-4 flex-shrink-0">
@@ -899,7 +926,7 @@ function displayTranslatedContentOrPlaceholder(filePath) {
               ${htmlContent}
             </div>
             <div class="mt-4 text-sm text-gray-500 flex-shrink-0">
-              <p>번역이 완료되었습니다. 위의 다운로드 버튼을 클릭하여 파일을 저장하세요.</p>
+              <p>${footerText}</p>
             </div>
           </div>
         `;
@@ -1,15 +1,31 @@
 from pathlib import Path
+import hashlib
 import logging
+import os
 
 from file_utils import convert_pdf_to_markdown  # PDF를 Markdown 문자열로 변환
-from argos_translator import translate_markdown  # Markdown 문자열을 번역
+from file_utils import detect_language_enhanced, normalize_lang_code
+from job_checkpoint import CHECKPOINT_SUFFIX, JobCheckpoint
 from progress_manager import progress_manager
+from translation_memory import get_translation_memory, job_memo
 
 logger = logging.getLogger(__name__)
 
 # New root directory for all processed files
 DATA_ROOT_DIR = Path('data_translated')
 
+# 번역 엔진 (지정하지 않으면 advanced 여부로 ollama/argos 선택)
+SUPPORTED_ENGINES = ('argos', 'nllb', 'ollama')
+
+# NLLB 디코딩 프로필 이름 (translator.DECODING_PROFILES와 동일, 요청 검증용으로 torch 없이 참조)
+DECODING_PROFILE_NAMES = ('draft', 'balanced', 'quality')
+
+# 문서 언어 감지에 사용할 앞부분 길이 (문자 수)
+LANGUAGE_SAMPLE_CHARS = 5000
+
+# NLLB 적응형 하이브리드 번역 모드 사용 (품질과 속도 균형)
+USE_ADAPTIVE_MODE = True  # True: 적응형 하이브리드, False: 문장별 고품질 모드
+
 def get_original_markdown_path(original_input_path_str: str) -> Path:
     """Gets the path for the stored original markdown file."""
     original_input_path = Path(original_input_path_str)
@@ -22,7 +38,17 @@ def get_translated_file_path(original_input_path_str: str) -> Path:
     file_stem = original_input_path.stem
     return DATA_ROOT_DIR / file_stem / (file_stem + '_translated.md')
 
-def run_translation(path: str, advanced: bool = False):
+def get_partial_translated_file_path(original_input_path_str: str) -> Path:
+    """번역 중 결과를 순서대로 덧붙여 쓰는 임시 파일 경로 (완료되면 번역 파일로 원자적으로 이름 변경)"""
+    translated_path = get_translated_file_path(original_input_path_str)
+    return translated_path.with_name(translated_path.name + '.part')
+
+def get_checkpoint_path(original_input_path_str: str) -> Path:
+    """중단된 작업을 이어서 번역하기 위한 체크포인트 파일 경로"""
+    file_stem = Path(original_input_path_str).stem
+    return DATA_ROOT_DIR / file_stem / (file_stem + CHECKPOINT_SUFFIX)
+
+def run_translation(path: str, advanced: bool = False, engine: str = None, profile: str = None):
     """
     Runs the translation pipeline for a given file (PDF or Markdown).
     The output will be structured under DATA_ROOT_DIR/filename_stem/
@@ -30,6 +56,9 @@ def run_translation(path: str, advanced: bool = False):
 
     Args:
         path: Path string to the source file.
+        advanced: Use the Ollama LLM translator when no engine is given.
+        engine: 'argos', 'nllb' or 'ollama' (overrides advanced).
+        profile: NLLB decoding profile ('draft', 'balanced', 'quality').
     """
     logger.info(f'Processing file: {path}')
     input_file_path = Path(path)
@@ -64,49 +93,106 @@ def run_translation(path: str, advanced: bool = False):
             logger.error(unsupported_msg)
             raise Exception(unsupported_msg)
 
-        # 3. 번역 수행 및 결과 저장
+        # 3. 번역 수행 및 결과 저장 (문서 안의 반복 세그먼트는 작업 메모로 한 번만 번역)
+        engine = engine or ('ollama' if advanced else 'argos')
+        if engine not in SUPPORTED_ENGINES:
+            raise ValueError(f"Unsupported translation engine: {engine}")
+        if profile and engine != 'nllb':
+            logger.info(f"Decoding profile '{profile}' only applies to NLLB; ignored for {engine}")
+        # 문서 언어는 작업마다 한 번만 감지해 모든 엔진에 전달 (세그먼트는 문자 체계가 다를 때만 개별 판정)
+        document_lang, lang_confidence = detect_language_enhanced(markdown_content_for_translation[:LANGUAGE_SAMPLE_CHARS])
+        document_lang = normalize_lang_code(document_lang)
+        logger.info(f"문서 언어: {document_lang} (신뢰도 {lang_confidence:.2f})")
+        # 번역 결과는 끝나는 대로 임시 파일에 순서대로 씀 (결과 전체를 메모리에 모으지 않고,
+        # 작업이 중간에 죽어도 끝난 부분은 디스크에 남음). 완료되면 번역 파일로 원자적으로 이름을 바꿈
+        translated_md_target_path = get_translated_file_path(path)
+        partial_md_path = get_partial_translated_file_path(path)
+        # 끝난 청크는 체크포인트에 기록해 두고, 같은 문서/설정으로 다시 실행하면 이어서 번역
+        # (엔진 설정은 번역기가 청크 분할을 마치기 전까지 채움)
+        checkpoint = JobCheckpoint(get_checkpoint_path(path), {
+            'engine': engine,
+            'source_sha256': hashlib.sha256(markdown_content_for_translation.encode('utf-8')).hexdigest(),
+            'source_lang': document_lang,
+        })
+        progress_manager.attach_checkpoint(path, checkpoint)
         try:
-            if advanced:
-                from ollama_translator import MultilingualTranslator, TranslationConfig
-                config = TranslationConfig()
-                translator = MultilingualTranslator(config)
-                translated_md = translator.translate_markdown(markdown_content_for_translation, config.source_lang.value, path=path)
-            else:
-                from argos_translator import translate_markdown
-                translated_md = translate_markdown(markdown_content_for_translation, path=path)
-            translated_md_target_path = current_file_output_dir / (file_stem + '_translated.md')
-            translated_md_target_path.write_text(translated_md, encoding='utf-8')
+            with job_memo() as memo, open(partial_md_path, 'w', encoding='utf-8') as output:
+                progress_manager.set_output_file(path, partial_md_path)
+                engine_summary = {}
+                if engine == 'ollama':
+                    from ollama_translator import MultilingualTranslator, TranslationConfig, OLLAMA_PACK_MAX_UNITS
+                    config = TranslationConfig()
+                    translator = MultilingualTranslator(config)
+                    checkpoint.config.update(
+                        model=config.model_name, temperature=config.temperature, max_tokens=config.max_tokens,
+                        prompt_sha256=translator.prompt_sha256,
+                        # 묶음 번역 설정이 바뀌면 단위별 결과도 달라짐
+                        pack_tokens=config.pack_tokens, pack_max_units=OLLAMA_PACK_MAX_UNITS,
+                    )
+                    translator.translate_markdown(
+                        markdown_content_for_translation, config.source_lang.value, path=path, document_lang=document_lang,
+                        output=output
+                    )
+                    # 요청 수와 프롬프트 평가 통계 (프롬프트 캐시 효과 확인용)
+                    engine_summary = translator.summary()
+                elif engine == 'nllb':
+                    from translator import translate_markdown, get_translator, DEFAULT_DECODING_PROFILE, ENGINE, PRECISION
+                    profile = profile or DEFAULT_DECODING_PROFILE
+                    # 실제로 올라간 모델 식별자 (모델 경로:엔진:정밀도, CTranslate2 초기화 실패 시 hf로 바뀐 경우 포함)
+                    checkpoint.config.update(
+                        profile=profile, adaptive=USE_ADAPTIVE_MODE, nllb_engine=ENGINE, precision=PRECISION,
+                        model=get_translator().model_id,
+                    )
+                    if USE_ADAPTIVE_MODE:
+                        logger.info("적응형 하이브리드 번역 모드 사용 (문서 특성에 따라 자동 최적화)")
+                    else:
+                        logger.info("문장별 고품질 번역 모드 사용")
+                    translate_markdown(
+                        markdown_content_for_translation, path,
+                        use_sentence_mode=not USE_ADAPTIVE_MODE, profile=profile, document_lang=document_lang,
+                        output=output
+                    )
+                else:
+                    from argos_translator import translate_markdown
+                    translate_markdown(markdown_content_for_translation, path=path, document_lang=document_lang, output=output)
+                output.flush()
+                os.fsync(output.fileno())
+            os.replace(partial_md_path, translated_md_target_path)
+            progress_manager.set_output_file(path, translated_md_target_path)
+            checkpoint.remove()
+            job_summary = {'engine': engine, 'source_lang': document_lang, **memo.summary(), **engine_summary}
+            if checkpoint.resumed:
+                job_summary['chunks_resumed'] = checkpoint.resumed
+            if engine == 'nllb':
+                job_summary['profile'] = profile
+            progress_manager.set_summary(path, job_summary)
+            logger.info(
+                f"세그먼트 중복 제거: {job_summary['deduplicated']}/{job_summary['segments']}개 재사용 "
+                f"({job_summary['dedupe_ratio'] * 100:.1f}%)"
+            )
             logger.info(f"Translated Markdown saved to: {translated_md_target_path}")
+            memory = get_translation_memory()
+            if memory is not None:
+                logger.info(f"번역 메모리 통계: {memory.get_stats()}")
         except Exception as e:
             logger.error(f"Translation failed for {input_file_path}: {e}")
+            if partial_md_path.exists():
+                logger.info(f"끝난 부분까지의 번역 결과: {partial_md_path}")
+            checkpoint.close()
+            logger.info(f"다시 실행하면 체크포인트에서 이어서 번역합니다: {checkpoint.path}")
             progress_manager.error(path, str(e))
             raise
+        finally:
+            progress_manager.detach_checkpoint(path)
 
-        # 3. Translate the Markdown content
-        # translate_markdown should take the actual markdown string and return translated markdown string.
-        # The 'path' argument is passed to translate_markdown for progress tracking within the translator.
-        
-        # 적응형 하이브리드 번역 모드 사용 (품질과 속도 균형)
-        USE_ADAPTIVE_MODE = True  # True: 적응형 하이브리드, False: 문장별 고품질 모드
-        
-        if USE_ADAPTIVE_MODE:
-            logger.info("적응형 하이브리드 번역 모드 사용 (문서 특성에 따라 자동 최적화)")
-            translated_markdown_content = translate_markdown(markdown_content_for_translation, path)
-        else:
-            logger.info("문장별 고품질 번역 모드 사용")
-            translated_markdown_content = translate_markdown(markdown_content_for_translation, path, use_sentence_mode=True)
-
-        # 4. Save translated Markdown
-        translated_md_path = current_file_output_dir / (file_stem + '_translated.md')
-        translated_md_path.write_text(translated_markdown_content, encoding='utf-8')
-        logger.info(f"Translated Markdown saved to: {translated_md_path}")
         logger.info(f"번역 완료: {input_file_path.name}")
 
         progress_manager.finish(path)
         return {
             'status': 'completed',
             'original_markdown_path': str(original_md_target_path),
-            'translated_markdown_path': str(translated_md_path),
+            'translated_markdown_path': str(translated_md_target_path),
+            'summary': job_summary,
         }
 
     except Exception as e:
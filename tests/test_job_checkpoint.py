@@ -0,0 +1,56 @@
+from doc_translator.job_checkpoint import JobCheckpoint
+from doc_translator.progress_manager import ProgressManager
+
+CHUNKS = [{'index': 0, 'header': '# A', 'size': 10, 'status': 'pending'},
+          {'index': 1, 'header': '# B', 'size': 20, 'status': 'pending'}]
+
+
+def test_restarted_job_resumes_completed_chunks(tmp_path):
+    path = tmp_path / 'doc.checkpoint.jsonl'
+    first = JobCheckpoint(path, {'engine': 'nllb', 'source_sha256': 'abc'})
+    assert first.bind(CHUNKS) == 0
+    first.record(0, "번역 A")
+    first.close()
+    # 프로세스가 줄을 쓰다가 죽은 경우
+    with open(path, 'ab') as f:
+        f.write(b'{"index": 1, "te')
+
+    second = JobCheckpoint(path, {'engine': 'nllb', 'source_sha256': 'abc'})
+    assert second.bind([dict(chunk, status='processing') for chunk in CHUNKS]) == 1
+    assert second.get(0) == "번역 A"
+    assert second.get(1) is None
+    second.record(1, "번역 B")
+    assert second.get(1) == "번역 B"
+    second.remove()
+    assert not path.exists()
+
+
+def test_changed_configuration_starts_over(tmp_path):
+    path = tmp_path / 'doc.checkpoint.jsonl'
+    first = JobCheckpoint(path, {'engine': 'nllb', 'profile': 'draft'})
+    first.bind(CHUNKS)
+    first.record(0, "초안")
+    first.close()
+
+    second = JobCheckpoint(path, {'engine': 'nllb', 'profile': 'quality'})
+    assert second.bind(CHUNKS) == 0
+    assert second.get(0) is None
+    second.close()
+
+
+def test_failed_chunks_are_not_checkpointed(tmp_path):
+    path = tmp_path / 'doc.checkpoint.jsonl'
+    config = {'engine': 'nllb', 'source_sha256': 'abc'}
+    manager = ProgressManager()
+    manager.start('doc.md')
+    manager.attach_checkpoint('doc.md', JobCheckpoint(path, config))
+    manager.set_total_chunks('doc.md', 2, [dict(chunk) for chunk in CHUNKS])
+    manager.add_chunk_result('doc.md', 0, "번역 A")
+    manager.add_chunk_result('doc.md', 1, "[번역 오류] CUDA out of memory")
+    manager.detach_checkpoint('doc.md').close()
+
+    resumed = JobCheckpoint(path, config)
+    assert resumed.bind(CHUNKS) == 1
+    assert resumed.get(0) == "번역 A"
+    assert resumed.get(1) is None
+    resumed.close()
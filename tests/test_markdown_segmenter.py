@@ -0,0 +1,76 @@
+import re
+
+from doc_translator.markdown_segmenter import (
+    iter_blocks, iter_paragraphs, sentence_texts, split_sections, split_spans_by_size,
+)
+
+DOCUMENT = (
+    "Preamble text.\n"
+    "\n"
+    "# Title\n"
+    "First sentence. Second one!\n"
+    "| a | b |\n"
+    "|---|---|\n"
+    "```python\n"
+    "# comment, not a header\n"
+    "```\n"
+    "\n"
+    "## Sub\n"
+    "#hashtag line\n"
+)
+
+
+def test_blocks_are_typed_offsets_in_one_pass():
+    blocks = list(iter_blocks(DOCUMENT))
+    assert [(b.kind, b.text(DOCUMENT)) for b in blocks] == [
+        ('paragraph', "Preamble text."),
+        ('blank', ""),
+        ('header', "# Title"),
+        ('paragraph', "First sentence. Second one!"),
+        ('table', "| a | b |\n|---|---|"),
+        ('code', "```python\n# comment, not a header\n```"),
+        ('blank', ""),
+        ('header', "## Sub"),
+        ('paragraph', "#hashtag line"),
+        ('blank', ""),
+    ]
+    assert [b.level for b in blocks if b.kind == 'header'] == [1, 2]
+
+
+def test_sentences_match_regex_split():
+    text = "  One. Two!  Three?\nFour... five.  "
+    expected = [s.strip() for s in re.split(r'(?<=[.!?])\s+', text.strip()) if s.strip()]
+    assert sentence_texts(text) == expected
+    assert sentence_texts(text, 2, 6) == ["One."]
+
+
+def test_paragraphs_match_regex_split():
+    text = "a\n\nb\n  \nc\n"
+    assert [text[s:e] for s, e in iter_paragraphs(text)] == re.split(r'\n\s*\n', text)
+
+
+def test_size_split_prefers_paragraph_then_sentence_breaks():
+    text = "aaaa. bbbb. cccc\n\ndddd"
+    assert [text[s:e] for s, e in split_spans_by_size(text, 0, len(text), 8)] == ["aaaa.", " bbbb.", " cccc\n\n", "dddd"]
+    assert split_spans_by_size(text, 0, len(text), 100) == [(0, len(text))]
+
+
+def test_sections_keep_preamble_and_ignore_code_headers():
+    sections = split_sections(DOCUMENT, min_size=0, max_size=1000)
+    assert [s.header for s in sections] == ["머리말", "# Title", "## Sub"]
+    assert DOCUMENT[sections[1].start:sections[1].end].endswith("```")
+
+
+def test_sentence_line_plan_follows_block_rules():
+    from doc_translator.translator import _plan_sentence_lines
+
+    lines = _plan_sentence_lines(DOCUMENT)
+    assert len(lines) == DOCUMENT.count("\n") + 1
+    for block in iter_blocks(DOCUMENT):
+        block_lines = lines[DOCUMENT.count("\n", 0, block.start):DOCUMENT.count("\n", 0, block.end) + 1]
+        if block.kind == 'paragraph':
+            assert block_lines == [sentence_texts(line) for line in block.text(DOCUMENT).split("\n")]
+        elif block.kind == 'code':
+            assert block_lines == block.text(DOCUMENT).split("\n")
+        else:
+            assert block_lines == [line.strip() for line in block.text(DOCUMENT).split("\n")]
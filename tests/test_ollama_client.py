@@ -0,0 +1,77 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from doc_translator.ollama_client import CircuitBreaker, OllamaClient, OllamaError, OllamaUnavailableError
+
+
+@pytest.fixture
+def fake_ollama():
+    """응답 상태 코드 목록을 차례로 돌려주는 가짜 Ollama 서버 (200이면 스트리밍 응답)"""
+    state = {'statuses': [], 'requests': []}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            state['requests'].append((self.path, payload))
+            status = state['statuses'].pop(0) if state['statuses'] else 200
+            if status == 200:
+                lines = [{"message": {"role": "assistant", "content": piece}, "done": False} for piece in ("번역", " 결과")]
+                lines.append({"message": {"role": "assistant", "content": ""}, "done": True, "eval_count": 2})
+            else:
+                lines = [{"error": "busy"}]
+            body = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state['host'] = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries_server_errors_and_streams_partial_reply(fake_ollama, monkeypatch):
+    monkeypatch.setattr("doc_translator.ollama_client.OLLAMA_RETRY_BACKOFF", 0.01)
+    fake_ollama['statuses'] = [503]
+    client = OllamaClient(fake_ollama['host'], timeout=5, max_retries=2)
+    try:
+        partials = []
+        reply = client.chat_sync("gemma3:4b", [{"role": "user", "content": "text"}], on_text=partials.append)
+        assert reply["message"]["content"] == "번역 결과"
+        assert partials == ["번역", "번역 결과"]
+        assert fake_ollama['requests'][-1][1]["stream"] is True
+        assert reply["eval_count"] == 2
+        assert client.stats['retries'] == 1
+        assert [path for path, _ in fake_ollama['requests']] == ["/api/chat", "/api/chat"]
+    finally:
+        client.close()
+
+
+def test_failures_raise_and_open_the_circuit(fake_ollama, monkeypatch):
+    monkeypatch.setattr("doc_translator.ollama_client.OLLAMA_RETRY_BACKOFF", 0.01)
+    fake_ollama['statuses'] = [500, 500]
+    client = OllamaClient(fake_ollama['host'], timeout=5, max_retries=1,
+                          breaker=CircuitBreaker(threshold=2, cooldown=60))
+    try:
+        with pytest.raises(OllamaError) as error:
+            client.generate_sync("gemma3:4b", "text")
+        assert "500" in str(error.value)
+        with pytest.raises(OllamaUnavailableError):
+            client.generate_sync("gemma3:4b", "text")
+        assert len(fake_ollama['requests']) == 2
+    finally:
+        client.close()
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("yaml")
+
+from doc_translator import ollama_translator
+from doc_translator.ollama_translator import MultilingualTranslator, TranslationConfig
+
+
+class _FakeClient:
+    """chat_sync 응답 내용을 차례로 돌려주는 가짜 Ollama 클라이언트"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+
+    def chat_sync(self, **kwargs):
+        return {"message": {"role": "assistant", "content": self.replies.pop(0)}}
+
+
+def test_empty_reply_raises_and_is_not_stored(monkeypatch):
+    stored = []
+    monkeypatch.setattr(ollama_translator, "lookup_segment", lambda *args, **kwargs: None)
+    monkeypatch.setattr(ollama_translator, "store_segment", lambda text, translated, **kwargs: stored.append(translated))
+    translator = MultilingualTranslator(TranslationConfig())
+    translator.client = _FakeClient(["  \n", "번역 결과"])
+
+    with pytest.raises(ollama_translator.OllamaError):
+        translator.translate_unit("Source text.", "en")
+    assert stored == []
+    assert translator.translate_unit("Source text.", "en") == "번역 결과"
+    assert stored == ["번역 결과"]
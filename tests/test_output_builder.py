@@ -0,0 +1,50 @@
+import io
+import time
+
+from doc_translator.output_builder import OutputBuilder
+
+
+def test_spans_and_out_of_order_slots_are_written_in_document_order():
+    source = "# Title\n\nBody text."
+    stream = io.StringIO()
+    builder = OutputBuilder(source, stream)
+    builder.span(0, 7)
+    builder.text("\n\n")
+    first = builder.slot()
+    builder.text(" / ")
+    second = builder.slot()
+    builder.fill(second, "B")
+    assert stream.getvalue() == "# Title\n\n"
+    builder.fill(first, "A")
+    assert stream.getvalue() == "# Title\n\nA / B"
+    assert builder.getvalue() is None
+    assert builder.pending_slots == 0
+
+
+def test_rollback_drops_unwritten_entries_only():
+    builder = OutputBuilder("source")
+    builder.text("head ")
+    mark = builder.mark()
+    builder.slot()
+    builder.text("tail")
+    assert builder.rollback(mark)
+    builder.span(0, 6)
+    assert builder.getvalue() == "head source"
+
+    mark = builder.mark()
+    builder.text("!")
+    assert not builder.rollback(mark)
+
+
+def test_last_write_reaches_the_file_while_the_job_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr("doc_translator.output_builder.FLUSH_INTERVAL", 0.05)
+    part_path = tmp_path / "doc_translated.md.part"
+    with open(part_path, "w", encoding="utf-8") as output:
+        builder = OutputBuilder("source", output)
+        time.sleep(0.1)
+        builder.text("\n\n")  # 간격이 지나 바로 내보냄
+        builder.text("CHUNK-1 translated")  # 간격 안이라 타이머로 내보냄
+        deadline = time.monotonic() + 2
+        while part_path.read_text(encoding="utf-8") != "\n\nCHUNK-1 translated" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert part_path.read_text(encoding="utf-8") == "\n\nCHUNK-1 translated"
@@ -0,0 +1,56 @@
+import re
+
+from doc_translator.script_classifier import count_scripts, resolve_segment_language, script_ratios
+
+SAMPLE = "第1条 秘密保持契約はカタカナとひらがなを含む。Article 1 비밀유지 계약"
+
+
+def test_counts_each_script_in_one_pass():
+    counts = count_scripts(SAMPLE)
+    assert counts == {
+        'hangul': len(re.findall(r'[가-힯]', SAMPLE)),
+        'hiragana': len(re.findall(r'[぀-ゟ]', SAMPLE)),
+        'katakana': len(re.findall(r'[゠-ヿ]', SAMPLE)),
+        'han': len(re.findall(r'[一-龯]', SAMPLE)),
+        'latin': len(re.findall(r'[a-zA-Z]', SAMPLE)),
+        'total': len(SAMPLE),
+    }
+
+
+def test_range_boundaries_match_regex():
+    edges = [0x40, 0x41, 0x5A, 0x5B, 0x60, 0x61, 0x7A, 0x7B, 0x303F, 0x3040, 0x309F, 0x30A0, 0x30FF, 0x3100,
+             0x4DFF, 0x4E00, 0x9F00, 0x9FAF, 0x9FB0, 0xABFF, 0xAC00, 0xD700, 0xD7AF, 0xD7B0, 0x1F600]
+    text = "".join(chr(code) for code in edges)
+    counts = count_scripts(text)
+    assert counts['latin'] == len(re.findall(r'[a-zA-Z]', text)) == 4
+    assert counts['hiragana'] == len(re.findall(r'[぀-ゟ]', text)) == 2
+    assert counts['katakana'] == len(re.findall(r'[゠-ヿ]', text)) == 2
+    assert counts['han'] == len(re.findall(r'[一-龯]', text)) == 3
+    assert counts['hangul'] == len(re.findall(r'[가-힯]', text)) == 3
+    assert counts['total'] == len(edges)
+
+
+def test_ignores_other_characters():
+    assert count_scripts("123 !? éü ١٢") == {
+        'hangul': 0, 'hiragana': 0, 'katakana': 0, 'han': 0, 'latin': 0, 'total': 12,
+    }
+
+
+def test_ratios():
+    ratios = script_ratios("abcd한글")
+    assert ratios['latin'] == 4 / 6
+    assert ratios['hangul'] == 2 / 6
+    assert script_ratios("") == dict.fromkeys(ratios, 0.0)
+
+
+def test_segment_keeps_document_language_unless_script_mix_changes():
+    # 일본어 계약서: 한자만 있는 제목/숫자뿐인 세그먼트는 문서 언어 유지, 영문 조항만 영어로 판정
+    assert resolve_segment_language("第1条 目的", "ja") == "ja"
+    assert resolve_segment_language("12. 2024/01/01", "ja") == "ja"
+    assert resolve_segment_language("秘密情報とは、開示された情報をいう。", "ja") == "ja"
+    assert resolve_segment_language("This Agreement shall be governed by the laws of Japan.", "ja") == "en"
+    # 영어 문서 안의 짧은 고유명사 표기는 영어 유지, 일본어 문단은 일본어
+    assert resolve_segment_language("Tokyo (東京) office", "en") == "en"
+    assert resolve_segment_language("本契約は日本法に準拠するものとします。", "en") == "ja"
+    assert resolve_segment_language("Le contrat est conclu.", "fr") == "fr"
+    assert resolve_segment_language("비밀유지 계약", None) == "ko"
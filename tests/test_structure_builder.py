@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("yaml")
+
+from doc_translator.document_parser import structure_builder
+
+
+def test_failed_paragraph_is_marked_and_structure_continues(monkeypatch):
+    def fake_translate(para, model):
+        if para == "broken":
+            raise structure_builder.OllamaError("Ollama 요청 실패 (HTTP 500)")
+        return f"번역: {para}"
+
+    monkeypatch.setattr(structure_builder, "translate_with_ollama", fake_translate)
+    structure = structure_builder.build_structure(["first", "broken", "last"])
+    assert [p["translated"] for p in structure] == ["번역: first", None, "번역: last"]
+    assert [p["original"] for p in structure] == ["first", "broken", "last"]
+    assert structure[1]["error"] == "Ollama 요청 실패 (HTTP 500)"
+    assert "error" not in structure[0] and "error" not in structure[2]
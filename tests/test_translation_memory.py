@@ -0,0 +1,76 @@
+import pytest
+from doc_translator.translation_memory import (
+    SegmentMemo, TranslationMemory, current_memo, job_memo, make_key, normalize_segment,
+)
+
+KEY = dict(engine="nllb", model="nllb-200-distilled-600M:hf:fp32", src_lang="ja", tgt_lang="ko", params={"num_beams": 3})
+
+
+@pytest.fixture
+def memory(tmp_path):
+    tm = TranslationMemory(tmp_path / "tm.sqlite3", max_entries=10)
+    yield tm
+    tm.close()
+
+
+def test_miss_then_hit(memory):
+    assert memory.get("秘密保持契約", **KEY) is None
+    memory.put("秘密保持契約", "비밀유지계약", **KEY)
+    assert memory.get("秘密保持契約", **KEY) == "비밀유지계약"
+    stats = memory.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_whitespace_normalized_key():
+    assert normalize_segment("  제1조\n  목적 ") == "제1조 목적"
+    assert make_key("제1조\n목적", **KEY) == make_key("제1조  목적", **KEY)
+
+
+def test_key_includes_engine_and_params(memory):
+    memory.put("Confidential", "기밀", **KEY)
+    assert memory.get("Confidential", **{**KEY, "params": {"num_beams": 1}}) is None
+    assert memory.get("Confidential", **{**KEY, "engine": "argos"}) is None
+
+
+def test_lru_eviction(memory):
+    for i in range(10):
+        memory.put(f"segment {i}", f"세그먼트 {i}", **KEY)
+    # 가장 오래된 항목을 사용해 최근 항목으로 갱신
+    assert memory.get("segment 0", **KEY) == "세그먼트 0"
+    memory.put("segment 10", "세그먼트 10", **KEY)
+    assert len(memory) == 9
+    assert memory.get("segment 0", **KEY) == "세그먼트 0"
+    assert memory.get("segment 1", **KEY) is None
+    assert memory.get_stats()["evictions"] == 2
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "tm.sqlite3"
+    first = TranslationMemory(path)
+    first.put("Boilerplate clause", "정형 조항", **KEY)
+    first.close()
+    second = TranslationMemory(path)
+    assert second.get("Boilerplate clause", **KEY) == "정형 조항"
+    second.close()
+
+
+def test_segment_memo_lru_and_ratio():
+    memo = SegmentMemo(max_entries=2)
+    assert memo.get("Page 1", **KEY) is None
+    memo.put("Page 1", "1쪽", **KEY)
+    memo.put("Page 2", "2쪽", **KEY)
+    assert memo.get("Page  1", **KEY) == "1쪽"
+    memo.put("Page 3", "3쪽", **KEY)
+    assert memo.get("Page 2", **KEY) is None
+    assert memo.summary() == {"segments": 3, "deduplicated": 1, "dedupe_ratio": round(1 / 3, 4)}
+
+
+def test_job_memo_is_shared_by_nested_calls():
+    assert current_memo() is None
+    with job_memo() as outer:
+        with job_memo() as inner:
+            assert inner is outer
+        assert current_memo() is outer
+    assert current_memo() is None
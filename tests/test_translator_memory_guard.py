@@ -0,0 +1,31 @@
+import pytest
+from doc_translator import translator
+from doc_translator.translator import _is_storable
+
+
+class _FakeTranslator:
+    _initialized = True
+    translator = object()
+    model_id = "fake-nllb"
+
+
+@pytest.mark.parametrize("output, stored", [
+    ("번역된 문장입니다.", True),
+    ("반복된다 반복된다 반복된다 반복된다 반복된다 반복된다", False),  # 반복 감지 → 원문 반환
+    ("", False),
+])
+def test_failed_sentence_translation_is_not_stored(monkeypatch, output, stored):
+    calls = []
+    monkeypatch.setattr(translator, "get_translator", lambda: _FakeTranslator())
+    monkeypatch.setattr(translator, "run_inference", lambda texts, *args, **kwargs: [output for _ in texts])
+    monkeypatch.setattr(translator, "lookup_segment", lambda *args, **kwargs: None)
+    monkeypatch.setattr(translator, "store_segment", lambda text, result, **key: calls.append(result))
+    translator.translate_single_sentence("This is a sentence.", source_lang="en")
+    assert bool(calls) == stored
+
+
+def test_error_markers_are_not_storable():
+    assert not _is_storable("Source.", "[번역 실패]")
+    assert not _is_storable("Source.", "앞 문장. [번역 오류: 반복 패턴 감지됨]")
+    assert not _is_storable("Source.", " Source. ")
+    assert _is_storable("Source.", "원문.")
@@ -0,0 +1,295 @@
+"""영속 번역 메모리 (Translation Memory)와 작업 단위 세그먼트 메모
+
+계약서/NDA처럼 문서마다 반복되는 정형 조항을 다시 번역하지 않도록
+세그먼트 번역 결과를 SQLite 파일에 저장해 두고 재사용한다.
+한 문서 안에서 반복되는 머리글/표 캡션/꼬리말은 작업 단위 인메모리 LRU 메모로
+한 번만 번역한다 (lookup_segment / store_segment가 메모 → 번역 메모리 순서로 조회).
+
+키: (엔진, 모델 ID, 원본 언어, 대상 언어, 디코딩 파라미터, 정규화된 세그먼트)의 해시
+용량: 최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# 번역 메모리 설정
+TM_ENABLED = os.environ.get("TRANSLATION_MEMORY", "1") == "1"
+TM_PATH = Path(os.environ.get("TRANSLATION_MEMORY_PATH", "./data_translated/translation_memory.sqlite3"))
+TM_MAX_ENTRIES = int(os.environ.get("TRANSLATION_MEMORY_MAX_ENTRIES", "200000"))
+TM_EVICT_RATIO = 0.9  # 한도를 넘으면 최대 항목 수의 90%까지 정리
+MEMO_MAX_ENTRIES = int(os.environ.get("SEGMENT_MEMO_MAX_ENTRIES", "5000"))
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# 엔진이 번역 대신 돌려주는 오류 표시 ("[번역 오류: ...]", "[번역 실패]", "[Argos Translate 번역 실패: ...]")
+FAILURE_MARKERS = ("[번역", "[Argos Translate 번역 실패")
+
+
+def is_failed_translation(translated: str) -> bool:
+    """빈 결과나 오류 표시가 들어간 결과인지 (번역 메모리, 작업 체크포인트에 남기지 않음)"""
+    translated = translated.strip()
+    return not translated or any(marker in translated for marker in FAILURE_MARKERS)
+
+
+def normalize_segment(text: str) -> str:
+    """키 계산용 세그먼트 정규화 (유니코드 NFC, 공백 압축)"""
+    return WHITESPACE_PATTERN.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def make_key(text: str, engine: str, model: str, src_lang: str, tgt_lang: str,
+             params: Optional[Dict[str, Any]] = None) -> str:
+    """번역 메모리 키 (SHA-256 hex)"""
+    payload = json.dumps(
+        [engine, model, src_lang, tgt_lang, params or {}, normalize_segment(text)],
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite 기반 세그먼트 번역 메모리 (스레드 안전)"""
+
+    def __init__(self, path=TM_PATH, max_entries: int = TM_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"도 가능)
+            max_entries: 보관할 최대 항목 수 (초과 시 LRU 삭제)
+        """
+        self.path = str(path)
+        self.max_entries = max(1, max_entries)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                key TEXT PRIMARY KEY,
+                engine TEXT NOT NULL,
+                model TEXT NOT NULL,
+                src_lang TEXT NOT NULL,
+                tgt_lang TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                use_count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def get(self, text: str, engine: str, model: str, src_lang: str, tgt_lang: str,
+            params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """저장된 번역 반환 (없으면 None)"""
+        key = make_key(text, engine, model, src_lang, tgt_lang, params)
+        with self._lock:
+            row = self._conn.execute("SELECT translation FROM segments WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            self._conn.execute(
+                "UPDATE segments SET last_used = ?, use_count = use_count + 1 WHERE key = ?",
+                (time.time(), key)
+            )
+            self._conn.commit()
+            self.stats['hits'] += 1
+            return row[0]
+
+    def put(self, text: str, translation: str, engine: str, model: str, src_lang: str, tgt_lang: str,
+            params: Optional[Dict[str, Any]] = None) -> None:
+        """번역 결과 저장 (같은 키가 있으면 덮어씀)"""
+        key = make_key(text, engine, model, src_lang, tgt_lang, params)
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM segments WHERE key = ?", (key,)).fetchone() is not None
+            self._conn.execute(
+                """
+                INSERT INTO segments (key, engine, model, src_lang, tgt_lang, source, translation, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET translation = excluded.translation, last_used = excluded.last_used
+                """,
+                (key, engine, model, src_lang, tgt_lang, text, translation, now, now)
+            )
+            self.stats['writes'] += 1
+            if not exists:
+                self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """가장 오래 사용하지 않은 항목부터 삭제 (호출 측에서 락 보유)"""
+        target = int(self.max_entries * TM_EVICT_RATIO)
+        excess = self._count - target
+        self._conn.execute(
+            "DELETE FROM segments WHERE key IN (SELECT key FROM segments ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        self._count = target
+        self.stats['evictions'] += excess
+        logger.info(f"번역 메모리 정리: {excess}개 항목 삭제 (LRU, 남은 항목 {target}개)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 통계와 현재 항목 수"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'entries': self._count,
+                'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM segments")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# 전역 번역 메모리 인스턴스
+_memory_instance: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """전역 번역 메모리 반환 (TRANSLATION_MEMORY=0이거나 열 수 없으면 None)"""
+    global _memory_instance
+    if not TM_ENABLED:
+        return None
+    with _memory_lock:
+        if _memory_instance is None:
+            try:
+                _memory_instance = TranslationMemory()
+                logger.info(f"번역 메모리 사용: {TM_PATH} ({len(_memory_instance)}개 항목)")
+            except sqlite3.Error as e:
+                logger.warning(f"번역 메모리를 열 수 없어 사용하지 않습니다: {e}")
+                return None
+        return _memory_instance
+
+
+class SegmentMemo:
+    """작업(문서) 단위 인메모리 LRU 세그먼트 메모"""
+
+    def __init__(self, max_entries: int = MEMO_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def get(self, text: str, **key) -> Optional[str]:
+        memo_key = make_key(text, **key)
+        with self._lock:
+            self.lookups += 1
+            translation = self._entries.get(memo_key)
+            if translation is None:
+                return None
+            self._entries.move_to_end(memo_key)
+            self.hits += 1
+            return translation
+
+    def put(self, text: str, translation: str, **key) -> None:
+        memo_key = make_key(text, **key)
+        with self._lock:
+            self._entries[memo_key] = translation
+            self._entries.move_to_end(memo_key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_duplicate(self) -> None:
+        """배치 수집 단계에서 같은 세그먼트를 합친 경우 (조회 + 적중으로 집계)"""
+        with self._lock:
+            self.lookups += 1
+            self.hits += 1
+
+    @property
+    def dedupe_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """작업 요약용 중복 제거 통계"""
+        with self._lock:
+            return {
+                'segments': self.lookups,
+                'deduplicated': self.hits,
+                'dedupe_ratio': round(self.dedupe_ratio, 4),
+            }
+
+
+# 현재 작업의 세그먼트 메모 (번역 작업 스레드마다 독립)
+_current_memo: ContextVar[Optional[SegmentMemo]] = ContextVar("segment_memo", default=None)
+
+
+@contextmanager
+def job_memo(max_entries: int = MEMO_MAX_ENTRIES) -> Iterator[SegmentMemo]:
+    """블록 안의 번역 호출이 공유하는 세그먼트 메모를 설정 (이미 설정되어 있으면 그대로 사용)"""
+    existing = _current_memo.get()
+    if existing is not None:
+        yield existing
+        return
+    memo = SegmentMemo(max_entries)
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+
+
+def current_memo() -> Optional[SegmentMemo]:
+    return _current_memo.get()
+
+
+def lookup_segment(text: str, **key) -> Optional[str]:
+    """작업 메모 → 번역 메모리 순서로 저장된 번역 조회"""
+    memo = current_memo()
+    if memo is not None:
+        cached = memo.get(text, **key)
+        if cached is not None:
+            return cached
+
+    memory = get_translation_memory()
+    if memory is None:
+        return None
+    cached = memory.get(text, **key)
+    if cached is not None and memo is not None:
+        memo.put(text, cached, **key)
+    return cached
+
+
+def store_segment(text: str, translation: str, **key) -> None:
+    """번역 결과를 작업 메모와 번역 메모리에 저장"""
+    memo = current_memo()
+    if memo is not None:
+        memo.put(text, translation, **key)
+    memory = get_translation_memory()
+    if memory is not None:
+        memory.put(text, translation, **key)
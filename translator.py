@@ -1,13 +1,29 @@
 import re
 import time
 import os
-import torch
+import json
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterator, TextIO
 import logging
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
 import yaml
 
+from lazy_import import lazy_module, module_available
+from markdown_segmenter import HEADER_LINE_PATTERN, SENTENCE_BOUNDARY, iter_paragraphs, sentence_texts, split_sections, split_spans_by_size
+from output_builder import OutputBuilder
+from script_classifier import count_scripts, language_from_counts, resolve_segment_language
+
+# torch/transformers는 모델을 실제로 다룰 때 임포트 (설정/Markdown 분할만 사용하는 경우 시작 시간 단축)
+torch = lazy_module("torch")
+transformers = lazy_module("transformers")
+SAFETENSORS_AVAILABLE = module_available("safetensors")
+
+from translation_memory import current_memo, is_failed_translation, job_memo, lookup_segment, normalize_segment, store_segment
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,7 +44,128 @@ if PROMPT_FILE.exists():
 # 청크 크기 설정
 MAX_CHUNK_SIZE = 1000
 MIN_CHUNK_SIZE = 500
-HEADER_PATTERN = re.compile(r'^(#{1,6}\s.+)', re.MULTILINE)
+
+# 모델 입력 토큰 예산 (NLLB 토크나이저 기준, 언어 토큰/EOS 포함)
+MAX_CHUNK_TOKENS = int(os.environ.get("NLLB_MAX_CHUNK_TOKENS", "256"))
+TOKEN_CACHE_SIZE = 20000
+CLAUSE_SPLIT_PATTERN = re.compile(r'(?<=[,;:、，；。！？])\s*')
+
+# 전처리/후처리 패턴 (모든 세그먼트마다 사용하므로 미리 컴파일)
+REPEATED_WORD_PATTERN = re.compile(r'\b(\w+)(\s+\1){2,}\b', re.IGNORECASE)  # 같은 단어 3번 이상 연속
+REPEATED_PHRASE_PATTERN = re.compile(r'([^,]+),\s*\1(?:,\s*\1)*')  # 쉼표로 구분된 같은 구문 2번 이상
+REPEATED_PHRASE_3_PATTERN = re.compile(r'([^,]+),\s*\1(?:,\s*\1)+')  # 쉼표로 구분된 같은 구문 3번 이상
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+MAX_TRANSLATION_CHARS = 2000  # 번역 결과 최대 길이 (문장 단위로 자름)
+
+# 디코딩 프로필: 작업마다 선택 (draft: 빠른 초안용 greedy, balanced: 기본, quality: 넓은 빔 탐색)
+# 세그먼트 종류별 파라미터
+#   text: translate_text / _translate_long_text
+#   sentence: translate_single_sentence
+#   optimized: translate_chunk_optimized
+DECODING_PROFILES = {
+    'draft': {
+        'text': {
+            'length_factor': 2, 'max_length_cap': 500, 'min_length_divisor': 4,
+            'num_beams': 1, 'do_sample': False, 'repetition_penalty': 1.3,
+            'no_repeat_ngram_size': 4,
+        },
+        'sentence': {
+            'length_factor': 3, 'max_length_cap': 200, 'min_length_divisor': 3,
+            'num_beams': 1, 'do_sample': False, 'repetition_penalty': 1.2,
+            'no_repeat_ngram_size': 3,
+        },
+        'optimized': {
+            'length_factor': 2, 'max_length_cap': 600, 'min_length_divisor': 3,
+            'num_beams': 1, 'do_sample': False, 'repetition_penalty': 1.3,
+            'no_repeat_ngram_size': 3,
+        },
+    },
+    'balanced': {
+        'text': {
+            'length_factor': 2, 'max_length_cap': 500, 'min_length_divisor': 4,
+            'num_beams': 2, 'do_sample': False, 'repetition_penalty': 1.5,
+            'no_repeat_ngram_size': 4, 'length_penalty': 0.8, 'early_stopping': True,
+        },
+        'sentence': {
+            'length_factor': 3, 'max_length_cap': 200, 'min_length_divisor': 3,
+            'num_beams': 3, 'do_sample': False, 'repetition_penalty': 1.3,
+            'no_repeat_ngram_size': 3, 'length_penalty': 1.0, 'early_stopping': True,
+        },
+        'optimized': {
+            'length_factor': 2, 'max_length_cap': 600, 'min_length_divisor': 3,
+            'num_beams': 3, 'do_sample': False, 'repetition_penalty': 1.4,
+            'no_repeat_ngram_size': 3, 'length_penalty': 0.9, 'early_stopping': True,
+        },
+    },
+    'quality': {
+        'text': {
+            'length_factor': 2, 'max_length_cap': 500, 'min_length_divisor': 4,
+            'num_beams': 5, 'do_sample': False, 'repetition_penalty': 1.3,
+            'no_repeat_ngram_size': 4, 'length_penalty': 1.0, 'early_stopping': True,
+        },
+        'sentence': {
+            'length_factor': 3, 'max_length_cap': 200, 'min_length_divisor': 3,
+            'num_beams': 5, 'do_sample': False, 'repetition_penalty': 1.2,
+            'no_repeat_ngram_size': 3, 'length_penalty': 1.0, 'early_stopping': True,
+        },
+        'optimized': {
+            'length_factor': 2, 'max_length_cap': 600, 'min_length_divisor': 3,
+            'num_beams': 5, 'do_sample': False, 'repetition_penalty': 1.3,
+            'no_repeat_ngram_size': 3, 'length_penalty': 1.0, 'early_stopping': True,
+        },
+    },
+}
+DEFAULT_DECODING_PROFILE = os.environ.get("NLLB_DECODING_PROFILE", "balanced")
+if DEFAULT_DECODING_PROFILE not in DECODING_PROFILES:
+    logger.warning(f"알 수 없는 디코딩 프로필({DEFAULT_DECODING_PROFILE})이므로 balanced를 사용합니다.")
+    DEFAULT_DECODING_PROFILE = "balanced"
+
+# 현재 작업의 디코딩 프로필 (번역 작업 스레드마다 독립)
+_current_profile: ContextVar[str] = ContextVar("decoding_profile", default=DEFAULT_DECODING_PROFILE)
+
+# 현재 작업의 문서 언어 (source_lang="auto"일 때 문서 전체에서 한 번 감지, 번역 작업 스레드마다 독립)
+_document_language: ContextVar[Optional[str]] = ContextVar("document_language", default=None)
+
+# 문서 언어 감지에 사용할 앞부분 길이 (문자 수)
+DOCUMENT_LANGUAGE_SAMPLE_CHARS = 5000
+
+# 배치 번역 설정 (1 이하이면 기존 순차 번역)
+BATCH_SIZE = int(os.environ.get("NLLB_BATCH_SIZE", "8"))
+
+# CPU 병렬화 방식: NLLB_WORKERS > 1이면 대용량 문서를 워커 프로세스들로 샤딩 (각자 모델 사본 보유),
+# 아니면 단일 모델의 intra-op 스레드 사용
+# NLLB_TORCH_THREADS: 모델 사본 하나당 torch 스레드 수 (0이면 단일 모델은 torch 기본값, 워커는 코어 수 / 워커 수)
+# 어느 쪽이 빠른지는 benchmarks/bench_parallelism.py로 측정하며, --save로 저장한 결과를 환경 변수가 없을 때 기본값으로 사용
+PARALLELISM_CONFIG_FILE = Path("./models/nllb_parallelism.json")
+try:
+    _measured_parallelism = json.loads(PARALLELISM_CONFIG_FILE.read_text(encoding="utf-8"))
+except (OSError, ValueError):
+    _measured_parallelism = {}
+NUM_WORKERS = int(os.environ.get("NLLB_WORKERS", _measured_parallelism.get("workers", 0)))
+TORCH_THREADS = int(os.environ.get("NLLB_TORCH_THREADS", _measured_parallelism.get("threads", 0)))
+
+# 추론 엔진 ("hf": transformers 파이프라인, "ctranslate2": CTranslate2 런타임. 실패 시 hf로 대체)
+ENGINE = os.environ.get("NLLB_ENGINE", "hf")
+
+# 모델 정밀도 ("fp32" 또는 CPU 전용 동적 양자화 "int8")
+PRECISION = os.environ.get("NLLB_PRECISION", "fp32")
+SUPPORTED_PRECISIONS = ("fp32", "int8")
+
+# 양자화 체크포인트 설정
+QUANTIZED_MODEL_DIR = Path("./models")
+QUANTIZED_WEIGHTS_FILE = "quantized_model.pt"
+
+# 모델 경로 캐시 (시작할 때마다 후보 경로를 탐색하지 않도록 찾은 로컬 모델 경로를 저장)
+MODEL_PATH_CACHE_FILE = Path("./models/nllb_model_path.json")
+REQUIRED_MODEL_FILES = ('config.json', 'tokenizer.json')
+
+# safetensors 가중치를 메모리 매핑으로 로드 (복사 없이 OS 페이지 캐시를 워커 프로세스들과 공유)
+USE_MMAP_WEIGHTS = os.environ.get("NLLB_MMAP_WEIGHTS", "1") == "1"
+SAFETENSORS_WEIGHTS_FILE = "model.safetensors"
+
+# 추론 서버 사용 여부 (여러 작업 스레드의 요청을 하나의 워커에서 마이크로 배치로 처리)
+USE_INFERENCE_SERVER = os.environ.get("NLLB_INFERENCE_SERVER", "1") == "1"
 
 # NLLB 언어 코드 매핑
 NLLB_LANGUAGE_CODES = {
@@ -61,29 +198,60 @@ NLLB_LANGUAGE_CODES = {
 class NLLBTranslator:
     """NLLB 기반 번역기 클래스"""
     
-    def __init__(self, model_path: str = None, device: str = "auto"):
+    def __init__(self, model_path: str = None, device: str = "auto", precision: str = PRECISION):
         """
         NLLB 번역기 초기화
         
         Args:
             model_path: 로컬 모델 경로 또는 HuggingFace 모델명
             device: 사용할 디바이스 ("auto", "cpu", "cuda")
+            precision: 모델 정밀도 ("fp32", "int8"). int8은 CPU에서만 사용 가능
         """
         # 로컬 모델 경로 자동 감지
         if model_path is None:
             model_path = self._find_local_model()
         
+        if precision not in SUPPORTED_PRECISIONS:
+            raise ValueError(f"지원하지 않는 precision입니다: {precision} (지원: {', '.join(SUPPORTED_PRECISIONS)})")
+        
         self.model_name = model_path
         self.device = self._get_device(device)
+        # 이미 양자화된 체크포인트 폴더를 가리키면 int8로 로드
+        if is_quantized_checkpoint(model_path):
+            precision = "int8"
+        if precision == "int8" and self.device != "cpu":
+            logger.warning(f"int8 동적 양자화는 CPU 전용입니다. {self.device}에서는 fp32로 로드합니다.")
+            precision = "fp32"
+        self.precision = precision
+        self.engine = "hf"
         self.tokenizer = None
         self.model = None
         self.translator = None
         self._initialized = False
+        self._inference_lock = threading.Lock()  # 파이프라인 동시 호출 방지
+        self._token_cache: "OrderedDict[str, List[int]]" = OrderedDict()  # 텍스트 -> 토큰 id (생성 시 재사용)
+        self._token_cache_lock = threading.Lock()
+        self.weights_format = None  # 가중치 로딩 방식 (로딩 리포트용)
+        self.load_seconds = None
+        
+        logger.info(f"NLLB 번역기 초기화 중... (모델: {model_path}, 디바이스: {self.device}, 정밀도: {self.precision})")
+        
+    @property
+    def model_id(self) -> str:
+        """번역 메모리 키에 쓰는 모델 식별자 (엔진/정밀도가 다르면 출력도 다름)"""
+        return f"{Path(self.model_name).name}:{self.engine}:{self.precision}"
+    
+    def _find_local_model(self) -> str:
+        """로컬에 설치된 NLLB 모델을 찾아서 경로 반환 (NLLB_MODEL_PATH → 캐시된 경로 → 후보 경로 탐색)"""
+        override = os.environ.get("NLLB_MODEL_PATH")
+        if override:
+            return override
         
-        logger.info(f"NLLB 번역기 초기화 중... (모델: {model_path}, 디바이스: {self.device})")
+        cached_path = read_cached_model_path()
+        if cached_path is not None:
+            logger.info(f"캐시된 로컬 NLLB 모델 경로 사용: {cached_path}")
+            return cached_path
         
-    def _find_local_model(self) -> str:
-        """로컬에 설치된 NLLB 모델을 찾아서 경로 반환"""
         possible_paths = [
             # 프로젝트 내 models 폴더 (실제 구조에 맞게 수정)
             "./models/nllb-200-distilled-600M",
@@ -108,15 +276,15 @@ class NLLBTranslator:
             logger.debug(f"모델 경로 확인 중: {abs_path}")
             if os.path.exists(abs_path):
                 # 필수 파일들이 있는지 확인
-                required_files = ['config.json', 'tokenizer.json']
                 missing_files = []
-                for f in required_files:
+                for f in REQUIRED_MODEL_FILES:
                     file_path = os.path.join(abs_path, f)
                     if not os.path.exists(file_path):
                         missing_files.append(f)
                 
                 if not missing_files:
                     logger.info(f"로컬 NLLB 모델 발견: {abs_path}")
+                    cache_model_path(abs_path)
                     return abs_path
                 else:
                     logger.debug(f"경로 {abs_path}에서 누락된 파일들: {missing_files}")
@@ -138,6 +306,22 @@ class NLLBTranslator:
                 return "cpu"
         return device_preference
     
+    def _load_tokenizer(self):
+        """토크나이저만 로드 (모델 없이 토큰 수 계산 가능, 같은 모델의 인스턴스끼리 공유)"""
+        if self.tokenizer is None:
+            with _tokenizer_cache_lock:
+                tokenizer = _tokenizer_cache.get(self.model_name)
+                if tokenizer is None:
+                    is_local_model = os.path.exists(self.model_name) and os.path.isdir(self.model_name)
+                    tokenizer = transformers.AutoTokenizer.from_pretrained(
+                        self.model_name,
+                        cache_dir="./models" if not is_local_model else None,
+                        local_files_only=is_local_model
+                    )
+                    _tokenizer_cache[self.model_name] = tokenizer
+            self.tokenizer = tokenizer
+        return self.tokenizer
+    
     def _initialize_model(self):
         """모델 초기화 (지연 로딩)"""
         if self._initialized:
@@ -145,36 +329,18 @@ class NLLBTranslator:
             
         try:
             logger.info("NLLB 모델 로딩 중...")
+            start_time = time.perf_counter()
             
             # 로컬 모델인지 확인
             is_local_model = os.path.exists(self.model_name) and os.path.isdir(self.model_name)
             
             # 토크나이저 로드
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.model_name,
-                cache_dir="./models" if not is_local_model else None,
-                local_files_only=is_local_model
-            )
+            self._load_tokenizer()
             
-            # 모델 로드 (양자화 완전 비활성화)
-            model_kwargs = {
-                "cache_dir": "./models" if not is_local_model else None,
-                "local_files_only": is_local_model,
-                "low_cpu_mem_usage": True
-            }
-            
-            # torch_dtype 설정 (버전 호환성 확인)
-            try:
-                model_kwargs["torch_dtype"] = torch.float32
-            except AttributeError:
-                logger.warning("torch.float32를 찾을 수 없어 기본 dtype을 사용합니다.")
-            
-            logger.info("일반 Float32 모드로 모델 로딩 (양자화 비활성화)")
-            
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(
-                self.model_name,
-                **model_kwargs
-            ).to(self.device)
+            if self.precision == "int8":
+                self.model = self._load_quantized_model(is_local_model)
+            else:
+                self.model = self._load_fp32_model(is_local_model)
             
             # 파이프라인 생성
             pipeline_kwargs = {
@@ -184,21 +350,90 @@ class NLLBTranslator:
                 "device": 0 if self.device == "cuda" else -1
             }
             
-            # torch_dtype 설정 (버전 호환성 확인)
-            try:
-                pipeline_kwargs["torch_dtype"] = torch.float32
-            except AttributeError:
-                logger.warning("파이프라인에서 torch_dtype을 설정할 수 없습니다.")
+            # torch_dtype 설정 (버전 호환성 확인, 양자화 모델은 dtype을 지정하지 않음)
+            if self.precision == "fp32":
+                try:
+                    pipeline_kwargs["torch_dtype"] = torch.float32
+                except AttributeError:
+                    logger.warning("파이프라인에서 torch_dtype을 설정할 수 없습니다.")
             
-            self.translator = pipeline(**pipeline_kwargs)
+            self.translator = transformers.pipeline(**pipeline_kwargs)
             
             self._initialized = True
-            logger.info(f"NLLB 모델 로딩 완료 (디바이스: {self.device})")
+            self.load_seconds = time.perf_counter() - start_time
+            logger.info(
+                f"NLLB 모델 로딩 완료 (디바이스: {self.device}, 정밀도: {self.precision}, "
+                f"가중치: {self.weights_format}, {self.load_seconds:.1f}초)"
+            )
             
         except Exception as e:
             logger.error(f"NLLB 모델 로딩 실패: {e}")
             raise RuntimeError(f"NLLB 모델 로딩 실패: {e}")
     
+    def load_report(self) -> Dict[str, Any]:
+        """모델 로딩 리포트 (경로, 가중치 로딩 방식, 소요 시간)"""
+        return {
+            'engine': self.engine,
+            'model': self.model_name,
+            'precision': self.precision,
+            'weights': self.weights_format,
+            'load_seconds': round(self.load_seconds, 2) if self.load_seconds is not None else None,
+        }
+    
+    def _load_fp32_model(self, is_local_model: bool):
+        """Float32 모델 로드 (로컬 safetensors 가중치가 있으면 메모리 매핑으로 로드)"""
+        if is_local_model and USE_MMAP_WEIGHTS and SAFETENSORS_AVAILABLE and safetensors_weights_file(self.model_name):
+            try:
+                model = load_mmap_safetensors_model(self.model_name)
+                self.weights_format = "safetensors-mmap"
+                logger.info("safetensors 가중치를 메모리 매핑으로 로드")
+                return model.to(self.device)
+            except Exception as e:
+                logger.warning(f"safetensors 메모리 매핑 로드 실패, 일반 로딩으로 대체합니다: {e}")
+        
+        model_kwargs = {
+            "cache_dir": "./models" if not is_local_model else None,
+            "local_files_only": is_local_model,
+            "low_cpu_mem_usage": True
+        }
+        
+        # torch_dtype 설정 (버전 호환성 확인)
+        try:
+            model_kwargs["torch_dtype"] = torch.float32
+        except AttributeError:
+            logger.warning("torch.float32를 찾을 수 없어 기본 dtype을 사용합니다.")
+        
+        logger.info("일반 Float32 모드로 모델 로딩")
+        self.weights_format = "from_pretrained"
+        
+        return transformers.AutoModelForSeq2SeqLM.from_pretrained(
+            self.model_name,
+            **model_kwargs
+        ).to(self.device)
+    
+    def _load_quantized_model(self, is_local_model: bool):
+        """
+        int8 동적 양자화 모델 로드
+        
+        양자화 체크포인트가 있으면 바로 로드하고, 없으면 fp32 모델을 양자화한 뒤
+        체크포인트로 저장하여 다음 시작부터 재사용한다.
+        """
+        checkpoint_dir = self.model_name if is_quantized_checkpoint(self.model_name) else quantized_checkpoint_dir(self.model_name)
+        
+        if is_quantized_checkpoint(checkpoint_dir):
+            logger.info(f"int8 양자화 체크포인트 로드: {checkpoint_dir}")
+            self.weights_format = "int8-checkpoint"
+            return load_quantized_checkpoint(checkpoint_dir)
+        
+        logger.info("int8 양자화 체크포인트가 없어 fp32 모델을 동적 양자화합니다 (최초 1회)")
+        model = quantize_dynamic_int8(self._load_fp32_model(is_local_model))
+        self.weights_format = "int8-quantized"
+        try:
+            save_quantized_checkpoint(model, self.tokenizer, checkpoint_dir)
+        except Exception as e:
+            logger.warning(f"int8 양자화 체크포인트 저장 실패 (다음 시작 시 다시 양자화): {e}")
+        return model
+    
     def detect_language(self, text: str) -> str:
         """
         텍스트의 언어를 감지 (간단한 휴리스틱 사용)
@@ -209,27 +444,8 @@ class NLLBTranslator:
         Returns:
             str: 감지된 언어 코드
         """
-        # 문자 기반 언어 감지
-        text_sample = text[:1000]  # 처음 1000자만 사용
-        
-        # 한글 체크
-        hangul_count = len(re.findall(r'[\uAC00-\uD7AF]', text_sample))
-        if hangul_count > len(text_sample) * 0.1:
-            return 'ko'
-            
-        # 일본어 체크 (히라가나, 가타카나)
-        hiragana_count = len(re.findall(r'[\u3040-\u309F]', text_sample))
-        katakana_count = len(re.findall(r'[\u30A0-\u30FF]', text_sample))
-        if hiragana_count > 5 or katakana_count > 5:
-            return 'ja'
-            
-        # 중국어 체크 (한자)
-        chinese_count = len(re.findall(r'[\u4E00-\u9FAF]', text_sample))
-        if chinese_count > len(text_sample) * 0.1:
-            return 'zh'
-            
-        # 영어가 기본값
-        return 'en'
+        # 문자 기반 언어 감지 (처음 1000자의 스크립트 분포를 한 번에 집계)
+        return language_from_counts(count_scripts(text[:1000]))
     
     def translate_text(self, text: str, source_lang: str = "auto", target_lang: str = "ko") -> str:
         """
@@ -250,8 +466,7 @@ class NLLBTranslator:
         self._initialize_model()
         
         # 언어 자동 감지
-        if source_lang == "auto":
-            source_lang = self.detect_language(text)
+        source_lang = segment_source_lang(text, source_lang)
             
         # NLLB 언어 코드로 변환
         src_code = NLLB_LANGUAGE_CODES.get(source_lang, 'eng_Latn')
@@ -268,328 +483,512 @@ class NLLBTranslator:
             # 텍스트 전처리 (반복 패턴 제거)
             preprocessed_text = self._preprocess_text(text)
             
-            # 텍스트가 너무 긴 경우 분할
-            if len(preprocessed_text) > 400:  # 더 작은 청크로 분할
+            # 토큰 예산을 넘는 경우 문장 단위로 묶어 분할 번역
+            if self.count_tokens(preprocessed_text) > MAX_CHUNK_TOKENS:
                 return self._translate_long_text(preprocessed_text, src_code, tgt_code)
             
-            # NLLB 번역 실행 (더욱 보수적인 파라미터)
-            result = self.translator(
-                preprocessed_text,
-                src_lang=src_code,
-                tgt_lang=tgt_code,
-                max_length=min(len(preprocessed_text) * 2, 500),  # 입력 길이의 2배 또는 500자 중 작은 값
-                min_length=max(1, len(preprocessed_text) // 4),    # 최소 길이 설정
-                num_beams=2,     # 빔 수 줄임 (안정성 향상)
-                do_sample=False, # 샘플링 비활성화
-                repetition_penalty=1.5,  # 반복 억제 강화
-                no_repeat_ngram_size=4,  # 4-gram 반복 방지
-                length_penalty=0.8,      # 길이 패널티 (짧은 번역 선호)
-                early_stopping=True      # 조기 종료
-            )
-            
-            translated_text = result[0]['translation_text'] if isinstance(result, list) else result['translation_text']
+            # NLLB 번역 실행 (보수적인 파라미터)
+            translated_text = self.translate_batch([preprocessed_text], src_code, tgt_code, **decoding_params('text'))[0]
             
             # 후처리 (반복 패턴 제거)
-            cleaned_text = self._postprocess_text(translated_text.strip())
+            cleaned_text = self._postprocess_text(translated_text)
             return cleaned_text
             
         except Exception as e:
             logger.error(f"번역 오류: {e}")
             return f"[번역 오류: {str(e)}]"
     
-    def _translate_long_text(self, text: str, src_code: str, tgt_code: str) -> str:
-        """긴 텍스트를 분할하여 번역"""
-        sentences = self._split_into_sentences(text)
-        translated_sentences = []
-        
-        current_chunk = ""
-        for sentence in sentences:
-            if len(current_chunk + sentence) > 400:  # 더 작은 청크 크기
-                if current_chunk:
-                    # 현재 청크 번역 (보수적 파라미터)
-                    chunk_text = current_chunk.strip()
-                    result = self.translator(
-                        chunk_text,
-                        src_lang=src_code,
-                        tgt_lang=tgt_code,
-                        max_length=min(len(chunk_text) * 2, 500),
-                        min_length=max(1, len(chunk_text) // 4),
-                        num_beams=2,
-                        do_sample=False,
-                        repetition_penalty=1.5,
-                        no_repeat_ngram_size=4,
-                        length_penalty=0.8,
-                        early_stopping=True
-                    )
-                    chunk_translation = result[0]['translation_text'] if isinstance(result, list) else result['translation_text']
-                    # 후처리 적용
-                    cleaned_translation = self._postprocess_text(chunk_translation.strip())
-                    translated_sentences.append(cleaned_translation)
-                current_chunk = sentence
-            else:
-                current_chunk += sentence
-        
-        # 마지막 청크 처리
-        if current_chunk.strip():
-            chunk_text = current_chunk.strip()
-            result = self.translator(
-                chunk_text,
-                src_lang=src_code,
-                tgt_lang=tgt_code,
-                max_length=min(len(chunk_text) * 2, 500),
-                min_length=max(1, len(chunk_text) // 4),
-                num_beams=2,
-                do_sample=False,
-                repetition_penalty=1.5,
-                no_repeat_ngram_size=4,
-                length_penalty=0.8,
-                early_stopping=True
+    def translate_batch(self, texts: List[str], src_code: str, tgt_code: str,
+                        batch_size: int = BATCH_SIZE,
+                        length_factor: int = 2, max_length_cap: int = 500, min_length_divisor: int = 4,
+                        on_batch_done: Optional[Callable[[List[int], List[str]], None]] = None,
+                        **generate_kwargs) -> List[str]:
+        """
+        여러 텍스트를 길이순으로 정렬하여 배치 단위로 번역
+        
+        Args:
+            texts: 번역할 텍스트 목록 (전처리 완료 상태)
+            src_code: NLLB 원본 언어 코드
+            tgt_code: NLLB 대상 언어 코드
+            batch_size: 한 번의 forward에 넣을 텍스트 수
+            length_factor, max_length_cap: max_length = min(최장 토큰 수 * factor, cap)
+            min_length_divisor: min_length = 최단 토큰 수 // divisor
+            on_batch_done: 배치 완료 시 (원래 인덱스 목록, 번역 결과 목록)으로 호출
+            generate_kwargs: num_beams 등 나머지 생성 파라미터
+            
+        Returns:
+            List[str]: 입력과 같은 순서의 번역 결과 (후처리 전)
+        """
+        self._initialize_model()
+        results = [''] * len(texts)
+        if not texts:
+            return results
+        
+        # 토큰화 결과는 캐시에서 재사용하고, 토큰 수가 비슷한 텍스트끼리 묶어 패딩 낭비를 줄임
+        encoded = [self.encode(t) for t in texts]
+        order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+        batch_size = max(1, batch_size)
+        
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            batch_ids = [encoded[i] for i in batch_indices]
+            longest = max(len(ids) for ids in batch_ids) + 2  # 언어 토큰 + EOS
+            shortest = min(len(ids) for ids in batch_ids) + 2
+            
+            with self._inference_lock:
+                outputs = self._generate_from_ids(
+                    batch_ids,
+                    src_code,
+                    tgt_code,
+                    max_length=min(longest * length_factor, max_length_cap),
+                    min_length=max(1, shortest // min_length_divisor),
+                    **generate_kwargs
+                )
+            
+            batch_results = []
+            for index, output in zip(batch_indices, outputs):
+                results[index] = output.strip()
+                batch_results.append(results[index])
+            
+            if on_batch_done is not None:
+                on_batch_done(batch_indices, batch_results)
+        
+        return results
+    
+    def _generate_from_ids(self, batch_ids: List[List[int]], src_code: str, tgt_code: str, **generate_kwargs) -> List[str]:
+        """캐시된 토큰 id로 바로 생성 (파이프라인의 재토큰화 생략)"""
+        src_token_id = self.tokenizer.convert_tokens_to_ids(src_code)
+        features = [{'input_ids': [src_token_id] + ids + [self.tokenizer.eos_token_id]} for ids in batch_ids]
+        inputs = self.tokenizer.pad(features, return_tensors="pt").to(self.device)
+        
+        with torch.no_grad():
+            generated = self.model.generate(
+                **inputs,
+                forced_bos_token_id=self.tokenizer.convert_tokens_to_ids(tgt_code),
+                **generate_kwargs
             )
-            chunk_translation = result[0]['translation_text'] if isinstance(result, list) else result['translation_text']
-            # 후처리 적용
-            cleaned_translation = self._postprocess_text(chunk_translation.strip())
-            translated_sentences.append(cleaned_translation)
+        return self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+    
+    def encode(self, text: str) -> List[int]:
+        """
+        언어 토큰과 EOS를 제외한 토큰 id 반환
         
-        return ' '.join(translated_sentences)
+        결과는 LRU 캐시에 보관되어 청크 분할 시 측정한 토큰을 생성 단계에서 그대로 재사용한다.
+        """
+        with self._token_cache_lock:
+            cached = self._token_cache.get(text)
+            if cached is not None:
+                self._token_cache.move_to_end(text)
+                return cached
+        
+        ids = self._load_tokenizer()(text, add_special_tokens=False)['input_ids']
+        
+        with self._token_cache_lock:
+            self._token_cache[text] = ids
+            if len(self._token_cache) > TOKEN_CACHE_SIZE:
+                self._token_cache.popitem(last=False)
+        return ids
     
-    def _preprocess_text(self, text: str) -> str:
-        """번역 전 텍스트 전처리"""
-        processed_text = text.strip()
-        
-        # 같은 단어가 연속으로 3번 이상 반복되는 경우 제거
-        pattern = r'\b(\w+)(\s+\1){2,}\b'
-        processed_text = re.sub(pattern, r'\1', processed_text, flags=re.IGNORECASE)
-        
-        # 같은 구문이 반복되는 경우 제거 (쉼표로 구분된)
-        pattern = r'([^,]+),\s*\1(?:,\s*\1)*'
-        processed_text = re.sub(pattern, r'\1', processed_text)
-        
-        # 극단적 반복 패턴 감지 및 제거
-        words = processed_text.split()
-        if len(words) > 10:
-            word_count = {}
-            for word in words:
-                if len(word) > 2:  # 2글자 이상만 체크
-                    word_count[word] = word_count.get(word, 0) + 1
+    def count_tokens(self, text: str) -> int:
+        """모델 입력 기준 토큰 수 (언어 토큰 + EOS 포함)"""
+        return len(self.encode(text)) + 2
+    
+    def pack_by_token_budget(self, segments: List[str], budget: int = MAX_CHUNK_TOKENS) -> List[str]:
+        """
+        문장 목록을 토큰 예산 안에서 최대한 묶어 모델 입력 목록으로 만듦
+        
+        예산을 넘는 단일 문장은 절(쉼표, 、 등) 단위로, 그래도 넘으면 토큰 단위로 나눈다.
+        """
+        packed = []
+        current: List[str] = []
+        current_tokens = 2  # 언어 토큰 + EOS
+        
+        for segment in segments:
+            segment = segment.strip()
+            if not segment:
+                continue
+            tokens = len(self.encode(segment))
             
-            total_words = len([w for w in words if len(w) > 2])
-            if total_words > 0:
-                # 전체 단어의 30% 이상을 차지하는 단어가 있으면 문제가 있는 텍스트
-                for word, count in word_count.items():
-                    if count > max(3, total_words * 0.3):
-                        logger.warning(f"반복 단어 감지 '{word}': {count}/{total_words}회 - 텍스트 단축")
-                        # 첫 번째 문장만 사용
-                        sentences = re.split(r'[.!?]+', text.strip())
-                        first_sentence = sentences[0].strip() if sentences else text[:100]
-                        return first_sentence + '.' if first_sentence and not first_sentence.endswith('.') else first_sentence
-        
-        # 텍스트가 너무 길면 분할 (400자 제한)
-        if len(processed_text) > 400:
-            sentences = re.split(r'(?<=[.!?])\s+', processed_text)
-            result_text = ""
-            for sentence in sentences:
-                if len(result_text + sentence) <= 400:
-                    result_text += sentence + " "
-                else:
-                    break
-            processed_text = result_text.strip()
+            if tokens + 2 > budget:
+                if current:
+                    packed.append(' '.join(current))
+                    current, current_tokens = [], 2
+                packed.extend(self._split_oversized(segment, budget))
+                continue
+            
+            if current and current_tokens + tokens > budget:
+                packed.append(' '.join(current))
+                current, current_tokens = [], 2
+            current.append(segment)
+            current_tokens += tokens
+        
+        if current:
+            packed.append(' '.join(current))
+        return packed
+    
+    def _split_oversized(self, text: str, budget: int) -> List[str]:
+        """토큰 예산을 넘는 문장을 절 단위, 최후에는 토큰 단위로 분할"""
+        clauses = [c for c in CLAUSE_SPLIT_PATTERN.split(text) if c.strip()]
+        if len(clauses) > 1:
+            return self.pack_by_token_budget(clauses, budget)
+        
+        ids = self.encode(text)
+        step = max(1, budget - 2)
+        return [self.tokenizer.decode(ids[i:i + step]) for i in range(0, len(ids), step)]
+    
+    def _translate_long_text(self, text: str, src_code: str, tgt_code: str) -> str:
+        """긴 텍스트를 토큰 예산 단위로 묶어 분할 번역"""
+        chunks = self.pack_by_token_budget(self._split_into_sentences(text))
+        
+        # 분할된 청크를 한 번에 배치 번역 (보수적 파라미터)
+        translations = self.translate_batch(chunks, src_code, tgt_code, **decoding_params('text'))
         
-        return processed_text
+        # 후처리 적용
+        return ' '.join(self._postprocess_text(t) for t in translations)
+    
+    def _preprocess_text(self, text: str) -> str:
+        """번역 전 텍스트 전처리"""
+        return clean_source_text(text)
     
     def _postprocess_text(self, text: str) -> str:
         """번역 후 텍스트 후처리"""
-        if not text or not text.strip():
-            return text
-            
-        processed_text = text.strip()
-        
-        # 극단적 반복 패턴 강력 제거
-        # 1. 같은 단어가 3번 이상 연속 반복
-        pattern = r'\b(\w+)(\s+\1){2,}\b'
-        processed_text = re.sub(pattern, r'\1', processed_text, flags=re.IGNORECASE)
-        
-        # 2. 쉼표로 구분된 반복 패턴
-        pattern = r'([^,]+),\s*\1(?:,\s*\1)+'
-        processed_text = re.sub(pattern, r'\1', processed_text)
-        
-        # 3. 특정 단어/구가 과도하게 반복되는 경우 감지
-        words = processed_text.split()
-        if len(words) > 20:
-            word_count = {}
-            for word in words:
-                if len(word) > 2 and word.isalpha():  # 알파벳 단어만
-                    word_count[word] = word_count.get(word, 0) + 1
-            
-            # 단어 빈도가 비정상적으로 높은 경우
-            total_meaningful_words = len([w for w in words if len(w) > 2 and w.isalpha()])
-            if total_meaningful_words > 0:
-                for word, count in word_count.items():
-                    # 특정 단어가 20% 이상 또는 10회 이상 반복되면 문제
-                    if count >= 10 or (count / total_meaningful_words) >= 0.2:
-                        logger.error(f"번역 결과에서 과도한 반복 감지: '{word}' {count}회")
-                        # 첫 번째 완전한 문장만 반환
-                        sentences = re.split(r'[.!?]+', processed_text)
-                        if sentences and len(sentences[0].strip()) > 10:
-                            return sentences[0].strip() + '.'
-                        else:
-                            return "[번역 오류: 반복 패턴 감지됨]"
-        
-        # 4. 문장 중복 제거
-        sentences = re.split(r'(?<=[.!?])\s+', processed_text)
-        unique_sentences = []
-        seen = set()
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 5:  # 너무 짧은 문장 제외
-                # 문장의 핵심 부분만 비교 (처음 50자)
-                sentence_key = sentence[:50].lower()
-                if sentence_key not in seen:
-                    unique_sentences.append(sentence)
-                    seen.add(sentence_key)
-        
-        result = ' '.join(unique_sentences)
-        
-        # 5. 최종 길이 제한 (너무 긴 번역 방지)
-        if len(result) > 2000:
-            sentences = re.split(r'(?<=[.!?])\s+', result)
-            final_result = ""
-            for sentence in sentences:
-                if len(final_result + sentence) <= 2000:
-                    final_result += sentence + " "
-                else:
-                    break
-            result = final_result.strip()
-        
-        return result if result else "[번역 실패]"
+        return clean_translation(text)
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """텍스트를 문장 단위로 분할"""
-        # 간단한 문장 분할 (개선 가능)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s + ' ' for s in sentences if s.strip()]
+        return [s + ' ' for s in SENTENCE_SPLIT_PATTERN.split(text) if s.strip()]
+
+def _collapse_repetitions(text: str, phrase_pattern: "re.Pattern") -> str:
+    """연속으로 반복되는 단어와 쉼표로 구분된 반복 구문을 하나로 축약"""
+    text = REPEATED_WORD_PATTERN.sub(r'\1', text)
+    if ',' in text:
+        text = phrase_pattern.sub(r'\1', text)
+    return text
+
+def _first_sentence(text: str) -> str:
+    """첫 문장 부호(. ! ?) 앞까지의 텍스트"""
+    match = SENTENCE_END_PATTERN.search(text)
+    return text[:match.start()] if match else text
+
+def clean_source_text(text: str) -> str:
+    """
+    번역 전 텍스트 전처리
+    
+    연속 반복 단어/구문을 축약하고, 한 단어가 전체의 30% 이상을 차지하는
+    극단적 반복 텍스트는 첫 문장만 남긴다. 길이 제한은 두지 않는다
+    (긴 텍스트는 호출 측에서 토큰 예산 단위로 분할).
+    """
+    processed_text = _collapse_repetitions(text.strip(), REPEATED_PHRASE_PATTERN)
+    
+    words = processed_text.split()
+    if len(words) > 10:
+        word_count = Counter(word for word in words if len(word) > 2)  # 2글자 이상만 체크
+        limit = max(3, sum(word_count.values()) * 0.3)
+        for word, count in word_count.items():
+            if count > limit:
+                logger.warning(f"반복 단어 감지 '{word}': {count}/{sum(word_count.values())}회 - 텍스트 단축")
+                first_sentence = _first_sentence(text.strip()).strip()
+                return first_sentence + '.' if first_sentence else first_sentence
+    
+    return processed_text
+
+def clean_translation(text: str) -> str:
+    """
+    번역 후 텍스트 후처리
+    
+    반복 축약 후 문장 목록을 한 번만 순회하며 단어 빈도 집계(과도한 반복 감지),
+    문장 중복 제거(앞 50자 기준), 최대 길이 제한을 함께 처리한다.
+    """
+    if not text or not text.strip():
+        return text
+    
+    processed_text = _collapse_repetitions(text.strip(), REPEATED_PHRASE_3_PATTERN)
+    
+    word_count: Counter = Counter()
+    total_words = 0
+    unique_sentences: List[str] = []
+    seen = set()
+    length = 0  # 지금까지 고른 문장을 공백으로 이었을 때의 길이 (+1)
+    capped = False
+    for sentence in SENTENCE_SPLIT_PATTERN.split(processed_text):
+        words = sentence.split()
+        total_words += len(words)
+        word_count.update(word for word in words if len(word) > 2 and word.isalpha())  # 알파벳 단어만
+        
+        sentence = sentence.strip()
+        if capped or len(sentence) <= 5:  # 너무 짧은 문장 제외
+            continue
+        sentence_key = sentence[:50].lower()  # 문장의 핵심 부분만 비교
+        if sentence_key in seen:
+            continue
+        seen.add(sentence_key)
+        if length + len(sentence) > MAX_TRANSLATION_CHARS:
+            capped = True  # 이후 문장은 길이 제한으로 제외 (빈도 집계는 계속)
+            continue
+        unique_sentences.append(sentence)
+        length += len(sentence) + 1
+    
+    # 특정 단어가 20% 이상 또는 10회 이상 반복되면 첫 번째 완전한 문장만 반환
+    if total_words > 20:
+        total_meaningful_words = sum(word_count.values())
+        for word, count in word_count.items():
+            if count >= 10 or count / total_meaningful_words >= 0.2:
+                logger.error(f"번역 결과에서 과도한 반복 감지: '{word}' {count}회")
+                first_sentence = _first_sentence(processed_text).strip()
+                return first_sentence + '.' if len(first_sentence) > 10 else "[번역 오류: 반복 패턴 감지됨]"
+    
+    return ' '.join(unique_sentences) or "[번역 실패]"
+
+def quantized_checkpoint_dir(model_name: str) -> Path:
+    """모델 경로/이름에 대응하는 int8 체크포인트 폴더 경로"""
+    base_name = Path(model_name).name if os.path.isdir(model_name) else model_name.replace('/', '--')
+    return QUANTIZED_MODEL_DIR / f"{base_name}-int8"
+
+def is_quantized_checkpoint(path) -> bool:
+    """int8 양자화 체크포인트 폴더인지 확인"""
+    return os.path.isfile(os.path.join(str(path), QUANTIZED_WEIGHTS_FILE))
+
+def quantize_dynamic_int8(model):
+    """Linear 레이어를 int8로 동적 양자화 (CPU 전용)"""
+    model = model.to("cpu").eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def save_quantized_checkpoint(model, tokenizer, output_dir) -> Path:
+    """양자화된 모델의 설정, 토크나이저, 가중치를 저장"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model.config.save_pretrained(output_dir)
+    if tokenizer is not None:
+        tokenizer.save_pretrained(output_dir)
+    torch.save(model.state_dict(), output_dir / QUANTIZED_WEIGHTS_FILE)
+    logger.info(f"int8 양자화 체크포인트 저장 완료: {output_dir}")
+    return output_dir
+
+def _empty_model_from_config(model_dir):
+    """가중치 초기화 없이 설정으로부터 모델 구조만 생성"""
+    config = transformers.AutoConfig.from_pretrained(model_dir)
+    try:
+        from transformers.modeling_utils import no_init_weights
+    except ImportError:
+        from contextlib import nullcontext as no_init_weights
+    with no_init_weights():
+        return transformers.AutoModelForSeq2SeqLM.from_config(config)
+
+def load_quantized_checkpoint(checkpoint_dir):
+    """저장된 int8 체크포인트 로드 (가중치 초기화 없이 구조만 만든 뒤 양자화 가중치 적용)"""
+    model = quantize_dynamic_int8(_empty_model_from_config(checkpoint_dir))
+    weights_path = os.path.join(str(checkpoint_dir), QUANTIZED_WEIGHTS_FILE)
+    try:
+        state_dict = torch.load(weights_path, map_location="cpu", mmap=USE_MMAP_WEIGHTS)
+    except TypeError:  # mmap 인자가 없는 torch (< 2.1)
+        state_dict = torch.load(weights_path, map_location="cpu")
+    model.load_state_dict(state_dict)
+    return model.eval()
+
+def safetensors_weights_file(model_dir) -> Optional[Path]:
+    """모델 폴더의 단일 파일 safetensors 가중치 경로 (없으면 None)"""
+    weights_file = Path(model_dir) / SAFETENSORS_WEIGHTS_FILE
+    return weights_file if weights_file.is_file() else None
+
+def load_mmap_safetensors_model(model_dir):
+    """
+    safetensors 가중치를 메모리 매핑한 채로 모델 파라미터에 연결
+    
+    가중치를 복사하지 않으므로 로딩이 빠르고, 같은 파일을 여는 워커 프로세스들이
+    OS 페이지 캐시의 같은 페이지를 공유한다 (추론 중에는 가중치를 쓰지 않음).
+    """
+    from safetensors.torch import load_file as load_safetensors_file
+    model = _empty_model_from_config(model_dir)
+    state_dict = load_safetensors_file(str(safetensors_weights_file(model_dir)), device="cpu")
+    missing, _ = model.load_state_dict(state_dict, strict=False, assign=True)
+    # 공유 임베딩/출력층처럼 파일에 한 번만 저장된 가중치를 다시 연결
+    model.tie_weights()
+    tied_keys = set(getattr(model, "_tied_weights_keys", None) or [])
+    missing = [key for key in missing if key not in tied_keys]
+    if missing:
+        raise RuntimeError(f"safetensors 가중치에 없는 파라미터: {missing[:5]}")
+    return model.float().eval()
+
+def read_cached_model_path() -> Optional[str]:
+    """캐시된 로컬 모델 경로 반환 (캐시가 없거나 필수 파일이 없어졌으면 None)"""
+    try:
+        cached_path = json.loads(MODEL_PATH_CACHE_FILE.read_text(encoding="utf-8"))["path"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if all(os.path.isfile(os.path.join(cached_path, f)) for f in REQUIRED_MODEL_FILES):
+        return cached_path
+    logger.info(f"캐시된 모델 경로가 유효하지 않아 다시 탐색합니다: {cached_path}")
+    return None
+
+def cache_model_path(model_path: str) -> None:
+    """찾은 로컬 모델 경로를 캐시 파일에 저장"""
+    try:
+        MODEL_PATH_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        MODEL_PATH_CACHE_FILE.write_text(json.dumps({"path": model_path}, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"모델 경로 캐시 저장 실패: {e}")
+
+def export_quantized_model(model_path: str, output_dir: Optional[str] = None) -> Path:
+    """fp32 모델을 int8로 양자화하여 체크포인트 폴더로 내보내기"""
+    output_dir = Path(output_dir) if output_dir else quantized_checkpoint_dir(model_path)
+    is_local_model = os.path.isdir(model_path)
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_path, local_files_only=is_local_model)
+    model = transformers.AutoModelForSeq2SeqLM.from_pretrained(
+        model_path, local_files_only=is_local_model, low_cpu_mem_usage=True, torch_dtype=torch.float32
+    )
+    return save_quantized_checkpoint(quantize_dynamic_int8(model), tokenizer, output_dir)
+
+# 모델 경로별 토크나이저 캐시 (토큰 수 계산용 인스턴스 등이 다시 로드하지 않도록 공유)
+_tokenizer_cache: Dict[str, Any] = {}
+_tokenizer_cache_lock = threading.Lock()
 
 # 전역 번역기 인스턴스
 _translator_instance: Optional[NLLBTranslator] = None
+_translator_lock = threading.Lock()  # 사전 로딩 스레드와 번역 작업이 동시에 모델을 만들지 않도록
 
 def get_translator() -> NLLBTranslator:
     """전역 번역기 인스턴스 반환"""
     global _translator_instance
-    if _translator_instance is None:
-        try:
-            # 로컬 모델 자동 감지 사용
-            _translator_instance = NLLBTranslator(model_path=None, device="cpu")
-            # 초기화 강제 실행
-            _translator_instance._initialize_model()
-            logger.info("NLLB 번역기 초기화 완료")
-        except Exception as e:
-            logger.error(f"NLLB 번역기 초기화 실패: {e}")
-            raise RuntimeError(f"번역기 초기화 실패: {e}")
-    return _translator_instance
+    with _translator_lock:
+        if _translator_instance is None:
+            if ENGINE == "ctranslate2":
+                try:
+                    from ctranslate2_translator import CTranslate2NLLBTranslator
+                    instance = CTranslate2NLLBTranslator(model_path=None, device="cpu")
+                    instance._initialize_model()
+                    _translator_instance = instance
+                    logger.info("NLLB 번역기 초기화 완료 (CTranslate2 엔진)")
+                    return _translator_instance
+                except Exception as e:
+                    logger.warning(f"CTranslate2 엔진 초기화 실패, transformers 파이프라인으로 대체합니다: {e}")
+            if TORCH_THREADS > 0:
+                torch.set_num_threads(TORCH_THREADS)
+            try:
+                # 로컬 모델 자동 감지 사용
+                instance = NLLBTranslator(model_path=None, device="cpu", precision=PRECISION)
+                # 초기화 강제 실행 (실패하면 다음 호출에서 다시 시도하도록 완료 후에 등록)
+                instance._initialize_model()
+                _translator_instance = instance
+                logger.info("NLLB 번역기 초기화 완료")
+            except Exception as e:
+                logger.error(f"NLLB 번역기 초기화 실패: {e}")
+                raise RuntimeError(f"번역기 초기화 실패: {e}")
+        return _translator_instance
+
+def current_decoding_profile() -> str:
+    return _current_profile.get()
+
+def decoding_params(kind: str) -> Dict[str, Any]:
+    """현재 디코딩 프로필의 세그먼트 종류별 생성 파라미터 ('text', 'sentence', 'optimized')"""
+    return DECODING_PROFILES[_current_profile.get()][kind]
+
+@contextmanager
+def use_decoding_profile(profile: Optional[str]) -> Iterator[str]:
+    """블록 안의 NLLB 번역에 사용할 디코딩 프로필 설정 (None이면 현재 프로필 유지)"""
+    if profile is None:
+        yield _current_profile.get()
+        return
+    if profile not in DECODING_PROFILES:
+        raise ValueError(f"지원하지 않는 디코딩 프로필입니다: {profile} (지원: {', '.join(DECODING_PROFILES)})")
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+def detect_document_language(markdown_text: str) -> str:
+    """문서 앞부분의 스크립트 분포로 문서 언어 감지 (작업마다 한 번)"""
+    return language_from_counts(count_scripts(markdown_text[:DOCUMENT_LANGUAGE_SAMPLE_CHARS]))
+
+@contextmanager
+def use_document_language(lang: Optional[str]) -> Iterator[Optional[str]]:
+    """블록 안의 source_lang="auto" 번역이 기준으로 삼을 문서 언어 설정 (None이면 현재 값 유지)"""
+    if lang is None or lang == "auto":
+        yield _document_language.get()
+        return
+    token = _document_language.set(lang)
+    try:
+        yield lang
+    finally:
+        _document_language.reset(token)
+
+def segment_source_lang(text: str, source_lang: str) -> str:
+    """
+    세그먼트의 원본 언어 코드
+
+    명시된 언어는 그대로 쓰고, "auto"이면 현재 작업의 문서 언어를 쓰되
+    세그먼트의 문자 체계 구성이 달라진 경우에만 세그먼트 언어로 바꾼다.
+    """
+    if source_lang != "auto":
+        return source_lang
+    return resolve_segment_language(text, _document_language.get())
+
+def _resumed_chunk(path: Optional[str], index: int) -> Optional[str]:
+    """재시작한 작업에서 체크포인트에 이미 기록된 청크 결과 (있으면 다시 번역하지 않음)"""
+    if not path:
+        return None
+    try:
+        from progress_manager import progress_manager
+    except ImportError:
+        return None
+    return progress_manager.resumed_result(path, index)
+
+def _memory_scope(translator: NLLBTranslator, params: Dict[str, Any]) -> Dict[str, Any]:
+    """번역 메모리 키의 엔진/모델/디코딩 파라미터 부분"""
+    return {
+        'engine': 'nllb',
+        'model': translator.model_id,
+        'params': {**params, 'max_chunk_tokens': MAX_CHUNK_TOKENS},
+    }
+
+def _is_storable(source: str, translated: str) -> bool:
+    """
+    번역 메모리에 저장해도 되는 결과인지
+
+    오류 표시("[번역 오류...]", "[번역 실패]")가 들어간 결과, 반복 감지로 원문을 그대로 돌려준 결과,
+    빈 결과는 저장하지 않는다 (한 번 저장되면 같은 키로 계속 재사용되므로).
+    """
+    return not is_failed_translation(translated) and translated.strip() != source.strip()
+
+def run_inference(texts: List[str], src_code: str, tgt_code: str, batch_size: int = BATCH_SIZE,
+                  on_batch_done: Optional[Callable[[List[int], List[str]], None]] = None,
+                  **generate_kwargs) -> List[str]:
+    """
+    모듈 수준 번역 함수들의 공통 추론 진입점
+    
+    추론 서버가 켜져 있으면 큐를 통해 다른 작업의 요청과 함께 마이크로 배치로 실행하고,
+    꺼져 있으면 현재 스레드에서 NLLBTranslator.translate_batch를 직접 호출한다.
+    """
+    if USE_INFERENCE_SERVER:
+        from inference_server import get_inference_server
+        return get_inference_server().translate_many(
+            texts, src_code, tgt_code, on_batch_done=on_batch_done, **generate_kwargs
+        )
+    return get_translator().translate_batch(
+        texts, src_code, tgt_code, batch_size=batch_size, on_batch_done=on_batch_done, **generate_kwargs
+    )
 
 def split_text_by_size(text: str, max_size: int) -> List[str]:
-    """텍스트를 최대 크기에 맞게 분할"""
-    if len(text) <= max_size:
-        return [text]
-
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + max_size
-        if end >= len(text):
-            chunks.append(text[start:])
-            break
-
-        # 가능하면 문단이나 문장 경계에서 자름
-        paragraph_end = text.rfind('\n\n', start, end)
-        if paragraph_end != -1 and paragraph_end > start:
-            end = paragraph_end + 2
-        else:
-            sentence_end = max([
-                text.rfind('. ', start, end),
-                text.rfind('! ', start, end),
-                text.rfind('? ', start, end),
-                text.rfind('。', start, end),  # 일본어 마침표
-                text.rfind('！', start, end),  # 일본어 느낌표
-                text.rfind('？', start, end),  # 일본어 물음표
-            ])
-            if sentence_end != -1 and sentence_end > start:
-                end = sentence_end + 1
-        
-        chunks.append(text[start:end])
-        start = end
-    return chunks
+    """텍스트를 최대 크기에 맞게 분할 (가능하면 문단이나 문장 경계에서 자름)"""
+    return [text[start:end] for start, end in split_spans_by_size(text, 0, len(text), max_size)]
 
 def split_markdown_by_headers(markdown_text: str) -> List[Dict[str, Any]]:
-    """마크다운 텍스트를 헤더 단위로 분할하고 메타데이터 반환"""
-    header_matches = list(HEADER_PATTERN.finditer(markdown_text))
-    
-    if not header_matches:
-        # 헤더가 없으면 길이 기준으로 분할
-        text_chunks = split_text_by_size(markdown_text, MAX_CHUNK_SIZE)
-        return [
-            {
-                'text': chunk,
-                'header': f"섹션 {i+1}",
-                'level': 0,
-                'size': len(chunk)
-            }
-            for i, chunk in enumerate(text_chunks)
-        ]
-
-    # 각 헤더 구간의 정보를 저장
-    sections = []
-    for i, match in enumerate(header_matches):
-        current_start = match.start()
-        current_header = match.group(0).strip()
-        current_level = len(current_header) - len(current_header.lstrip('#'))
-        next_start = header_matches[i+1].start() if i < len(header_matches) - 1 else len(markdown_text)
-        section_text = markdown_text[current_start:next_start].strip()
-        
-        sections.append({
-            'text': section_text,
-            'header': current_header,
-            'level': current_level,
-            'size': len(section_text),
-            'start': current_start,
-            'end': next_start,
-        })
-
-    # 너무 작은 섹션은 앞부분과 합침
-    merged_sections = []
-    current = None
-    
-    for section in sections:
-        if current is None:
-            current = section.copy()
-        elif section['size'] < MIN_CHUNK_SIZE and current['size'] + section['size'] <= MAX_CHUNK_SIZE:
-            current['text'] += '\n\n' + section['text']
-            current['size'] += section['size']
-            current['end'] = section['end']
-            # 헤더는 첫 번째 섹션의 것을 유지
-        else:
-            merged_sections.append(current)
-            current = section.copy()
-    
-    if current is not None:
-        merged_sections.append(current)
-
-    # 너무 큰 섹션은 다시 분할
-    final_chunks = []
-    for section in merged_sections:
-        if section['size'] > MAX_CHUNK_SIZE:
-            sub_chunks = split_text_by_size(section['text'], MAX_CHUNK_SIZE)
-            for j, sub_chunk in enumerate(sub_chunks):
-                final_chunks.append({
-                    'text': sub_chunk,
-                    'header': f"{section['header']} (part {j+1})",
-                    'level': section['level'],
-                    'size': len(sub_chunk)
-                })
-        else:
-            final_chunks.append(section)
+    """
+    마크다운 텍스트를 헤더 단위로 분할하고 메타데이터 반환
     
-    return final_chunks
+    섹션 경계/병합/재분할은 세그먼터가 원문 오프셋으로 계산하고, 청크 텍스트는 마지막에 한 번만 잘라낸다.
+    """
+    return [
+        {
+            'text': markdown_text[section.start:section.end],
+            'header': section.header,
+            'level': section.level,
+            'size': section.end - section.start,
+            'start': section.start,
+            'end': section.end,
+        }
+        for section in split_sections(markdown_text, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE)
+    ]
 
 def translate_chunk(text: str, idx: Optional[int] = None, total: Optional[int] = None, source_lang: str = "auto") -> str:
     """단일 청크를 NLLB로 번역"""
@@ -602,7 +1001,21 @@ def translate_chunk(text: str, idx: Optional[int] = None, total: Optional[int] =
         logger.info(f"청크 번역 중 {idx}/{total} (길이: {len(text)}자)")
     
     try:
+        source_lang = segment_source_lang(text, source_lang)
+        
+        # 이미 한국어인 경우 번역하지 않음
+        if source_lang == "ko":
+            return text
+        
+        # 작업 메모/번역 메모리 조회
+        memory_key = dict(src_lang=source_lang, tgt_lang="ko", **_memory_scope(translator, decoding_params('text')))
+        cached = lookup_segment(text, **memory_key)
+        if cached is not None:
+            return cached
+        
         translated = translator.translate_text(text, source_lang=source_lang, target_lang="ko")
+        if _is_storable(text, translated):
+            store_segment(text, translated, **memory_key)
         return translated
         
     except Exception as e:
@@ -610,28 +1023,49 @@ def translate_chunk(text: str, idx: Optional[int] = None, total: Optional[int] =
         logger.error(f"청크 번역 실패 ({idx}/{total}): {e}")
         return error_msg
 
-def translate_markdown(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", use_sentence_mode: bool = False) -> str:
-    """마크다운 문서를 NLLB로 번역 (적응형 하이브리드 방식)"""
+def translate_markdown(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", use_sentence_mode: bool = False,
+                       profile: Optional[str] = None, document_lang: Optional[str] = None,
+                       output: Optional[TextIO] = None) -> Optional[str]:
+    """
+    마크다운 문서를 NLLB로 번역 (적응형 하이브리드 방식, 문서 안의 반복 세그먼트는 한 번만 번역)
+    
+    profile: 디코딩 프로필 ("draft", "balanced", "quality"). None이면 NLLB_DECODING_PROFILE 기본값
+    document_lang: source_lang="auto"일 때 기준으로 삼을 문서 언어 (작업에서 이미 감지한 값). None이면 여기서 한 번 감지
+    output: 결과를 쓸 스트림. 주어지면 번역이 끝나는 순서대로 바로 쓰고 None 반환 (결과 전체를 메모리에 두지 않음)
+    """
+    if source_lang == "auto" and not document_lang:
+        document_lang = detect_document_language(markdown_text)
+    with use_decoding_profile(profile) as active_profile, use_document_language(document_lang), job_memo() as memo:
+        logger.info(f"디코딩 프로필: {active_profile}")
+        if source_lang == "auto":
+            logger.info(f"문서 언어: {document_lang} (세그먼트는 문자 체계가 다를 때만 개별 판정)")
+        result = _translate_markdown(markdown_text, path, source_lang, use_sentence_mode, OutputBuilder(markdown_text, output))
+    logger.info(f"세그먼트 중복 제거: {memo.hits}/{memo.lookups}개 재사용 ({memo.dedupe_ratio * 100:.1f}%)")
+    return result
+
+def _translate_markdown(markdown_text: str, path: Optional[str], source_lang: str, use_sentence_mode: bool,
+                        output: OutputBuilder) -> Optional[str]:
     start_time = time.time()
     
     # 빈 텍스트 체크
     if not markdown_text or not markdown_text.strip():
         logger.warning("번역할 내용이 없습니다.")
-        return markdown_text
+        output.span(0, len(markdown_text))
+        return output.getvalue()
     
     # 적응형 번역 모드 결정
     if use_sentence_mode:
         logger.info("강제 문장별 번역 모드 사용")
-        return translate_markdown_by_sentences(markdown_text, path, source_lang, start_time)
+        return translate_markdown_by_sentences(markdown_text, path, source_lang, start_time, output=output)
     else:
         # 문서 특성 분석하여 최적 번역 방식 결정
         translation_mode = analyze_document_for_translation_mode(markdown_text)
         logger.info(f"적응형 번역 모드: {translation_mode}")
         
         if translation_mode == "hybrid":
-            return translate_markdown_hybrid(markdown_text, path, source_lang, start_time)
+            return translate_markdown_hybrid(markdown_text, path, source_lang, start_time, output=output)
         elif translation_mode == "sentence":
-            return translate_markdown_by_sentences(markdown_text, path, source_lang, start_time)
+            return translate_markdown_by_sentences(markdown_text, path, source_lang, start_time, output=output)
     
     # 기본 청크 번역
     chunks_info = split_markdown_by_headers(markdown_text)
@@ -653,8 +1087,7 @@ def translate_markdown(markdown_text: str, path: Optional[str] = None, source_la
         except ImportError:
             logger.warning("progress_manager를 찾을 수 없습니다. 진행 상황이 표시되지 않습니다.")
 
-    # 번역 실행
-    translated_chunks = []
+    # 번역 실행 (청크가 끝날 때마다 출력에 씀)
     for i, chunk_info in enumerate(chunks_info):
         chunk_text = chunk_info['text']
         
@@ -664,8 +1097,12 @@ def translate_markdown(markdown_text: str, path: Optional[str] = None, source_la
             except NameError:
                 pass  # progress_manager가 없는 경우 무시
         
-        translated = translate_chunk(chunk_text, i + 1, len(chunks_info), source_lang)
-        translated_chunks.append(translated)
+        translated = _resumed_chunk(path, i)
+        if translated is None:
+            translated = translate_chunk(chunk_text, i + 1, len(chunks_info), source_lang)
+        if i:
+            output.text('\n\n')
+        output.text(translated)
         
         if path:
             try:
@@ -678,29 +1115,26 @@ def translate_markdown(markdown_text: str, path: Optional[str] = None, source_la
     elapsed_time = end_time - start_time
     formatted_time = f"{elapsed_time:.2f}초"
 
-    final_translation = '\n\n'.join(translated_chunks)
-    final_translation += f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200\n- 소요 시간: {formatted_time}\n- 청크 수: {len(chunks_info)}개\n---"
+    output.text(f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200\n- 디코딩 프로필: {current_decoding_profile()}\n- 소요 시간: {formatted_time}\n- 청크 수: {len(chunks_info)}개\n---")
     
     logger.info(f"번역 완료: {len(chunks_info)}개 청크, 소요 시간: {formatted_time}")
-    return final_translation
+    return output.getvalue()
 
-def translate_markdown_by_sentences(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", start_time: float = None) -> str:
+def translate_markdown_by_sentences(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", start_time: float = None, batch_size: int = BATCH_SIZE,
+                                    output: Optional[OutputBuilder] = None) -> Optional[str]:
     """마크다운 문서를 문장별로 번역 (고품질 모드)"""
     if start_time is None:
         start_time = time.time()
     
-    # 마크다운 구조 보존을 위한 파싱
-    lines = markdown_text.split('\n')
-    translated_lines = []
-    total_sentences = 0
-    translated_sentences = 0
+    if batch_size > 1:
+        return translate_markdown_by_sentences_batched(markdown_text, path, source_lang, start_time, batch_size, output=output)
     
-    # 전체 문장 수 계산
-    for line in lines:
-        line = line.strip()
-        if line and not line.startswith('#') and not line.startswith('```') and not line.startswith('|'):
-            sentences = split_text_into_sentences(line)
-            total_sentences += len([s for s in sentences if s.strip()])
+    output = output or OutputBuilder(markdown_text)
+    
+    # 마크다운 구조 보존을 위한 파싱 (라인별 문장 목록, 번역하지 않는 라인은 그대로 출력할 문자열)
+    lines = _plan_sentence_lines(markdown_text)
+    total_sentences = sum(len(line) for line in lines if isinstance(line, list))
+    translated_sentences = 0
     
     logger.info(f"총 {total_sentences}개 문장을 번역합니다")
     
@@ -720,42 +1154,29 @@ def translate_markdown_by_sentences(markdown_text: str, path: Optional[str] = No
         except ImportError:
             logger.warning("progress_manager를 찾을 수 없습니다.")
     
-    # 각 라인별 처리
-    for line in lines:
-        line = line.strip()
-        
-        # 빈 줄
-        if not line:
-            translated_lines.append('')
-            continue
-            
-        # 마크다운 헤더
-        if line.startswith('#'):
-            translated_lines.append(line)  # 헤더는 번역하지 않음
-            continue
-            
-        # 코드 블록
-        if line.startswith('```') or line.startswith('|'):
-            translated_lines.append(line)  # 코드나 테이블은 번역하지 않음
+    # 각 라인별 처리 (라인이 끝날 때마다 출력에 씀)
+    for line_index, line in enumerate(lines):
+        if line_index:
+            output.text('\n')
+        # 빈 줄, 헤더, 코드 블록, 테이블은 번역하지 않음
+        if isinstance(line, str):
+            output.text(line)
             continue
             
         # 일반 텍스트 - 문장별 번역
-        sentences = split_text_into_sentences(line)
         translated_line_parts = []
         
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
+        for sentence in line:
             if path:
                 try:
                     progress_manager.update_chunk_progress(path, translated_sentences, 'processing')
                 except NameError:
                     pass
             
-            # 문장별 번역
-            translated_sentence = translate_single_sentence(sentence, source_lang)
+            # 문장별 번역 (체크포인트에 있는 문장은 건너뜀)
+            translated_sentence = _resumed_chunk(path, translated_sentences)
+            if translated_sentence is None:
+                translated_sentence = translate_single_sentence(sentence, source_lang)
             translated_line_parts.append(translated_sentence)
             translated_sentences += 1
             
@@ -770,27 +1191,215 @@ def translate_markdown_by_sentences(markdown_text: str, path: Optional[str] = No
                 logger.info(f"문장 번역 진행: {translated_sentences}/{total_sentences}")
         
         # 번역된 문장들을 하나의 라인으로 결합
-        if translated_line_parts:
-            translated_lines.append(' '.join(translated_line_parts))
-        else:
-            translated_lines.append('')
+        output.text(' '.join(translated_line_parts))
     
     # 최종 결과 조합
     end_time = time.time()
     elapsed_time = end_time - start_time
     formatted_time = f"{elapsed_time:.2f}초"
     
-    final_translation = '\n'.join(translated_lines)
-    final_translation += f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (문장별 모드)\n- 소요 시간: {formatted_time}\n- 번역된 문장 수: {translated_sentences}개\n---"
+    output.text(f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (문장별 모드)\n- 디코딩 프로필: {current_decoding_profile()}\n- 소요 시간: {formatted_time}\n- 번역된 문장 수: {translated_sentences}개\n---")
     
     logger.info(f"문장별 번역 완료: {translated_sentences}개 문장, 소요 시간: {formatted_time}")
-    return final_translation
+    return output.getvalue()
 
 def split_text_into_sentences(text: str) -> List[str]:
-    """텍스트를 문장으로 분할"""
-    # 마침표, 느낌표, 물음표로 문장 분할
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-    return [s.strip() for s in sentences if s.strip()]
+    """텍스트를 문장으로 분할 (마침표, 느낌표, 물음표 기준)"""
+    return sentence_texts(text)
+
+def _plan_sentence_lines(markdown_text: str) -> List[Any]:
+    """
+    문장별 모드의 라인 계획 (세그먼터 블록 규칙으로 줄을 한 번만 훑음)
+    
+    Returns:
+        라인 목록. 번역하지 않는 라인(빈 줄, 헤더, 표, 코드 블록)은 그대로 출력할 문자열,
+        번역하는 라인은 문장 목록. 코드 블록은 들여쓰기를 포함해 그대로, 나머지는 앞뒤 공백을 뺀다.
+    """
+    # 블록 정규식(BLOCK_PATTERN)으로 블록을 만든 뒤 다시 줄 구간으로 나누면 대용량 문서에서
+    # 이전 줄 단위 분할보다 느려서, 같은 분류 규칙(코드 펜스, 헤더, 표, 빈 줄)을 줄마다 직접 적용한다
+    lines: List[Any] = []
+    in_code = False
+    for line in markdown_text.split('\n'):
+        body = line.lstrip(' \t\r\f\v')
+        if in_code or body.startswith('```'):
+            if body.startswith('```'):
+                in_code = not in_code
+            lines.append(line)
+        elif not body or body[0] == '|' or HEADER_LINE_PATTERN.match(body):
+            lines.append(body.rstrip())
+        else:
+            lines.append([sentence for sentence in map(str.strip, SENTENCE_BOUNDARY.split(body)) if sentence])
+    return lines
+
+def _token_length_buckets(lengths: Dict[int, int], batch_size: int) -> List[List[int]]:
+    """
+    토큰 길이가 비슷한 세그먼트끼리 버킷으로 묶음
+    
+    토큰 수 순으로 정렬한 뒤 batch_size를 채우거나 버킷 최단 길이의 2배를 넘으면 새 버킷을 시작하여
+    패딩 낭비를 줄인다.
+    
+    Args:
+        lengths: 세그먼트 인덱스 -> 토큰 수
+    """
+    buckets: List[List[int]] = []
+    bucket: List[int] = []
+    for index in sorted(lengths, key=lengths.get):
+        if bucket and (len(bucket) >= batch_size or lengths[index] > max(8, 2 * lengths[bucket[0]])):
+            buckets.append(bucket)
+            bucket = []
+        bucket.append(index)
+    if bucket:
+        buckets.append(bucket)
+    return buckets
+
+def translate_markdown_by_sentences_batched(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", start_time: float = None, batch_size: int = BATCH_SIZE,
+                                            output: Optional[OutputBuilder] = None) -> Optional[str]:
+    """문장별 번역 (배치 모드): 문서 전체 문장을 토큰 길이 버킷으로 묶어 번역한 뒤 라인이 끝나는 대로 출력"""
+    if start_time is None:
+        start_time = time.time()
+    
+    translator = get_translator()
+    output = output or OutputBuilder(markdown_text)
+    
+    # 1. 라인별 문장 수집 (헤더/코드/테이블 라인은 그대로 출력)
+    #    번역하는 라인은 출력 자리를 잡아 두고, 라인의 문장이 모두 끝나면 채운다
+    sentences: List[str] = []
+    sentence_line: List[int] = []
+    line_sentences: Dict[int, range] = {}
+    line_slots: Dict[int, int] = {}
+    for line_index, line in enumerate(_plan_sentence_lines(markdown_text)):
+        if line_index:
+            output.text('\n')
+        if isinstance(line, str):
+            output.text(line)
+            continue
+        line_sentences[line_index] = range(len(sentences), len(sentences) + len(line))
+        line_slots[line_index] = output.slot()
+        sentences.extend(line)
+        sentence_line.extend([line_index] * len(line))
+    lines_remaining = {line_index: len(indices) for line_index, indices in line_sentences.items()}
+    outputs: List[Optional[str]] = [None] * len(sentences)
+    logger.info(f"총 {len(sentences)}개 문장을 번역합니다 (배치 모드, 배치 크기 {batch_size})")
+    
+    # 진행 상황 관리
+    if path:
+        try:
+            from progress_manager import progress_manager
+            progress_chunks = [
+                {
+                    'index': i,
+                    'header': f"문장 {i+1}",
+                    'size': 1,
+                    'status': 'pending'
+                } for i in range(len(sentences))
+            ]
+            progress_manager.set_total_chunks(path, len(sentences), progress_chunks)
+        except ImportError:
+            logger.warning("progress_manager를 찾을 수 없습니다.")
+    
+    def fill_line(line_index: int) -> None:
+        indices = line_sentences.pop(line_index)
+        output.fill(line_slots.pop(line_index), ' '.join(outputs[i] for i in indices))
+        for i in indices:
+            outputs[i] = ''  # 출력에 쓴 문장은 보관하지 않음 (완료 표시만 남김)
+    
+    def complete(index: int, translated: str) -> None:
+        outputs[index] = translated
+        if path:
+            try:
+                progress_manager.add_chunk_result(path, index, translated)
+            except NameError:
+                pass
+        line_index = sentence_line[index]
+        lines_remaining[line_index] -= 1
+        if lines_remaining[line_index] == 0:
+            fill_line(line_index)
+    
+    # 문장이 없는 라인은 바로 완료
+    for line_index in [i for i, count in lines_remaining.items() if count == 0]:
+        fill_line(line_index)
+    
+    # 2. 언어별로 그룹화 (한국어/저장된 번역은 바로 완료, 같은 문장은 한 번만 번역)
+    memo = current_memo()
+    memory_scope = _memory_scope(translator, decoding_params('sentence'))
+    sentence_langs: Dict[int, str] = {}
+    first_occurrence: Dict[tuple, int] = {}
+    duplicates: Dict[int, List[int]] = {}
+    groups: Dict[str, List[int]] = {}
+    for i, sentence in enumerate(sentences):
+        resumed = _resumed_chunk(path, i)
+        if resumed is not None:
+            complete(i, resumed)
+            continue
+        lang = segment_source_lang(sentence, source_lang)
+        if lang == 'ko':
+            complete(i, sentence)
+            continue
+        sentence_langs[i] = lang
+        cached = lookup_segment(sentence, src_lang=lang, tgt_lang='ko', **memory_scope)
+        if cached is not None:
+            complete(i, cached)
+            continue
+        dedupe_key = (lang, normalize_segment(sentence))
+        if dedupe_key in first_occurrence:
+            duplicates.setdefault(first_occurrence[dedupe_key], []).append(i)
+            if memo is not None:
+                memo.record_duplicate()
+            continue
+        first_occurrence[dedupe_key] = i
+        groups.setdefault(lang, []).append(i)
+    
+    def finish(index: int, translated: str) -> None:
+        complete(index, translated)
+        for duplicate_index in duplicates.pop(index, []):
+            complete(duplicate_index, translated)
+    
+    # 3. 언어별로 토큰 길이 버킷을 만들어 버킷 단위로 번역
+    tgt_code = NLLB_LANGUAGE_CODES.get('ko', 'kor_Hang')
+    real_tokens = padded_tokens = 0
+    for lang, indices in groups.items():
+        src_code = NLLB_LANGUAGE_CODES.get(lang, 'eng_Latn')
+        lengths = {i: translator.count_tokens(sentences[i]) for i in indices}
+        for bucket in _token_length_buckets(lengths, batch_size):
+            real_tokens += sum(lengths[i] for i in bucket)
+            padded_tokens += max(lengths[i] for i in bucket) * len(bucket)
+            
+            def on_batch_done(positions: List[int], batch_outputs: List[str], bucket=bucket, lang=lang) -> None:
+                for position, raw in zip(positions, batch_outputs):
+                    index = bucket[position]
+                    translated = _postprocess_sentence(sentences[index], raw)
+                    if _is_storable(sentences[index], translated):
+                        store_segment(sentences[index], translated, src_lang=lang, tgt_lang='ko', **memory_scope)
+                    finish(index, translated)
+            
+            try:
+                run_inference(
+                    [sentences[i] for i in bucket], src_code, tgt_code,
+                    batch_size=len(bucket),
+                    on_batch_done=on_batch_done,
+                    **decoding_params('sentence')
+                )
+            except Exception as e:
+                logger.error(f"문장 배치 번역 실패 ({lang}, {len(bucket)}개): {e}")
+                for index in bucket:
+                    if outputs[index] is None:
+                        finish(index, sentences[index])  # 오류 시 원본 반환
+        
+            translated_count = sum(output is not None for output in outputs)
+            logger.info(f"문장 번역 진행: {translated_count}/{len(sentences)}")
+    
+    if padded_tokens:
+        logger.info(f"버킷 패딩 효율: {real_tokens / padded_tokens * 100:.1f}% (실제 {real_tokens} / 패딩 포함 {padded_tokens} 토큰)")
+    
+    # 최종 결과 조합
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    formatted_time = f"{elapsed_time:.2f}초"
+    
+    output.text(f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (문장별 배치 모드)\n- 디코딩 프로필: {current_decoding_profile()}\n- 소요 시간: {formatted_time}\n- 번역된 문장 수: {len(sentences)}개 (배치 크기 {batch_size})\n---")
+    
+    logger.info(f"문장별 배치 번역 완료: {len(sentences)}개 문장, 소요 시간: {formatted_time}")
+    return output.getvalue()
 
 def translate_single_sentence(sentence: str, source_lang: str = "auto") -> str:
     """단일 문장 번역 (최적화된 파라미터)"""
@@ -801,8 +1410,7 @@ def translate_single_sentence(sentence: str, source_lang: str = "auto") -> str:
     
     try:
         # 언어 자동 감지
-        if source_lang == "auto":
-            source_lang = translator.detect_language(sentence)
+        source_lang = segment_source_lang(sentence, source_lang)
             
         # NLLB 언어 코드로 변환
         src_code = NLLB_LANGUAGE_CODES.get(source_lang, 'eng_Latn')
@@ -817,45 +1425,37 @@ def translate_single_sentence(sentence: str, source_lang: str = "auto") -> str:
             logger.error("NLLB 모델이 초기화되지 않았습니다.")
             return sentence
         
-        # 문장별 최적화된 번역 파라미터
-        result = translator.translator(
-            sentence,
-            src_lang=src_code,
-            tgt_lang=tgt_code,
-            max_length=min(len(sentence) * 3, 200),  # 문장이므로 더 짧게
-            min_length=max(1, len(sentence) // 3),
-            num_beams=3,
-            do_sample=False,
-            repetition_penalty=1.3,
-            no_repeat_ngram_size=3,
-            length_penalty=1.0,
-            early_stopping=True
-        )
+        # 번역 메모리 조회
+        memory_key = dict(src_lang=source_lang, tgt_lang="ko", **_memory_scope(translator, decoding_params('sentence')))
+        cached = lookup_segment(sentence, **memory_key)
+        if cached is not None:
+            return cached
         
-        translated_text = result[0]['translation_text'] if isinstance(result, list) else result['translation_text']
+        # 문장별 최적화된 번역 파라미터
+        translated_text = run_inference([sentence], src_code, tgt_code, **decoding_params('sentence'))[0]
         
         # 간단한 후처리 (문장 단위이므로 가벼움)
-        cleaned_text = translated_text.strip()
-        
-        # 극단적 반복만 체크
-        words = cleaned_text.split()
-        if len(words) > 5:
-            word_count = {}
-            for word in words:
-                if len(word) > 2:
-                    word_count[word] = word_count.get(word, 0) + 1
-            
-            for word, count in word_count.items():
-                if count >= 3:  # 문장 내에서 3번 이상 반복
-                    logger.warning(f"문장 내 반복 감지: '{word}' {count}회 - 원본 반환")
-                    return sentence  # 문제가 있으면 원본 반환
-        
-        return cleaned_text
+        result = _postprocess_sentence(sentence, translated_text)
+        if _is_storable(sentence, result):
+            store_segment(sentence, result, **memory_key)
+        return result
         
     except Exception as e:
         logger.error(f"문장 번역 실패: {e}")
         return sentence  # 오류 시 원본 반환
 
+def _postprocess_sentence(sentence: str, translated_text: str) -> str:
+    """문장 번역 결과의 극단적 반복만 체크 (문제가 있으면 원본 반환)"""
+    words = translated_text.split()
+    if len(words) > 5:
+        word_count = Counter(word for word in words if len(word) > 2)
+        for word, count in word_count.items():
+            if count >= 3:  # 문장 내에서 3번 이상 반복
+                logger.warning(f"문장 내 반복 감지: '{word}' {count}회 - 원본 반환")
+                return sentence
+    
+    return translated_text
+
 def analyze_document_for_translation_mode(markdown_text: str) -> str:
     """문서 특성을 분석하여 최적 번역 모드 결정"""
     lines = markdown_text.split('\n')
@@ -909,7 +1509,8 @@ def analyze_document_for_translation_mode(markdown_text: str) -> str:
     else:
         return "hybrid"      # 기본적으로 하이브리드
 
-def translate_markdown_hybrid(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", start_time: float = None) -> str:
+def translate_markdown_hybrid(markdown_text: str, path: Optional[str] = None, source_lang: str = "auto", start_time: float = None, batch_size: int = BATCH_SIZE,
+                              output: Optional[OutputBuilder] = None) -> Optional[str]:
     """하이브리드 번역: 문장 길이에 따라 적응적으로 번역"""
     if start_time is None:
         start_time = time.time()
@@ -918,6 +1519,23 @@ def translate_markdown_hybrid(markdown_text: str, path: Optional[str] = None, so
     chunks_info = split_markdown_by_headers(markdown_text)
     logger.info(f"하이브리드 모드: {len(chunks_info)}개 섹션으로 분할")
     
+    output = output or OutputBuilder(markdown_text)
+    
+    if NUM_WORKERS > 1 and len(chunks_info) >= NUM_WORKERS * 2:
+        mark = output.mark()
+        try:
+            return translate_markdown_hybrid_parallel(chunks_info, path, source_lang, start_time, NUM_WORKERS, output=output)
+        except Exception as e:
+            # 아직 출력에 쓰지 않은 결과만 버리고 다시 번역 (이미 쓴 결과가 있으면 되돌릴 수 없음)
+            if not output.rollback(mark):
+                raise
+            logger.warning(f"다중 프로세스 번역 실패, 단일 프로세스로 다시 번역합니다: {e}")
+            from nllb_process_pool import shutdown_process_pool
+            shutdown_process_pool()
+    
+    if batch_size > 1:
+        return translate_markdown_hybrid_batched(chunks_info, path, source_lang, start_time, batch_size, output=output)
+    
     # 진행 상황 관리
     if path:
         try:
@@ -934,8 +1552,6 @@ def translate_markdown_hybrid(markdown_text: str, path: Optional[str] = None, so
         except ImportError:
             logger.warning("progress_manager를 찾을 수 없습니다.")
     
-    translated_chunks = []
-    
     for i, chunk_info in enumerate(chunks_info):
         chunk_text = chunk_info['text']
         chunk_size = chunk_info['size']
@@ -946,18 +1562,12 @@ def translate_markdown_hybrid(markdown_text: str, path: Optional[str] = None, so
             except NameError:
                 pass
         
-        # 청크 크기에 따른 적응적 번역
-        if chunk_size < 200:  # 작은 청크 - 문장별 번역
-            logger.debug(f"청크 {i+1}: 문장별 번역 (크기: {chunk_size})")
-            translated = translate_chunk_by_sentences(chunk_text, source_lang)
-        elif chunk_size > 1000:  # 큰 청크 - 분할 후 번역
-            logger.debug(f"청크 {i+1}: 분할 번역 (크기: {chunk_size})")
-            translated = translate_large_chunk_smart(chunk_text, source_lang)
-        else:  # 중간 크기 - 일반 번역 (개선된 파라미터)
-            logger.debug(f"청크 {i+1}: 일반 번역 (크기: {chunk_size})")
-            translated = translate_chunk_optimized(chunk_text, source_lang)
-        
-        translated_chunks.append(translated)
+        translated = _resumed_chunk(path, i)
+        if translated is None:
+            translated = translate_hybrid_chunk(chunk_text, chunk_size, source_lang, i)
+        if i:
+            output.text('\n\n')
+        output.text(translated)
         
         if path:
             try:
@@ -970,11 +1580,293 @@ def translate_markdown_hybrid(markdown_text: str, path: Optional[str] = None, so
     elapsed_time = end_time - start_time
     formatted_time = f"{elapsed_time:.2f}초"
     
-    final_translation = '\n\n'.join(translated_chunks)
-    final_translation += f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (하이브리드 모드)\n- 소요 시간: {formatted_time}\n- 섹션 수: {len(chunks_info)}개\n---"
+    output.text(f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (하이브리드 모드)\n- 디코딩 프로필: {current_decoding_profile()}\n- 소요 시간: {formatted_time}\n- 섹션 수: {len(chunks_info)}개\n---")
     
     logger.info(f"하이브리드 번역 완료: {len(chunks_info)}개 섹션, 소요 시간: {formatted_time}")
-    return final_translation
+    return output.getvalue()
+
+def translate_hybrid_chunk(chunk_text: str, chunk_size: int, source_lang: str = "auto", index: int = 0) -> str:
+    """청크 크기에 따른 적응적 번역 (하이브리드 모드의 청크 단위 처리)"""
+    if chunk_size < 200:  # 작은 청크 - 문장별 번역
+        logger.debug(f"청크 {index+1}: 문장별 번역 (크기: {chunk_size})")
+        return translate_chunk_by_sentences(chunk_text, source_lang)
+    elif chunk_size > 1000:  # 큰 청크 - 분할 후 번역
+        logger.debug(f"청크 {index+1}: 분할 번역 (크기: {chunk_size})")
+        return translate_large_chunk_smart(chunk_text, source_lang)
+    else:  # 중간 크기 - 일반 번역 (개선된 파라미터)
+        logger.debug(f"청크 {index+1}: 일반 번역 (크기: {chunk_size})")
+        return translate_chunk_optimized(chunk_text, source_lang)
+
+def translate_markdown_hybrid_parallel(chunks_info: List[Dict[str, Any]], path: Optional[str] = None, source_lang: str = "auto", start_time: float = None, num_workers: int = 2,
+                                       output: Optional[OutputBuilder] = None) -> Optional[str]:
+    """하이브리드 번역 (다중 프로세스 모드): 토큰 수 기준 샤드를 워커 프로세스들이 나누어 번역"""
+    from nllb_process_pool import translate_chunks_parallel
+    
+    if start_time is None:
+        start_time = time.time()
+    
+    # 청크마다 출력 자리를 잡아 두고 끝나는 순서대로 채움 (앞 청크가 끝나면 바로 출력)
+    output = output or OutputBuilder('')
+    chunk_slots = []
+    for i in range(len(chunks_info)):
+        if i:
+            output.text('\n\n')
+        chunk_slots.append(output.slot())
+    
+    # 진행 상황 관리
+    if path:
+        try:
+            from progress_manager import progress_manager
+            progress_chunks = [
+                {
+                    'index': i,
+                    'header': chunk['header'],
+                    'size': chunk['size'],
+                    'status': 'processing'
+                } for i, chunk in enumerate(chunks_info)
+            ]
+            progress_manager.set_total_chunks(path, len(chunks_info), progress_chunks)
+        except ImportError:
+            logger.warning("progress_manager를 찾을 수 없습니다.")
+    
+    def on_chunk_done(chunk_index: int, translated: str) -> None:
+        output.fill(chunk_slots[chunk_index], translated)
+        if path:
+            try:
+                progress_manager.add_chunk_result(path, chunk_index, translated)
+            except NameError:
+                pass
+    
+    # 체크포인트에 있는 청크는 워커에 보내지 않음. 워커가 첫 결과를 낸 뒤에 채워서
+    # 워커 시작에 실패하면 호출한 쪽이 출력을 되돌리고 단일 프로세스로 다시 번역할 수 있게 함
+    resumed = [i for i in range(len(chunks_info)) if _resumed_chunk(path, i) is not None]
+    resumed_set = set(resumed)
+    pending = [i for i in range(len(chunks_info)) if i not in resumed_set]
+    
+    def fill_resumed() -> None:
+        while resumed:
+            index = resumed.pop()
+            on_chunk_done(index, _resumed_chunk(path, index))
+    
+    def on_worker_chunk_done(position: int, translated: str) -> None:
+        fill_resumed()
+        on_chunk_done(pending[position], translated)
+    
+    stats = {'workers': 0, 'threads': 0, 'shards': 0, 'tokens': 0}
+    if pending:
+        _, stats = translate_chunks_parallel(
+            [chunks_info[i] for i in pending], source_lang,
+            profile=current_decoding_profile(),
+            document_lang=_document_language.get(),
+            num_workers=num_workers,
+            on_chunk_done=on_worker_chunk_done
+        )
+    fill_resumed()
+    
+    # 최종 결과 조합
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    formatted_time = f"{elapsed_time:.2f}초"
+    
+    output.text(f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (하이브리드 다중 프로세스 모드)\n- 디코딩 프로필: {current_decoding_profile()}\n- 소요 시간: {formatted_time}\n- 섹션 수: {len(chunks_info)}개\n- 워커: {stats['workers']}개 x 스레드 {stats['threads']}개 (샤드 {stats['shards']}개)\n---")
+    
+    logger.info(f"하이브리드 다중 프로세스 번역 완료: {len(chunks_info)}개 섹션, {stats['tokens']} 토큰, 소요 시간: {formatted_time}")
+    return output.getvalue()
+
+def _plan_hybrid_chunk(chunk_text: str, chunk_size: int) -> List[List[Dict[str, str]]]:
+    """
+    하이브리드 모드와 같은 규칙으로 청크를 세그먼트로 나눈 배치 계획을 만든다.
+    
+    Returns:
+        문단 목록. 각 문단은 세그먼트({'kind', 'text'}) 목록이며,
+        번역 후 세그먼트는 공백으로, 문단은 빈 줄로 이어 붙인다.
+    """
+    def sentences_of(start: int, end: int) -> List[Dict[str, str]]:
+        return [{'kind': 'sentence', 'text': sentence} for sentence in sentence_texts(chunk_text, start, end)]
+    
+    if chunk_size < 200:  # translate_chunk_by_sentences
+        return [sentences_of(0, len(chunk_text))]
+    if chunk_size <= 1000:  # translate_chunk_optimized
+        return [[{'kind': 'optimized', 'text': chunk_text}] if chunk_text.strip() else []]
+    
+    # translate_large_chunk_smart
+    plan = []
+    for start, end in iter_paragraphs(chunk_text):
+        if chunk_text[start:end].isspace() or start == end:
+            plan.append([])
+        elif end - start > 500:
+            plan.append(sentences_of(start, end))
+        else:
+            plan.append([{'kind': 'optimized', 'text': chunk_text[start:end]}])
+    return plan
+
+def translate_markdown_hybrid_batched(chunks_info: List[Dict[str, Any]], path: Optional[str] = None, source_lang: str = "auto", start_time: float = None, batch_size: int = BATCH_SIZE,
+                                      output: Optional[OutputBuilder] = None) -> Optional[str]:
+    """하이브리드 번역 (배치 모드): 문서 전체 세그먼트를 모아 길이순 배치로 번역한 뒤 원래 위치에 배치"""
+    if start_time is None:
+        start_time = time.time()
+    
+    translator = get_translator()
+    output = output or OutputBuilder('')
+    
+    # 진행 상황 관리
+    if path:
+        try:
+            from progress_manager import progress_manager
+            progress_chunks = [
+                {
+                    'index': i,
+                    'header': chunk['header'],
+                    'size': chunk['size'],
+                    'status': 'processing'
+                } for i, chunk in enumerate(chunks_info)
+            ]
+            progress_manager.set_total_chunks(path, len(chunks_info), progress_chunks)
+        except ImportError:
+            logger.warning("progress_manager를 찾을 수 없습니다.")
+    
+    # 1. 모든 청크의 세그먼트 수집 (체크포인트에 있는 청크는 세그먼트 없이 기록된 결과를 그대로 씀)
+    resumed: Dict[int, str] = {}
+    for i in range(len(chunks_info)):
+        resumed_text = _resumed_chunk(path, i)
+        if resumed_text is not None:
+            resumed[i] = resumed_text
+    plans = [[] if i in resumed else _plan_hybrid_chunk(chunk['text'], chunk['size']) for i, chunk in enumerate(chunks_info)]
+    segments = [segment for plan in plans for paragraph in plan for segment in paragraph]
+    segment_chunk = [i for i, plan in enumerate(plans) for paragraph in plan for _ in paragraph]
+    outputs: List[Optional[str]] = [None] * len(segments)
+    remaining = [sum(len(paragraph) for paragraph in plan) for plan in plans]
+    chunk_offsets = [0] + list(accumulate(remaining))[:-1]
+    chunk_slots = []
+    for i in range(len(chunks_info)):
+        if i:
+            output.text('\n\n')
+        chunk_slots.append(output.slot())
+    logger.info(f"하이브리드 배치 모드: {len(segments)}개 세그먼트, 배치 크기 {batch_size}")
+    
+    def assemble(chunk_index: int) -> None:
+        """청크의 모든 세그먼트가 끝나면 원래 레이아웃대로 조립해 출력 자리를 채움"""
+        start = cursor = chunk_offsets[chunk_index]
+        paragraphs = []
+        for paragraph in plans[chunk_index]:
+            paragraphs.append(' '.join(outputs[cursor:cursor + len(paragraph)]))
+            cursor += len(paragraph)
+        translated = resumed.pop(chunk_index) if chunk_index in resumed else '\n\n'.join(paragraphs)
+        output.fill(chunk_slots[chunk_index], translated)
+        outputs[start:cursor] = [''] * (cursor - start)  # 출력에 쓴 세그먼트는 보관하지 않음 (완료 표시만 남김)
+        if path:
+            try:
+                progress_manager.add_chunk_result(path, chunk_index, translated)
+            except NameError:
+                pass
+    
+    def complete(segment_index: int, output: str) -> None:
+        outputs[segment_index] = output
+        chunk_index = segment_chunk[segment_index]
+        remaining[chunk_index] -= 1
+        if remaining[chunk_index] == 0:
+            assemble(chunk_index)
+    
+    # 세그먼트가 없는 청크는 바로 완료
+    for i, count in enumerate(remaining):
+        if count == 0:
+            assemble(i)
+    
+    # 2. 언어/세그먼트 종류별로 그룹화 (생성 파라미터가 같은 것끼리 배치)
+    #    청크 번역 세그먼트는 토큰 예산 단위 조각으로 나누어 넣고, 조각이 모두 끝나면 완료 처리
+    #    작업 메모/번역 메모리에 있는 세그먼트는 추론 없이 바로 완료하고,
+    #    같은 문서 안에서 반복되는 세그먼트는 한 번만 번역해 나머지 위치에 재사용
+    memo = current_memo()
+    first_occurrence: Dict[tuple, int] = {}
+    duplicates: Dict[int, List[int]] = {}
+    memory_scopes = {kind: _memory_scope(translator, decoding_params(kind)) for kind in ('sentence', 'optimized')}
+    segment_langs: List[Optional[str]] = [None] * len(segments)
+    groups: Dict[tuple, List[tuple]] = {}
+    piece_outputs: List[List[Optional[str]]] = [[] for _ in segments]
+    pieces_left = [0] * len(segments)
+    for i, segment in enumerate(segments):
+        lang = segment_source_lang(segment['text'], source_lang)
+        if lang == 'ko':
+            complete(i, segment['text'])
+            continue
+        segment_langs[i] = lang
+        cached = lookup_segment(segment['text'], src_lang=lang, tgt_lang='ko', **memory_scopes[segment['kind']])
+        if cached is not None:
+            complete(i, cached)
+            continue
+        dedupe_key = (segment['kind'], lang, normalize_segment(segment['text']))
+        if dedupe_key in first_occurrence:
+            duplicates.setdefault(first_occurrence[dedupe_key], []).append(i)
+            if memo is not None:
+                memo.record_duplicate()
+            continue
+        first_occurrence[dedupe_key] = i
+        if segment['kind'] == 'optimized':
+            pieces = translator.pack_by_token_budget(
+                translator._split_into_sentences(translator._preprocess_text(segment['text']))
+            ) or ['']
+        else:
+            pieces = [segment['text']]
+        piece_outputs[i] = [None] * len(pieces)
+        pieces_left[i] = len(pieces)
+        for position, piece in enumerate(pieces):
+            groups.setdefault((segment['kind'], lang), []).append((i, position, piece))
+    
+    def finish_segment(segment_index: int, translated: str) -> None:
+        complete(segment_index, translated)
+        for duplicate_index in duplicates.pop(segment_index, []):
+            complete(duplicate_index, translated)
+    
+    def complete_piece(segment_index: int, position: int, raw: str, kind: str) -> None:
+        piece_outputs[segment_index][position] = raw
+        pieces_left[segment_index] -= 1
+        if pieces_left[segment_index] > 0:
+            return
+        source_text = segments[segment_index]['text']
+        if kind == 'optimized':
+            translated = ' '.join(translator._postprocess_text(p) for p in piece_outputs[segment_index])
+        else:
+            translated = _postprocess_sentence(source_text, raw)
+        if _is_storable(source_text, translated):
+            store_segment(source_text, translated, src_lang=segment_langs[segment_index], tgt_lang='ko',
+                          **memory_scopes[kind])
+        finish_segment(segment_index, translated)
+    
+    tgt_code = NLLB_LANGUAGE_CODES.get('ko', 'kor_Hang')
+    
+    # 3. 그룹별 배치 번역 후 원래 위치로 분배
+    for (kind, lang), entries in groups.items():
+        src_code = NLLB_LANGUAGE_CODES.get(lang, 'eng_Latn')
+        
+        def on_batch_done(batch_positions: List[int], batch_outputs: List[str], entries=entries, kind=kind) -> None:
+            for batch_position, raw in zip(batch_positions, batch_outputs):
+                segment_index, position, _ = entries[batch_position]
+                complete_piece(segment_index, position, raw, kind)
+        
+        try:
+            run_inference(
+                [piece for _, _, piece in entries], src_code, tgt_code,
+                batch_size=batch_size,
+                on_batch_done=on_batch_done,
+                **decoding_params(kind)
+            )
+        except Exception as e:
+            logger.error(f"배치 번역 실패 ({kind}, {lang}): {e}")
+            for segment_index in sorted({entry[0] for entry in entries}):
+                if outputs[segment_index] is None:
+                    # 순차 모드와 같은 실패 처리: 문장은 원본, 청크는 오류 표시
+                    fallback = segments[segment_index]['text'] if kind == 'sentence' else f"[번역 오류: {str(e)}]"
+                    finish_segment(segment_index, fallback)
+    
+    # 최종 결과 조합
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    formatted_time = f"{elapsed_time:.2f}초"
+    
+    output.text(f"\n\n---\n**번역 정보**\n- 번역 엔진: NLLB-200 (하이브리드 배치 모드)\n- 디코딩 프로필: {current_decoding_profile()}\n- 소요 시간: {formatted_time}\n- 섹션 수: {len(chunks_info)}개\n- 세그먼트 수: {len(segments)}개 (배치 크기 {batch_size})\n---")
+    
+    logger.info(f"하이브리드 배치 번역 완료: {len(chunks_info)}개 섹션, {len(segments)}개 세그먼트, 소요 시간: {formatted_time}")
+    return output.getvalue()
 
 def translate_chunk_by_sentences(text: str, source_lang: str = "auto") -> str:
     """작은 청크를 문장별로 번역"""
@@ -991,10 +1883,10 @@ def translate_chunk_by_sentences(text: str, source_lang: str = "auto") -> str:
 def translate_large_chunk_smart(text: str, source_lang: str = "auto") -> str:
     """큰 청크를 스마트하게 분할하여 번역"""
     # 문단 단위로 분할 (빈 줄 기준)
-    paragraphs = re.split(r'\n\s*\n', text)
     translated_paragraphs = []
     
-    for paragraph in paragraphs:
+    for start, end in iter_paragraphs(text):
+        paragraph = text[start:end]
         if not paragraph.strip():
             translated_paragraphs.append('')
             continue
@@ -1018,8 +1910,7 @@ def translate_chunk_optimized(text: str, source_lang: str = "auto") -> str:
     
     try:
         # 언어 자동 감지
-        if source_lang == "auto":
-            source_lang = translator.detect_language(text)
+        source_lang = segment_source_lang(text, source_lang)
             
         # NLLB 언어 코드로 변환
         src_code = NLLB_LANGUAGE_CODES.get(source_lang, 'eng_Latn')
@@ -1034,28 +1925,23 @@ def translate_chunk_optimized(text: str, source_lang: str = "auto") -> str:
             logger.error("NLLB 모델이 초기화되지 않았습니다.")
             return f"[번역 오류: 모델 초기화 실패]"
         
+        # 번역 메모리 조회
+        memory_key = dict(src_lang=source_lang, tgt_lang="ko", **_memory_scope(translator, decoding_params('optimized')))
+        cached = lookup_segment(text, **memory_key)
+        if cached is not None:
+            return cached
+        
         # 전처리
         preprocessed_text = translator._preprocess_text(text)
         
-        # 최적화된 번역
-        result = translator.translator(
-            preprocessed_text,
-            src_lang=src_code,
-            tgt_lang=tgt_code,
-            max_length=min(len(preprocessed_text) * 2, 600),
-            min_length=max(1, len(preprocessed_text) // 3),
-            num_beams=3,
-            do_sample=False,
-            repetition_penalty=1.4,
-            no_repeat_ngram_size=3,
-            length_penalty=0.9,
-            early_stopping=True
-        )
-        
-        translated_text = result[0]['translation_text'] if isinstance(result, list) else result['translation_text']
+        # 토큰 예산 단위로 묶어 최적화된 번역 (잘림 없이 전체 번역)
+        pieces = translator.pack_by_token_budget(translator._split_into_sentences(preprocessed_text))
+        translations = run_inference(pieces, src_code, tgt_code, **decoding_params('optimized'))
         
         # 후처리
-        cleaned_text = translator._postprocess_text(translated_text.strip())
+        cleaned_text = ' '.join(translator._postprocess_text(t) for t in translations)
+        if _is_storable(text, cleaned_text):
+            store_segment(text, cleaned_text, **memory_key)
         return cleaned_text
         
     except Exception as e:
@@ -1096,6 +1982,12 @@ def translate_paragraph(text: str, source_lang: str = "auto") -> str:
 def cleanup():
     """리소스 정리"""
     global _translator_instance
+    if USE_INFERENCE_SERVER:
+        from inference_server import shutdown_inference_server
+        shutdown_inference_server()
+    if NUM_WORKERS > 1:
+        from nllb_process_pool import shutdown_process_pool
+        shutdown_process_pool()
     if _translator_instance is not None:
         # GPU 메모리 정리
         if hasattr(_translator_instance, 'model') and _translator_instance.model is not None: